@@ -0,0 +1,125 @@
+import hashlib
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponseNotAllowed, HttpResponseNotModified, JsonResponse
+from django.utils.http import parse_etags, quote_etag
+
+from app.cache import aget_user_version
+from app.deletion import delete_images
+from app.models import UserImage
+from app.pagination import InvalidCursor
+from app.gallery import GalleryPipeline
+from app.search import SearchError
+from app.utils import serialize_image, set_images_visibility, METADATA_TAGS_DICT, SORT_TAGS
+from app.views import get_request_user
+
+IMAGE_FIELDS = {"id", "name", "catalog", "url", "thumbnail_url", "webp_srcset", "jpeg_srcset",
+                "placeholder", "width", "height", "visible"} | set(METADATA_TAGS_DICT) - {"Name"}
+
+
+def error(message, status=400):
+    return JsonResponse({"error": message}, status=status)
+
+
+def parse_body(request):
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def parse_ids(data):
+    ids = data.get("ids")
+    if not isinstance(ids, list) or not all(
+            isinstance(image_id, int) and not isinstance(image_id, bool) for image_id in ids):
+        return None
+    return ids
+
+
+async def get_list_etag(user, request):
+    """Changes with every change of the user's gallery, see cache.invalidate_user."""
+    version = await aget_user_version(user.id)
+    key = f"{version}:{sorted(request.GET.lists())}"
+    return quote_etag(hashlib.sha1(key.encode()).hexdigest())
+
+
+async def list_images(request, user):
+    fields = request.GET.get("fields")
+    fields = set(fields.split(",")) | {"id"} if fields else IMAGE_FIELDS
+    if fields - IMAGE_FIELDS:
+        return error(f"Unknown fields: {', '.join(sorted(fields - IMAGE_FIELDS))}")
+    sort_parameter_tag = request.GET.get("sort")
+    if sort_parameter_tag is not None and sort_parameter_tag not in SORT_TAGS:
+        return error(f"Unknown sort: {sort_parameter_tag}")
+    gallery = GalleryPipeline(request, request.GET.get("catalog", "All"), sort_parameter_tag,
+                              request.GET.get("cursor"), request.GET.get("q"))
+
+    etag = await get_list_etag(user, request)
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        response = HttpResponseNotModified()
+    else:
+        try:
+            images = await gallery.aget_images()
+        except InvalidCursor:
+            return error("Invalid cursor")
+        except SearchError as exc:
+            return error(str(exc))
+        response = JsonResponse({
+            "images": [{field: value for field, value in serialize_image(image, metadata).items()
+                        if field in fields} for image, metadata in images],
+            "next_cursor": images.next_cursor,
+        })
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+async def images_api(request):
+    """GET lists images, PATCH {"ids", "visible"} shows or hides them, DELETE {"ids"}
+    deletes them."""
+    user = await get_request_user(request)
+    if not user.is_authenticated:
+        return error("Authentication required.", status=401)
+    if request.method == "GET":
+        return await list_images(request, user)
+    if request.method not in ("PATCH", "DELETE"):
+        return HttpResponseNotAllowed(["GET", "PATCH", "DELETE"])
+
+    data = parse_body(request)
+    ids = None if data is None else parse_ids(data)
+    if ids is None:
+        return error("Expected a JSON object with a list of image ids.")
+
+    if request.method == "PATCH":
+        if not isinstance(data.get("visible"), bool):
+            return error("Expected visible to be true or false.")
+        count = await sync_to_async(set_images_visibility)(user, ids, data["visible"])
+        return JsonResponse({"updated": count})
+
+    count = await sync_to_async(delete_images)(UserImage.objects.filter(user=user, id__in=ids))
+    return JsonResponse({"deleted": count})
+
+
+async def image_api(request, image_id):
+    """PATCH {"visible"} shows or hides the image, DELETE deletes it."""
+    user = await get_request_user(request)
+    if not user.is_authenticated:
+        return error("Authentication required.", status=401)
+    if request.method not in ("PATCH", "DELETE"):
+        return HttpResponseNotAllowed(["PATCH", "DELETE"])
+
+    if request.method == "PATCH":
+        data = parse_body(request)
+        if data is None or not isinstance(data.get("visible"), bool):
+            return error("Expected a JSON object with visible set to true or false.")
+        count = await sync_to_async(set_images_visibility)(user, [image_id], data["visible"])
+        if not count:
+            return error("Image not found.", status=404)
+        return JsonResponse({"id": image_id, "visible": data["visible"]})
+
+    count = await sync_to_async(delete_images)(UserImage.objects.filter(user=user, id=image_id))
+    if not count:
+        return error("Image not found.", status=404)
+    return JsonResponse({"deleted": count})
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AppConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "app"
+
+    def ready(self):
+        # Connects receivers and job handlers.
+        from app import deletion, metrics, search, signals, tasks  # noqa: F401
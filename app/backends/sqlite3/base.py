@@ -0,0 +1,36 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+TRANSACTION_MODES = ("DEFERRED", "IMMEDIATE", "EXCLUSIVE")
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """SQLite with PRAGMAs run on every new connection and a configurable transaction mode.
+
+    OPTIONS["pragmas"] maps PRAGMA names to values, e.g. {"journal_mode": "wal"}.
+    OPTIONS["transaction_mode"] "IMMEDIATE" takes the write lock when an atomic block
+    starts, so a busy database is waited for up to OPTIONS["timeout"] seconds instead of
+    failing with "database is locked" when a reading transaction starts to write.
+    """
+
+    def get_connection_params(self):
+        options = self.settings_dict["OPTIONS"]
+        self.pragmas = options.get("pragmas", {})
+        self.transaction_mode = options.get("transaction_mode", "DEFERRED").upper()
+        if self.transaction_mode not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(
+                f"OPTIONS['transaction_mode'] must be one of {', '.join(TRANSACTION_MODES)}")
+
+        params = super().get_connection_params()
+        params.pop("pragmas", None)
+        params.pop("transaction_mode", None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute(f"BEGIN {self.transaction_mode}")
@@ -0,0 +1,299 @@
+import io
+import platform
+import random
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import django
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, OperationalError, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+from PIL.TiffImagePlugin import IFDRational
+
+from app.cache import invalidate_user
+from app.deletion import delete_images
+from app.exif import EXIF_IFD, read_exif_groups
+from app.models import (bulk_create_with_ids, ImageJob, UserCatalog, UserImage,
+                        UserImageMetadata)
+from app.tasks import process_new_images
+from app.utils import EXIF_DATETIME_FORMAT, get_metadata_fields
+
+CAMERAS = [
+    ("Canon", "Canon EOS 77D", "EF50mm f/1.8 STM"),
+    ("NIKON CORPORATION", "NIKON D750", "24.0-70.0 mm f/2.8"),
+    ("SONY", "ILCE-7M3", "FE 85mm F1.8"),
+    ("FUJIFILM", "X-T4", "XF23mmF1.4 R"),
+    ("Apple", "iPhone 12", "iPhone 12 back dual wide camera 4.2mm f/1.6"),
+]
+EXPOSURE_TIMES = [(1, 30), (1, 60), (1, 125), (1, 400), (1, 1000), (1, 4000)]
+F_NUMBERS = [(14, 10), (18, 10), (28, 10), (4, 1), (56, 10), (8, 1), (11, 1)]
+ISO_SPEEDS = [100, 200, 400, 800, 1600, 3200]
+COLORS = ["red", "green", "blue", "orange", "purple", "gray", "white", "black"]
+FIRST_DATE = datetime(2015, 1, 1)
+
+SEED_BATCH_SIZE = 500
+BENCHMARK_SIZES = [10, 1000, 100000]
+BENCHMARK_CATALOGS = 10
+WRITE_WORKERS = [1, 4, 8]
+PERCENTILES = [50, 95, 99]
+
+
+def make_exif(rng):
+    make, model, lens_model = rng.choice(CAMERAS)
+    taken = (FIRST_DATE + timedelta(seconds=rng.randrange(10 * 365 * 24 * 3600))).strftime(
+        EXIF_DATETIME_FORMAT)
+    return {
+        0x010F: make,
+        0x0110: model,
+        0x0132: taken,
+        EXIF_IFD: {
+            0x829A: IFDRational(*rng.choice(EXPOSURE_TIMES)),
+            0x829D: IFDRational(*rng.choice(F_NUMBERS)),
+            0x8827: rng.choice(ISO_SPEEDS),
+            0x9003: taken,
+            0xA434: lens_model,
+        },
+    }
+
+
+def make_jpeg(exif_tags, size, color):
+    exif = Image.Exif()
+    for tag_id, value in exif_tags.items():
+        exif[tag_id] = value
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, "JPEG", exif=exif.tobytes())
+    return buffer.getvalue()
+
+
+def seed_images(user, catalog, names, size, rng, process):
+    image_field = UserImage._meta.get_field("image")
+    images, metadata = [], []
+    for name in names:
+        data = make_jpeg(make_exif(rng), size, rng.choice(COLORS))
+        stored_name = image_field.storage.save(
+            image_field.generate_filename(None, f"{name}.jpg"), ContentFile(data))
+        images.append(UserImage(name=name, image=stored_name, user=user, catalog=catalog,
+                                width=size[0], height=size[1]))
+        metadata.append(get_metadata_fields(read_exif_groups(io.BytesIO(data))))
+
+    with transaction.atomic():
+        bulk_create_with_ids(UserImage, images)
+        UserImageMetadata.objects.bulk_create(
+            UserImageMetadata(image=image, **fields) for image, fields in zip(images, metadata))
+        if process:
+            process_new_images(images)
+
+
+def seed_user(username, catalogs, images_per_catalog, size=(160, 120), rng=None,
+              process=False):
+    """Create the user with catalogs of synthetic JPEGs that carry camera EXIF.
+
+    Metadata is stored right away, process=True also queues the derivative jobs.
+    """
+    rng = rng or random.Random(0)
+    user, _ = User.objects.get_or_create(username=username)
+    for catalog_number in range(catalogs):
+        catalog, _ = UserCatalog.objects.get_or_create(
+            user=user, catalog_name=f"catalog-{catalog_number}", pending_delete=False)
+        for start in range(0, images_per_catalog, SEED_BATCH_SIZE):
+            stop = min(start + SEED_BATCH_SIZE, images_per_catalog)
+            names = [f"IMG_{catalog_number:03d}_{number:06d}" for number in range(start, stop)]
+            seed_images(user, catalog, names, size, rng, process)
+
+    # bulk_create sends no post_save signals.
+    invalidate_user(user.id)
+    return user
+
+
+def seed_gallery(users, catalogs, images_per_catalog, prefix="seed", size=(160, 120), seed=0,
+                 process=False):
+    rng = random.Random(seed)
+    return [seed_user(f"{prefix}-{number}", catalogs, images_per_catalog, size, rng, process)
+            for number in range(users)]
+
+
+def get_benchmark_user(images, rng):
+    """The user "benchmark-<images>", seeded with the images on first use."""
+    username = f"benchmark-{images}"
+    user = User.objects.filter(username=username).first()
+    if user is None:
+        catalogs = max(1, min(BENCHMARK_CATALOGS, images))
+        user = seed_user(username, catalogs, images // catalogs, rng=rng)
+    return user
+
+
+def get_scenarios(user, rng):
+    """Requests made by the benchmark, by name, as functions of the test client."""
+    image_ids = list(UserImage.objects.filter(user=user).values_list("id", flat=True))
+    upload = make_jpeg(make_exif(rng), (640, 480), "blue")
+    return {
+        "gallery": lambda client: client.get(reverse("logged_in")),
+        "gallery_sort": lambda client: client.post(reverse("logged_in"), {
+            "Catalogs": "All", "Metadata-sort": "-DateTimeOriginal"}),
+        "gallery_catalog": lambda client: client.post(reverse("logged_in"), {
+            "Catalogs": "catalog-0", "Select": "Select"}),
+        "gallery_page": lambda client: client.get(reverse("gallery_page"), {"format": "json"}),
+        "api_images": lambda client: client.get(reverse("api_images")),
+        "img_metadata": lambda client: client.get(
+            reverse("img_metadata", args=[rng.choice(image_ids)])),
+        "upload_img": lambda client: client.post(reverse("upload_img"), {
+            "Upload": "Upload", "catalog": "catalog-0", "name": "benchmark upload",
+            "image": SimpleUploadedFile("upload.jpg", upload, "image/jpeg")}),
+    }
+
+
+def get_percentiles(values):
+    values = sorted(values)
+    summary = {f"p{percentile}": values[max(0, -(-len(values) * percentile // 100) - 1)]
+               for percentile in PERCENTILES}
+    summary["max"] = values[-1]
+    return summary
+
+
+def measure(client, request, requests, cold):
+    latencies, query_counts, sizes, errors = [], [], [], 0
+    for _ in range(requests):
+        if cold:
+            cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = request(client)
+            latencies.append(round((time.perf_counter() - start) * 1000, 3))
+        query_counts.append(len(queries))
+        sizes.append(len(response.content))
+        errors += response.status_code >= 400
+    return {
+        "requests": requests,
+        "errors": errors,
+        "latency_ms": get_percentiles(latencies),
+        "queries": get_percentiles(query_counts),
+        "bytes": get_percentiles(sizes),
+    }
+
+
+def benchmark_user(user, requests, cold, rng, views=None):
+    scenarios = get_scenarios(user, rng)
+    last_id = UserImage.objects.filter(user=user).order_by("-id").values_list(
+        "id", flat=True).first() or 0
+    client = Client()
+    client.force_login(user)
+    try:
+        return {name: measure(client, request, requests, cold)
+                for name, request in scenarios.items() if views is None or name in views}
+    finally:
+        delete_images(UserImage.objects.filter(user=user, id__gt=last_id))
+
+
+def get_environment(**extra):
+    return {
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": connection.vendor,
+        **extra,
+    }
+
+
+def run_benchmark(sizes=BENCHMARK_SIZES, requests=20, cold=False, seed=0, views=None):
+    """Drive the views through the test client for galleries of each size.
+
+    Returns a JSON-serializable report with latency, query count and response size
+    percentiles per view.
+    """
+    rng = random.Random(seed)
+    runs = []
+    with override_settings(ALLOWED_HOSTS=["testserver"]):
+        for size in sizes:
+            user = get_benchmark_user(size, rng)
+            runs.append({"images": UserImage.objects.filter(user=user).count(),
+                         "views": benchmark_user(user, requests, cold, rng, views)})
+    return {
+        "created_at": timezone.now().isoformat(),
+        "environment": get_environment(cold_cache=cold),
+        "runs": runs,
+    }
+
+
+def write_images(user, catalog, worker, writes):
+    """Insert images the way an upload does: read the catalog, then write the image, its
+    metadata and a job in one transaction. Returns the latencies and failures by error."""
+    latencies, errors = [], Counter()
+    for number in range(writes):
+        start = time.perf_counter()
+        try:
+            with transaction.atomic():
+                catalog = UserCatalog.objects.get(id=catalog.id)
+                image = UserImage.objects.create(name=f"write-{worker}-{number}", user=user,
+                                                 catalog=catalog)
+                UserImageMetadata.objects.create(image=image)
+                ImageJob.objects.create(image=image, kind="benchmark", state=ImageJob.DONE)
+        except OperationalError as exc:
+            errors[str(exc)] += 1
+        latencies.append(round((time.perf_counter() - start) * 1000, 3))
+    return latencies, errors
+
+
+def run_write_worker(user, catalog, worker, writes):
+    try:
+        return write_images(user, catalog, worker, writes)
+    finally:
+        connection.close()
+
+
+def measure_writes(user, catalog, workers, writes):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(workers) as executor:
+        results = list(executor.map(run_write_worker, [user] * workers, [catalog] * workers,
+                                    range(workers), [writes] * workers))
+    seconds = time.perf_counter() - start
+
+    latencies, errors = [], Counter()
+    for worker_latencies, worker_errors in results:
+        latencies += worker_latencies
+        errors += worker_errors
+    committed = workers * writes - sum(errors.values())
+    return {
+        "workers": workers,
+        "writes": workers * writes,
+        "seconds": round(seconds, 3),
+        "writes_per_second": round(committed / seconds, 1),
+        "errors": dict(errors),
+        "latency_ms": get_percentiles(latencies),
+    }
+
+
+def run_write_benchmark(workers=WRITE_WORKERS, writes=100):
+    """Write images from several threads at once, each with its own database connection.
+
+    Returns a JSON-serializable report per number of workers with the throughput, the
+    failed transactions by error (e.g. "database is locked") and latency percentiles.
+    """
+    user, _ = User.objects.get_or_create(username="benchmark-writes")
+    catalog, _ = UserCatalog.objects.get_or_create(user=user, catalog_name="writes",
+                                                   pending_delete=False)
+    runs = []
+    try:
+        for count in workers:
+            runs.append(measure_writes(user, catalog, count, writes))
+            UserImage.objects.filter(user=user).delete()
+    finally:
+        user.delete()
+
+    extra = {}
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            extra["journal_mode"] = cursor.execute("PRAGMA journal_mode").fetchone()[0]
+        extra["transaction_mode"] = getattr(connection, "transaction_mode", "DEFERRED")
+    return {
+        "created_at": timezone.now().isoformat(),
+        "environment": get_environment(**extra),
+        "runs": runs,
+    }
@@ -0,0 +1,105 @@
+import contextvars
+import os
+import shutil
+import zipfile
+from itertools import islice
+from tempfile import SpooledTemporaryFile
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+
+from app.cache import invalidate_user
+from app.exif import read_exif
+from app.models import bulk_create_with_ids, UserImage
+from app.tasks import process_new_images
+from app.utils import clean_exif_text, image_executor, verify_image
+
+NAME_TAGS = ["ImageDescription"]
+
+
+def iter_upload_files(uploads):
+    """Yield (filename, file) for each uploaded image and each file inside uploaded ZIPs.
+
+    ZIP entries are copied one at a time to a spooled temporary file, the file is None for
+    entries above BULK_UPLOAD_MAX_FILE_SIZE.
+    """
+    for upload in uploads:
+        if not zipfile.is_zipfile(upload):
+            yield upload.name, upload
+            continue
+
+        with zipfile.ZipFile(upload) as archive:
+            for info in archive.infolist():
+                basename = os.path.basename(info.filename)
+                if info.is_dir() or basename.startswith(".") or "__MACOSX/" in info.filename:
+                    continue
+                if info.file_size > settings.BULK_UPLOAD_MAX_FILE_SIZE:
+                    yield info.filename, None
+                    continue
+
+                spooled = SpooledTemporaryFile(settings.FILE_UPLOAD_MAX_MEMORY_SIZE)
+                with archive.open(info) as entry:
+                    shutil.copyfileobj(entry, spooled)
+                yield info.filename, File(spooled, basename)
+
+
+def get_upload_name(filename, exif):
+    name = clean_exif_text(exif.get("ImageDescription")) or os.path.splitext(
+        os.path.basename(filename))[0]
+    return name[:UserImage._meta.get_field("name").max_length]
+
+
+def check_upload(filename, file):
+    """Return (name, error) for an upload, reading only the image headers."""
+    if file is None:
+        return None, "The file is too large."
+    try:
+        verify_image(file)
+    except Exception:
+        return None, "Not a valid image."
+    exif_groups = getattr(file, "exif_groups", None)
+    exif = exif_groups.get("Image", {}) if exif_groups is not None else read_exif(file, NAME_TAGS)
+    return get_upload_name(filename, exif), None
+
+
+def save_batch(user, catalog, batch, description):
+    # The request metrics of app.metrics follow the checks into the pool.
+    contexts = [contextvars.copy_context() for _ in batch]
+    checked = image_executor.map(
+        lambda context, upload: context.run(check_upload, *upload), contexts, batch)
+    image_field = UserImage._meta.get_field("image")
+    images, exif_groups, results = [], [], []
+
+    for (filename, file), (name, error) in zip(batch, checked):
+        if error is None:
+            stored_name = image_field.storage.save(
+                image_field.generate_filename(None, file.name), file)
+            images.append(UserImage(name=name, image=stored_name, user=user, catalog=catalog,
+                                    description=description))
+            exif_groups.append(getattr(file, "exif_groups", None))
+        if file is not None:
+            file.close()
+        results.append({"file": filename, "name": name, "error": error})
+
+    with transaction.atomic():
+        bulk_create_with_ids(UserImage, images)
+        process_new_images(images, exif_groups)
+    return results
+
+
+def bulk_upload(user, catalog, uploads, description=""):
+    """Import images and ZIP archives into the catalog, BULK_UPLOAD_BATCH_SIZE rows per INSERT.
+
+    Returns one {"file", "name", "error"} dict per file, error is None when it was imported.
+    Images streamed in by app.uploads.ImageUploadHandler are stored without reading them
+    again.
+    """
+    files = iter_upload_files(uploads)
+    results = []
+    while batch := list(islice(files, settings.BULK_UPLOAD_BATCH_SIZE)):
+        results += save_batch(user, catalog, batch, description)
+
+    # bulk_create sends no post_save signals.
+    invalidate_user(user.id)
+    return results
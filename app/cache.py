@@ -0,0 +1,126 @@
+import asyncio
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+
+MISSING = object()
+
+LOCK_TIMEOUT = 10
+LOCK_WAIT_STEP = 0.05
+LOCK_WAIT_STEPS = 20
+
+_stats_lock = threading.Lock()
+_hits = Counter()
+_misses = Counter()
+
+
+def record(kind, hit):
+    with _stats_lock:
+        (_hits if hit else _misses)[kind] += 1
+
+
+def get_cache_stats():
+    with _stats_lock:
+        return {kind: {"hits": _hits[kind], "misses": _misses[kind]}
+                for kind in sorted(set(_hits) | set(_misses))}
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        _hits.clear()
+        _misses.clear()
+
+
+def get_version_key(user_id):
+    return f"gallery:{user_id}:version"
+
+
+def get_user_version(user_id):
+    key = get_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # A fresh version never matches keys left over from before an eviction.
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+async def aget_user_version(user_id):
+    key = get_version_key(user_id)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, time.time_ns(), timeout=None)
+        version = await cache.aget(key)
+    return version
+
+
+def invalidate_user(user_id):
+    """Move all cached gallery data of the user to a new version instead of deleting it.
+
+    The version is replaced rather than incremented, an increment of the file based cache
+    reads and writes the value and concurrent invalidations could end on the same version.
+    """
+    cache.set(get_version_key(user_id), time.time_ns(), timeout=None)
+
+
+def make_key(kind, user_id, version, key_parts):
+    digest = hashlib.sha1(repr(key_parts).encode()).hexdigest()
+    return f"gallery:{user_id}:{version}:{kind}:{digest}"
+
+
+def get_or_compute(kind, user_id, key_parts, compute):
+    """Return cached data, letting a single caller recompute it after a miss."""
+    key = make_key(kind, user_id, get_user_version(user_id), key_parts)
+    value = cache.get(key, MISSING)
+    if value is not MISSING:
+        record(kind, hit=True)
+        return value
+
+    record(kind, hit=False)
+    lock_key = f"{key}:lock"
+    locked = cache.add(lock_key, 1, LOCK_TIMEOUT)
+    if not locked:
+        for _ in range(LOCK_WAIT_STEPS):
+            time.sleep(LOCK_WAIT_STEP)
+            value = cache.get(key, MISSING)
+            if value is not MISSING:
+                return value
+
+    try:
+        value = compute()
+        cache.set(key, value, settings.GALLERY_CACHE_TIMEOUT)
+    finally:
+        if locked:
+            cache.delete(lock_key)
+    return value
+
+
+async def aget_or_compute(kind, user_id, key_parts, acompute):
+    """Async variant of get_or_compute for a coroutine function computing the value."""
+    key = make_key(kind, user_id, await aget_user_version(user_id), key_parts)
+    value = await cache.aget(key, MISSING)
+    if value is not MISSING:
+        record(kind, hit=True)
+        return value
+
+    record(kind, hit=False)
+    lock_key = f"{key}:lock"
+    locked = await cache.aadd(lock_key, 1, LOCK_TIMEOUT)
+    if not locked:
+        for _ in range(LOCK_WAIT_STEPS):
+            await asyncio.sleep(LOCK_WAIT_STEP)
+            value = await cache.aget(key, MISSING)
+            if value is not MISSING:
+                return value
+
+    try:
+        value = await acompute()
+        await cache.aset(key, value, settings.GALLERY_CACHE_TIMEOUT)
+    finally:
+        if locked:
+            await cache.adelete(lock_key)
+    return value
@@ -0,0 +1,5 @@
+from django.conf import settings
+
+
+def gallery(request):
+    return {"gallery_fragment_timeout": settings.GALLERY_FRAGMENT_TIMEOUT}
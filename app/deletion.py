@@ -0,0 +1,50 @@
+from django.db import transaction
+
+from app.cache import invalidate_user
+from app.jobs import enqueue, heartbeat, job_handler
+from app.models import UserCatalog, UserImage
+from app.signals import collect_deletions, release_files
+
+DELETE_CATALOG = "delete_catalog"
+RELEASE_FILES = "release_files"
+
+DELETE_BATCH_SIZE = 500
+
+
+def delete_images(images):
+    """Delete the images of a queryset in one transaction, their files after the commit."""
+    with transaction.atomic(), collect_deletions() as deleted:
+        count = images.delete()[1].get(UserImage._meta.label, 0)
+        transaction.on_commit(lambda: finish_deletion(deleted))
+    return count
+
+
+def finish_deletion(deleted):
+    for user_id in deleted["users"]:
+        invalidate_user(user_id)
+    if deleted["files"]:
+        enqueue(RELEASE_FILES, payload={"files": deleted["files"]})
+
+
+def delete_catalog(user, catalog_name):
+    """Hide the catalog right away and delete it with its images in a background job."""
+    catalog = UserCatalog.objects.get(user=user, catalog_name=catalog_name, pending_delete=False)
+    UserCatalog.objects.filter(id=catalog.id).update(pending_delete=True)
+    invalidate_user(user.id)
+    enqueue(DELETE_CATALOG, payload={"catalog_id": catalog.id})
+
+
+@job_handler(DELETE_CATALOG)
+def delete_catalog_images(job):
+    catalog_id = job.payload["catalog_id"]
+    images = UserImage.objects.filter(catalog_id=catalog_id)
+    # Each batch commits on its own, a retried job continues where the last one stopped.
+    while image_ids := list(images.values_list("id", flat=True)[:DELETE_BATCH_SIZE]):
+        delete_images(UserImage.objects.filter(id__in=image_ids))
+        heartbeat(job)
+    UserCatalog.objects.filter(id=catalog_id).delete()
+
+
+@job_handler(RELEASE_FILES)
+def release_deleted_files(job):
+    release_files(job.payload["files"])
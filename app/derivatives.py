@@ -0,0 +1,99 @@
+import base64
+import io
+import math
+import os
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+from app.models import UserImageDerivative
+from app.similarity import HASH_FIELDS, get_dhash, get_hash_pixels, set_image_hash
+from app.storage import is_content_addressed
+
+DERIVATIVE_WIDTHS = [1600, 800, 200]
+PLACEHOLDER_SIZE = 16
+
+ORIENTATION_TAG = 0x0112
+ROTATED_ORIENTATIONS = {5, 6, 7, 8}
+
+DERIVATIVE_FORMATS = {
+    UserImageDerivative.WEBP: ("WEBP", {"quality": 80, "method": 4}),
+    UserImageDerivative.JPEG: ("JPEG", {"quality": 85, "optimize": True, "progressive": True}),
+}
+
+
+def get_derivative_widths(original_width):
+    widths = [width for width in DERIVATIVE_WIDTHS if width < original_width]
+    return widths or [original_width]
+
+
+def get_derivative_name(image_name, width, image_format):
+    stem, _ = os.path.splitext(image_name)
+    return f"{stem}_{width}w.{image_format}"
+
+
+def encode_derivative(image, image_format):
+    pil_format, options = DERIVATIVE_FORMATS[image_format]
+    if pil_format == "JPEG" and image.mode != "RGB":
+        image = image.convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, pil_format, **options)
+    return buffer.getvalue()
+
+
+def get_placeholder(image):
+    """A WebP data URI of the picture at most PLACEHOLDER_SIZE pixels wide and high."""
+    placeholder = image.convert("RGB")
+    placeholder.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.BOX)
+    buffer = io.BytesIO()
+    placeholder.save(buffer, "WEBP", quality=50)
+    return "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode()
+
+
+def save_derivative(storage, name, encode, reuse):
+    """Derivatives of a content-addressed original are shared by every upload of it."""
+    if reuse and storage.exists(name):
+        return name
+    return storage.save(name, ContentFile(encode()))
+
+
+def create_image_derivatives(image):
+    """Store downscaled WebP and JPEG copies of the uploaded file, largest first, hash the
+    picture for app.similarity and keep a placeholder for the gallery."""
+    with Image.open(image.image) as original:
+        original_width, original_height = original.size
+        if original.getexif().get(ORIENTATION_TAG) in ROTATED_ORIENTATIONS:
+            original_width, original_height = original_height, original_width
+        widths = get_derivative_widths(original_width)
+
+        scale = widths[0] / original_width
+        original.draft("RGB", (math.ceil(original.size[0] * scale),
+                               math.ceil(original.size[1] * scale)))
+        source = ImageOps.exif_transpose(original)
+        if source.mode not in ("RGB", "RGBA"):
+            source = source.convert("RGBA" if "A" in source.getbands() else "RGB")
+
+        image.derivatives.all().delete()
+        derivatives = []
+        for width in widths:
+            height = max(1, round(original_height * width / original_width))
+            source = source.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+            for image_format in DERIVATIVE_FORMATS:
+                derivative = UserImageDerivative(image=image, width=width, height=height,
+                                                 format=image_format)
+                derivative.file.name = save_derivative(
+                    derivative.file.storage,
+                    get_derivative_name(image.image.name, width, image_format),
+                    lambda: encode_derivative(source, image_format),
+                    reuse=is_content_addressed(image.image.name),
+                )
+                derivatives.append(derivative)
+
+        # The smallest copy is plenty for the perceptual hash and the placeholder.
+        set_image_hash(image, get_dhash(get_hash_pixels(source)))
+        image.placeholder = get_placeholder(source)
+
+    UserImageDerivative.objects.bulk_create(derivatives)
+    image.width, image.height = original_width, original_height
+    image.save(update_fields=["width", "height", "placeholder", "updated_at", *HASH_FIELDS])
+    return derivatives
@@ -0,0 +1,271 @@
+import io
+import os
+import struct
+
+from django.db.models.fields.files import FieldFile
+from PIL.ExifTags import GPSTAGS, TAGS
+from PIL.TiffImagePlugin import IFDRational
+from PIL.TiffTags import lookup
+
+from app.metrics import timed
+
+EXIF_HEADER = b"Exif\x00\x00"
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+TIFF_HEADERS = (b"II*\x00", b"MM\x00*")
+
+EXIF_IFD = 0x8769
+GPS_IFD = 0x8825
+INTEROP_IFD = 0xA005
+
+INTEROP_TAGS = {
+    0x0001: "InteropIndex",
+    0x0002: "InteropVersion",
+    0x1000: "RelatedImageFileFormat",
+    0x1001: "RelatedImageWidth",
+    0x1002: "RelatedImageLength",
+}
+
+# IFD name -> (pointer tag, IFD holding the pointer, tag names), IFD0 is named "Image".
+EXIF_GROUPS = {
+    "Image": (None, None, TAGS),
+    "Exif": (EXIF_IFD, "Image", TAGS),
+    "GPS": (GPS_IFD, "Image", GPSTAGS),
+    "Interop": (INTEROP_IFD, "Exif", INTEROP_TAGS),
+}
+
+BYTE, ASCII, SHORT, LONG, RATIONAL, UNDEFINED, SIGNED_RATIONAL = 1, 2, 3, 4, 5, 7, 10
+
+# TIFF field type -> (size of one value, struct format), as loaded by Pillow.
+FIELD_TYPES = {
+    BYTE: (1, None),
+    ASCII: (1, None),
+    SHORT: (2, "H"),
+    LONG: (4, "L"),
+    RATIONAL: (8, "L"),
+    6: (1, "b"),
+    UNDEFINED: (1, None),
+    8: (2, "h"),
+    9: (4, "l"),
+    SIGNED_RATIONAL: (8, "l"),
+    11: (4, "f"),
+    12: (8, "d"),
+    13: (4, "L"),
+    16: (8, "Q"),
+}
+
+TAG_IDS = {name: tag_id for tag_id, name in TAGS.items()}
+
+
+class ExifReader:
+    """Decode EXIF entries straight from the TIFF structure of the file, without Pillow.
+
+    Values match ``Image.open(path)._getexif()`` named through ``TAGS``, in file order.
+    """
+
+    def __init__(self, file):
+        self.file = file
+        self.size = file.seek(0, os.SEEK_END)
+        header = self.read(0, 8)
+        self.endian = "<" if header[:2] == b"II" else ">"
+        self.first_ifd = self.unpack("L", header[4:])[0]
+
+    def read(self, position, size):
+        # Sizes come from the file, never read (and allocate) more than it holds.
+        if position + size > self.size:
+            raise EOFError
+        self.file.seek(position)
+        data = self.file.read(size)
+        if len(data) != size:
+            raise EOFError
+        return data
+
+    def unpack(self, fmt, data):
+        return struct.unpack(self.endian + fmt, data)
+
+    def read_entries(self, position, tags=None):
+        """Raw values of the IFD entries in file order, None for tags that are not wanted.
+
+        Like Pillow, stop at the first entry that cannot be read and skip unsupported types
+        and values that would lie beyond the end of the file.
+        """
+        entries = {}
+        try:
+            count = self.unpack("H", self.read(position, 2))[0]
+            for index in range(count):
+                entry = self.read(position + 2 + index * 12, 12)
+                tag, field_type, value_count, data = self.unpack("HHL4s", entry)
+                if field_type not in FIELD_TYPES or not value_count:
+                    continue
+                if tags is not None and tag not in tags:
+                    entries[tag] = None
+                    continue
+                size = FIELD_TYPES[field_type][0] * value_count
+                if size <= 4:
+                    entries[tag] = field_type, data[:size]
+                    continue
+                offset = self.unpack("L", data)[0]
+                if offset + size <= self.size:
+                    entries[tag] = field_type, self.read(offset, size)
+        except EOFError:
+            pass
+        return entries
+
+    def decode(self, tag, field_type, data):
+        if field_type == ASCII:
+            if data.endswith(b"\x00"):
+                data = data[:-1]
+            return data.decode("latin-1", "replace")
+        if field_type in (BYTE, UNDEFINED):
+            return data
+
+        fmt = FIELD_TYPES[field_type][1]
+        values = self.unpack(f"{len(data) // struct.calcsize('=' + fmt)}{fmt}", data)
+        if field_type in (RATIONAL, SIGNED_RATIONAL):
+            values = tuple(IFDRational(numerator, denominator)
+                           for numerator, denominator in zip(values[::2], values[1::2]))
+        if len(values) == 1 or lookup(tag).length == 1:
+            return values[0]
+        return values
+
+    def read_ifd(self, position, tags=None):
+        entries = self.read_entries(position, tags)
+        return {tag: self.decode(tag, *entry) for tag, entry in entries.items()
+                if entry is not None}
+
+    def read_groups(self):
+        """Every IFD's tags in file order, keyed by the names of EXIF_GROUPS."""
+        groups = {}
+        for group, (pointer, parent, _) in EXIF_GROUPS.items():
+            position = self.first_ifd if pointer is None else groups[parent].pop(pointer, None)
+            if not isinstance(position, int):
+                groups[group] = {}
+                continue
+            entries = self.read_entries(position)
+            groups[group] = {tag: self.decode(tag, *entry) for tag, entry in entries.items()}
+        return groups
+
+    def read_exif(self, tags=None):
+        """Merge IFD0 with the Exif and GPS IFDs, like Pillow's ``_getexif``."""
+        wanted = None if tags is None else tags | {EXIF_IFD, GPS_IFD}
+        exif = self.read_ifd(self.first_ifd, wanted)
+
+        exif_ifd = exif.get(EXIF_IFD)
+        if tags is not None and EXIF_IFD not in tags:
+            exif.pop(EXIF_IFD, None)
+        if isinstance(exif_ifd, int) and (tags is None or tags - set(exif)):
+            exif.update(self.read_ifd(exif_ifd, tags))
+
+        if GPS_IFD in exif:
+            if tags is not None and GPS_IFD not in tags:
+                del exif[GPS_IFD]
+            else:
+                gps_ifd = exif[GPS_IFD]
+                exif[GPS_IFD] = self.read_ifd(gps_ifd) if isinstance(gps_ifd, int) else None
+        return exif
+
+
+def find_jpeg_exif(file):
+    """Read the segments up to the first Exif APP1, which is all the EXIF Pillow uses."""
+    file.seek(2)
+    while True:
+        marker = file.read(4)
+        if len(marker) != 4 or marker[0] != 0xFF or marker[1] in (0xD9, 0xDA):
+            return None
+        length = struct.unpack(">H", marker[2:])[0] - 2
+        if marker[1] == 0xE1 and file.read(5) == EXIF_HEADER[:5]:
+            segment = file.read(length - 5)
+            return io.BytesIO(strip_exif_header(b"Exif\x00" + segment))
+        else:
+            file.seek(file.tell() + length - (5 if marker[1] == 0xE1 else 0))
+
+
+def find_png_exif(file):
+    file.seek(len(PNG_SIGNATURE))
+    while True:
+        header = file.read(8)
+        if len(header) != 8 or header[4:] == b"IEND":
+            return None
+        length = struct.unpack(">L", header[:4])[0]
+        if header[4:] == b"eXIf":
+            return io.BytesIO(strip_exif_header(file.read(length)))
+        file.seek(file.tell() + length + 4)
+
+
+def find_webp_exif(file):
+    file.seek(12)
+    while True:
+        header = file.read(8)
+        if len(header) != 8:
+            return None
+        length = struct.unpack("<L", header[4:])[0]
+        if header[:4] == b"EXIF":
+            return io.BytesIO(strip_exif_header(file.read(length)))
+        file.seek(file.tell() + length + length % 2)
+
+
+def strip_exif_header(data):
+    return data[len(EXIF_HEADER):] if data.startswith(EXIF_HEADER) else data
+
+
+def find_exif(file):
+    """The TIFF structure holding the EXIF as a file-like object, None without EXIF."""
+    file.seek(0)
+    signature = file.read(12)
+    if signature[:2] == b"\xff\xd8":
+        return find_jpeg_exif(file)
+    if signature[:8] == PNG_SIGNATURE:
+        return find_png_exif(file)
+    if signature[:4] == b"RIFF" and signature[8:] == b"WEBP":
+        return find_webp_exif(file)
+    if signature[:4] in TIFF_HEADERS:
+        return file
+    return None
+
+
+def read_exif_tags(file, tags=None):
+    tiff = find_exif(file)
+    if tiff is None:
+        return {}
+    try:
+        return ExifReader(tiff).read_exif(tags)
+    except (EOFError, struct.error):
+        return {}
+
+
+def read_exif_groups_tags(file):
+    tiff = find_exif(file)
+    if tiff is None:
+        return {}
+    try:
+        return ExifReader(tiff).read_groups()
+    except (EOFError, struct.error):
+        return {}
+
+
+def read_image(image, read):
+    """Call read with the file of an image path, a stored FieldFile or a file object."""
+    if isinstance(image, (str, os.PathLike)):
+        with open(image, "rb") as file:
+            return read(file)
+    if isinstance(image, FieldFile):
+        with image.open("rb"):
+            return read(image)
+    return read(image)
+
+
+@timed("image")
+def read_exif(image, tag_names=None):
+    """EXIF of an image path or file keyed by tag name, decoding only tag_names when given."""
+    tags = None if tag_names is None else {TAG_IDS[name] for name in tag_names}
+    exif = read_image(image, lambda file: read_exif_tags(file, tags))
+    return {TAGS.get(tag_id, tag_id): data for tag_id, data in exif.items()}
+
+
+@timed("image")
+def read_exif_groups(image):
+    """All EXIF of an image grouped by IFD ("Image", "Exif", "GPS", "Interop"), keyed by tag
+    name, empty when the image has none."""
+    groups = read_image(image, read_exif_groups_tags)
+    return {group: {EXIF_GROUPS[group][2].get(tag_id, tag_id): data
+                    for tag_id, data in tags.items()}
+            for group, tags in groups.items() if tags}
@@ -1,4 +1,4 @@
-from django.forms import ModelForm
+from django.forms import FileField, ModelForm
 from app.models import UserCatalog, UserImage
 
 
@@ -6,6 +6,8 @@ class UploadImgForm(ModelForm):
     class Meta:
         model = UserImage
         fields = ["name", "image", "description"]
+        # Pillow verification runs in the image thread pool, see views.upload_img.
+        field_classes = {"image": FileField}
 
 
 class NewCatalogForm(ModelForm):
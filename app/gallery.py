@@ -0,0 +1,46 @@
+from app.utils import (acreate_img_list_from_catalog, create_img_list_from_catalog,
+                       SORT_TAGS)
+
+
+class GalleryPipeline:
+    """The gallery of a request: catalog filter -> search -> sort -> page.
+
+    The stages only record what to build, the page is loaded once on first access. Views
+    change images before loading it, so the page always reflects their changes.
+    """
+
+    def __init__(self, request, catalog_name="All", sort_parameter_tag=None, cursor=None,
+                 query=""):
+        self.request = request
+        self.catalog_name = catalog_name or "All"
+        self.query = (query or "").strip()
+        self.sort_parameter_tag = sort_parameter_tag if sort_parameter_tag in SORT_TAGS else None
+        self.cursor = cursor
+        self.images = None
+
+    def filter_catalog(self, catalog_name):
+        if catalog_name != self.catalog_name:
+            self.catalog_name = catalog_name
+            self.cursor = None
+            self.images = None
+        return self
+
+    def search(self, query):
+        query = (query or "").strip()
+        if query != self.query:
+            self.query = query
+            self.cursor = None
+            self.images = None
+        return self
+
+    def get_images(self):
+        if self.images is None:
+            self.images = create_img_list_from_catalog(
+                self.request, self.catalog_name, self.sort_parameter_tag, self.cursor, self.query)
+        return self.images
+
+    async def aget_images(self):
+        if self.images is None:
+            self.images = await acreate_img_list_from_catalog(
+                self.request, self.catalog_name, self.sort_parameter_tag, self.cursor, self.query)
+        return self.images
@@ -0,0 +1,129 @@
+import logging
+import threading
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import OperationalError, close_old_connections
+from django.db.models import F, Q
+from django.utils import timezone
+
+from app.cache import invalidate_user
+from app.models import bulk_create_with_ids, ImageJob
+
+logger = logging.getLogger(__name__)
+
+JOB_HANDLERS = {}
+
+CLAIM_BATCH_SIZE = 10
+
+
+def job_handler(kind):
+    def register(handler):
+        JOB_HANDLERS[kind] = handler
+        return handler
+    return register
+
+
+def enqueue(kind, image=None, payload=None):
+    """Queue a job for the workers, or run it right away when JOBS_EAGER is set."""
+    job = ImageJob.objects.create(kind=kind, image=image, payload=payload or {})
+    if settings.JOBS_EAGER:
+        run_eagerly(job)
+    return job
+
+
+def enqueue_many(kind, images):
+    """Queue one job per image with a single INSERT."""
+    jobs = bulk_create_with_ids(ImageJob, [ImageJob(kind=kind, image=image) for image in images])
+    if settings.JOBS_EAGER:
+        for job in jobs:
+            run_eagerly(job)
+    return jobs
+
+
+def run_eagerly(job):
+    ImageJob.objects.filter(id=job.id).update(state=ImageJob.RUNNING, attempts=1)
+    job.state, job.attempts = ImageJob.RUNNING, 1
+    run_job(job)
+
+
+def get_retry_delay(attempts):
+    delay = settings.JOBS_RETRY_BASE_DELAY * 2 ** (attempts - 1)
+    return timedelta(seconds=min(delay, settings.JOBS_RETRY_MAX_DELAY))
+
+
+def claim_next_job():
+    """Atomically move one due job to RUNNING, also taking over jobs of crashed workers."""
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.JOBS_RUNNING_TIMEOUT)
+    due = ImageJob.objects.filter(
+        Q(state=ImageJob.QUEUED, run_after__lte=now)
+        | Q(state=ImageJob.RUNNING, updated_at__lt=stale)
+    ).order_by("run_after", "id").values_list("id", "state")[:CLAIM_BATCH_SIZE]
+
+    for job_id, state in due:
+        claimed = ImageJob.objects.filter(id=job_id, state=state).exclude(
+            state=ImageJob.RUNNING, updated_at__gte=stale
+        ).update(state=ImageJob.RUNNING, attempts=F("attempts") + 1, updated_at=now)
+        if claimed:
+            return ImageJob.objects.select_related("image").get(id=job_id)
+    return None
+
+
+def heartbeat(job):
+    """Show that a long running job is alive, claim_next_job takes over RUNNING jobs that
+    were not updated for JOBS_RUNNING_TIMEOUT seconds."""
+    ImageJob.objects.filter(id=job.id, state=ImageJob.RUNNING).update(updated_at=timezone.now())
+
+
+def run_job(job):
+    try:
+        JOB_HANDLERS[job.kind](job)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            job.state = ImageJob.FAILED
+            logger.error("Job %s (%s) failed for good:\n%s", job.id, job.kind, job.last_error)
+        else:
+            job.state = ImageJob.QUEUED
+            job.run_after = timezone.now() + get_retry_delay(job.attempts)
+            logger.warning("Job %s (%s) failed, retrying at %s", job.id, job.kind, job.run_after)
+    else:
+        job.state = ImageJob.DONE
+        job.last_error = ""
+
+    ImageJob.objects.filter(id=job.id).update(state=job.state, run_after=job.run_after,
+                                              last_error=job.last_error,
+                                              updated_at=timezone.now())
+    if job.image_id:
+        # The gallery shows the processing state of each image.
+        invalidate_user(job.image.user_id)
+    return job
+
+
+def run_pending_jobs():
+    count = 0
+    while job := claim_next_job():
+        run_job(job)
+        count += 1
+    return count
+
+
+def work(stop_event=None, poll_interval=None):
+    """Worker loop: run due jobs until stop_event is set, sleeping while the queue is empty."""
+    stop_event = stop_event or threading.Event()
+    poll_interval = poll_interval or settings.JOBS_POLL_INTERVAL
+
+    while not stop_event.is_set():
+        close_old_connections()
+        try:
+            job = claim_next_job()
+        except OperationalError:
+            logger.warning("Could not claim a job, the database is busy")
+            job = None
+
+        if job is None:
+            stop_event.wait(poll_interval)
+        else:
+            run_job(job)
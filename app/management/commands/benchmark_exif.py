@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from PIL import Image
+from PIL.ExifTags import TAGS
+
+from app.exif import read_exif
+from app.models import UserImage
+from app.utils import METADATA_TAGS
+
+
+def pillow_read_exif(image_path):
+    """The EXIF reading this project did before app.exif, kept as the baseline."""
+    with Image.open(image_path) as image_file:
+        exif_data = image_file._getexif()
+
+    if exif_data is None:
+        return {}
+    return {TAGS.get(tag_id, tag_id): data for tag_id, data in exif_data.items()}
+
+
+def as_comparable(exif):
+    """Tags to their repr, app.exif keeps the file order and NaN rationals never compare
+    equal."""
+    return {tag: repr(data) for tag, data in exif.items()}
+
+
+class Command(BaseCommand):
+    help = "Compare the speed and results of app.exif with reading EXIF through Pillow."
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="*",
+                            help="Images to read, defaults to the stored uploads.")
+        parser.add_argument("--iterations", type=int, default=100)
+
+    def handle(self, *args, **options):
+        paths = options["paths"] or [image.image.path for image in UserImage.objects.all()[:100]]
+        if not paths:
+            raise CommandError("No images to read, pass some paths.")
+
+        readers = {
+            "pillow": pillow_read_exif,
+            "app.exif": read_exif,
+            "app.exif (metadata tags)": lambda path: read_exif(path, METADATA_TAGS),
+        }
+        for name, reader in readers.items():
+            start = time.perf_counter()
+            for _ in range(options["iterations"]):
+                for path in paths:
+                    reader(path)
+            elapsed = time.perf_counter() - start
+            per_file = elapsed / (options["iterations"] * len(paths)) * 1e6
+            self.stdout.write(f"{name:<26} {elapsed:8.3f} s {per_file:10.1f} us/file")
+
+        mismatches = [path for path in paths
+                      if as_comparable(pillow_read_exif(path)) != as_comparable(read_exif(path))]
+        for path in mismatches:
+            self.stdout.write(self.style.WARNING(f"Different EXIF: {path}"))
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS(f"Same EXIF for all {len(paths)} files."))
@@ -0,0 +1,39 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from app.benchmark import BENCHMARK_SIZES, run_benchmark
+
+
+class Command(BaseCommand):
+    help = ("Measure latency, query counts and response sizes of the gallery views for "
+            "seeded galleries of several sizes and save the report as JSON.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=BENCHMARK_SIZES,
+                            help="Gallery sizes, a missing benchmark-<size> user is seeded.")
+        parser.add_argument("--requests", type=int, default=20, help="Requests per view.")
+        parser.add_argument("--views", nargs="+", help="Only benchmark these views.")
+        parser.add_argument("--cold", action="store_true",
+                            help="Clear the cache before every request.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", help="Report file, defaults to benchmark-<time>.json.")
+
+    def handle(self, *args, **options):
+        report = run_benchmark(options["sizes"], options["requests"], options["cold"],
+                               options["seed"], options["views"])
+
+        for run in report["runs"]:
+            self.stdout.write(f"{run['images']} images")
+            for name, result in run["views"].items():
+                latency = result["latency_ms"]
+                self.stdout.write(
+                    f"  {name:<16} p50 {latency['p50']:9.2f} ms  p95 {latency['p95']:9.2f} ms  "
+                    f"p99 {latency['p99']:9.2f} ms  {result['queries']['p50']:4} queries  "
+                    f"{result['bytes']['p50']:9} bytes  {result['errors']} errors")
+
+        output = options["output"] or f"benchmark-{timezone.now():%Y%m%d-%H%M%S}.json"
+        with open(output, "w") as report_file:
+            json.dump(report, report_file, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Saved the report to {output}."))
@@ -0,0 +1,35 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from app.benchmark import run_write_benchmark, WRITE_WORKERS
+
+
+class Command(BaseCommand):
+    help = ("Insert images from several threads at once and report the throughput and the "
+            "transactions that failed, e.g. with \"database is locked\".")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, nargs="+", default=WRITE_WORKERS,
+                            help="Numbers of concurrent writers to measure.")
+        parser.add_argument("--writes", type=int, default=100, help="Writes per worker.")
+        parser.add_argument("--output",
+                            help="Report file, defaults to benchmark-writes-<time>.json.")
+
+    def handle(self, *args, **options):
+        report = run_write_benchmark(options["workers"], options["writes"])
+
+        for run in report["runs"]:
+            latency = run["latency_ms"]
+            self.stdout.write(
+                f"{run['workers']:3} workers  {run['writes_per_second']:8.1f} writes/s  "
+                f"p50 {latency['p50']:8.2f} ms  p99 {latency['p99']:8.2f} ms  "
+                f"{sum(run['errors'].values())} errors")
+            for error, count in run["errors"].items():
+                self.stdout.write(f"    {count} x {error}")
+
+        output = options["output"] or f"benchmark-writes-{timezone.now():%Y%m%d-%H%M%S}.json"
+        with open(output, "w") as report_file:
+            json.dump(report, report_file, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Saved the report to {output}."))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from app.models import UserImage
+from app.utils import save_image_metadata
+
+
+class Command(BaseCommand):
+    help = "Store EXIF metadata for images uploaded before it was saved at upload time."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true",
+                            help="Re-extract metadata also for images that already have it.")
+
+    def handle(self, *args, **options):
+        images = UserImage.objects.all()
+        if not options["all"]:
+            images = images.filter(metadata__isnull=True)
+
+        count = 0
+        for image in images.iterator():
+            save_image_metadata(image)
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Stored metadata for {count} images."))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app.models import UserImage
+from app.similarity import DUPLICATE_DISTANCE, backfill_hashes, find_duplicate_groups
+
+
+class Command(BaseCommand):
+    help = "Report groups of duplicate and near-duplicate images by their perceptual hash."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Only report the images of this username.")
+        parser.add_argument("--distance", type=int, default=DUPLICATE_DISTANCE,
+                            help="Largest number of differing hash bits of near-duplicates.")
+        parser.add_argument("--backfill", action="store_true",
+                            help="First hash the stored images that have no hash yet.")
+
+    def handle(self, *args, **options):
+        if not 0 <= options["distance"] < 64:
+            raise CommandError("The distance has to be between 0 and 63.")
+        images = UserImage.objects.filter(catalog__pending_delete=False)
+        if options["user"]:
+            images = images.filter(user__username=options["user"])
+
+        if options["backfill"]:
+            self.stdout.write(f"Hashed {backfill_hashes(images)} images.")
+
+        groups = find_duplicate_groups(images, options["distance"])
+        names = dict(images.filter(dhash_0__isnull=False).values_list("id", "name").iterator())
+        for group in groups:
+            self.stdout.write(", ".join(f"{image_id} {names[image_id]}" for image_id in group))
+        self.stdout.write(self.style.SUCCESS(
+            f"Found {len(groups)} groups of {sum(map(len, groups))} similar images."))
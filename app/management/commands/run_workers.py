@@ -0,0 +1,48 @@
+import multiprocessing
+import os
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from app.jobs import run_pending_jobs, work
+
+
+class Command(BaseCommand):
+    help = "Run background workers that process queued upload jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                            help="Number of workers, defaults to the number of CPU cores.")
+        parser.add_argument("--processes", action="store_true",
+                            help="Run workers as processes instead of threads.")
+        parser.add_argument("--burst", action="store_true",
+                            help="Process the jobs that are due and exit.")
+
+    def handle(self, *args, **options):
+        if options["burst"]:
+            count = run_pending_jobs()
+            self.stdout.write(self.style.SUCCESS(f"Processed {count} jobs."))
+            return
+
+        stop_event = multiprocessing.Event() if options["processes"] else threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+
+        # Forked processes must not share the parent's database connection.
+        connections.close_all()
+        worker_class = multiprocessing.Process if options["processes"] else threading.Thread
+        workers = [worker_class(target=work, args=(stop_event,), daemon=True)
+                   for _ in range(options["workers"])]
+        for worker in workers:
+            worker.start()
+
+        self.stdout.write(f"Started {len(workers)} workers, press CTRL-C to stop.")
+        try:
+            while not stop_event.is_set():
+                stop_event.wait(1)
+        except KeyboardInterrupt:
+            stop_event.set()
+
+        for worker in workers:
+            worker.join()
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from app.benchmark import seed_gallery
+
+
+class Command(BaseCommand):
+    help = "Create users with catalogs of synthetic JPEGs that carry camera EXIF."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1)
+        parser.add_argument("--catalogs", type=int, default=10, help="Catalogs per user.")
+        parser.add_argument("--images", type=int, default=100, help="Images per catalog.")
+        parser.add_argument("--prefix", default="seed",
+                            help="Users are named <prefix>-0, <prefix>-1, ...")
+        parser.add_argument("--size", type=int, nargs=2, default=[160, 120],
+                            metavar=("WIDTH", "HEIGHT"))
+        parser.add_argument("--seed", type=int, default=0, help="Seed of the random EXIF.")
+        parser.add_argument("--process", action="store_true",
+                            help="Queue the derivative jobs for the workers.")
+
+    def handle(self, *args, **options):
+        users = seed_gallery(options["users"], options["catalogs"], options["images"],
+                             options["prefix"], tuple(options["size"]), options["seed"],
+                             options["process"])
+        count = options["users"] * options["catalogs"] * options["images"]
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {count} images for {', '.join(user.username for user in users)}."))
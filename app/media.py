@@ -0,0 +1,166 @@
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+from app.staticfiles import ENCODINGS
+from app.storage import is_immutable_name
+
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+STATIC_IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+STATIC_REVALIDATE_CACHE_CONTROL = "public, no-cache"
+QVALUE_ZERO_RE = re.compile(r"^q=0(\.0*)?$")
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def get_etag(name, stat):
+    if is_immutable_name(name):
+        return quote_etag(os.path.splitext(os.path.basename(name))[0])
+    return quote_etag(f"{stat.st_size:x}-{int(stat.st_mtime):x}")
+
+
+def parse_range(header, size):
+    """Return (start, end) for a single "bytes=" range, None to serve the whole file.
+
+    Raises ValueError for a range that cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+
+    start, end = match.groups()
+    if not start:
+        length = int(end)
+        if length == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def stream_file_range(path, start, end):
+    with open(path, "rb") as file:
+        file.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = file.read(min(STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def range_matches(request, etag, last_modified):
+    if_range = request.headers.get("If-Range")
+    if not if_range:
+        return True
+    if if_range.startswith(("\"", "W/")):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def get_accel_response(path, name):
+    """Let nginx (X-Accel-Redirect) or Apache/lighttpd (X-Sendfile) send the bytes."""
+    response = HttpResponse()
+    if settings.MEDIA_ACCEL_REDIRECT == "X-Accel-Redirect":
+        response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_PREFIX + name
+    else:
+        response[settings.MEDIA_ACCEL_REDIRECT] = path
+    return response
+
+
+def get_file_response(request, path, name, stat, etag, last_modified):
+    if settings.MEDIA_ACCEL_REDIRECT:
+        response = get_accel_response(path, name)
+    else:
+        byte_range = None
+        if request.headers.get("Range") and range_matches(request, etag, last_modified):
+            try:
+                byte_range = parse_range(request.headers["Range"], stat.st_size)
+            except ValueError:
+                response = HttpResponse(status=416)
+                response["Content-Range"] = f"bytes */{stat.st_size}"
+                return response
+
+        if byte_range:
+            start, end = byte_range
+            response = StreamingHttpResponse(stream_file_range(path, start, end), status=206)
+            response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+            response["Content-Length"] = str(end - start + 1)
+        else:
+            response = FileResponse(open(path, "rb"))
+
+    content_type, _ = mimetypes.guess_type(path)
+    response["Content-Type"] = content_type or "application/octet-stream"
+    return response
+
+
+def serve_file(request, storage, name):
+    """Serve a stored file with validators, byte ranges and optional front-server offload."""
+    path = storage.path(name)
+    stat = os.stat(path)
+    etag = get_etag(name, stat)
+    last_modified = int(stat.st_mtime)
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = get_file_response(request, path, name, stat, etag, last_modified)
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    response["Accept-Ranges"] = "bytes"
+    response["Cache-Control"] = (IMMUTABLE_CACHE_CONTROL if is_immutable_name(name)
+                                 else REVALIDATE_CACHE_CONTROL)
+    return response
+
+
+def get_accepted_encodings(request):
+    accepted = set()
+    for part in request.headers.get("Accept-Encoding", "").split(","):
+        coding, _, parameters = part.partition(";")
+        if not QVALUE_ZERO_RE.match(parameters.replace(" ", "").lower()):
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def get_static_variant(request, storage, name):
+    """The path and Content-Encoding of the smallest variant the client accepts."""
+    accepted = get_accepted_encodings(request)
+    for encoding, suffix, _ in ENCODINGS:
+        if encoding in accepted and storage.exists(name + suffix):
+            return storage.path(name + suffix), encoding
+    return storage.path(name), None
+
+
+def serve_static_file(request, storage, name):
+    """Serve a collected static file, precompressed when the client accepts it. Hashed
+    names are cached for a year without revalidation."""
+    path, encoding = get_static_variant(request, storage, name)
+    stat = os.stat(path)
+    etag = quote_etag(f"{stat.st_size:x}-{int(stat.st_mtime):x}")
+    last_modified = int(stat.st_mtime)
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = FileResponse(open(path, "rb"), filename=os.path.basename(name))
+        content_type, _ = mimetypes.guess_type(name)
+        response["Content-Type"] = content_type or "application/octet-stream"
+        if encoding:
+            response["Content-Encoding"] = encoding
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    response["Vary"] = "Accept-Encoding"
+    response["Cache-Control"] = (STATIC_IMMUTABLE_CACHE_CONTROL if storage.is_hashed_name(name)
+                                 else STATIC_REVALIDATE_CACHE_CONTROL)
+    return response
@@ -0,0 +1,213 @@
+import contextvars
+import functools
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# Histograms kept per view: name, help text and buckets.
+METRICS = {
+    "duration": ("picshow_request_duration_seconds", "Wall time of the request.",
+                 DURATION_BUCKETS),
+    "queries": ("picshow_request_queries", "SQL queries run by the request.", QUERY_BUCKETS),
+    "sql": ("picshow_request_sql_duration_seconds", "Time spent in SQL queries.",
+            DURATION_BUCKETS),
+    "template": ("picshow_request_template_duration_seconds", "Time spent rendering templates.",
+                 DURATION_BUCKETS),
+    "image": ("picshow_request_image_duration_seconds",
+              "Time spent reading images and their EXIF.", DURATION_BUCKETS),
+}
+
+_lock = threading.Lock()
+_histograms = {}
+
+_current = contextvars.ContextVar("request_metrics", default=None)
+_active_timers = contextvars.ContextVar("active_timers", default=frozenset())
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RequestMetrics:
+    """What a single request spent, shared by the threads it runs code in."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.queries = 0
+        self.times = Counter()
+
+    def add(self, kind, seconds, queries=0):
+        with self.lock:
+            self.times[kind] += seconds
+            self.queries += queries
+
+
+def observe(metric, view, value):
+    with _lock:
+        histogram = _histograms.get((metric, view))
+        if histogram is None:
+            histogram = _histograms[metric, view] = Histogram(METRICS[metric][2])
+        histogram.observe(value)
+
+
+def reset_metrics():
+    with _lock:
+        _histograms.clear()
+
+
+def render_metrics():
+    """All histograms in the Prometheus text exposition format."""
+    lines = []
+    with _lock:
+        for metric, (name, help_text, _) in METRICS.items():
+            series = sorted((view, histogram) for (kind, view), histogram
+                            in _histograms.items() if kind == metric)
+            if not series:
+                continue
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for view, histogram in series:
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    lines.append(f'{name}_bucket{{view="{view}",le="{bound}"}} {count}')
+                lines.append(f'{name}_bucket{{view="{view}",le="+Inf"}} {histogram.count}')
+                lines.append(f'{name}_sum{{view="{view}"}} {histogram.sum}')
+                lines.append(f'{name}_count{{view="{view}"}} {histogram.count}')
+    return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def timer(kind):
+    """Add the time spent in the block to the current request, nested blocks count once."""
+    metrics = _current.get()
+    if metrics is None or kind in _active_timers.get():
+        yield
+        return
+
+    token = _active_timers.set(_active_timers.get() | {kind})
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add(kind, time.perf_counter() - start)
+        _active_timers.reset(token)
+
+
+def timed(kind):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timer(kind):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.add("sql", time.perf_counter() - start, queries=1)
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        with timer("template"):
+            return super().render(context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, timing each render for the request metrics."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
+
+
+def record_request(request, metrics, duration):
+    view = getattr(request.resolver_match, "view_name", None) or "unmatched"
+    observe("duration", view, duration)
+    observe("queries", view, metrics.queries)
+    for kind in ("sql", "template", "image"):
+        observe(kind, view, metrics.times[kind])
+
+    threshold = settings.SLOW_REQUEST_THRESHOLD
+    if threshold is not None and duration >= threshold:
+        logger.warning(
+            "Slow request %s %s (%s): %.3f s, %d queries in %.3f s, templates %.3f s, "
+            "images %.3f s", request.method, request.path, view, duration, metrics.queries,
+            metrics.times["sql"], metrics.times["template"], metrics.times["image"])
+
+
+class MetricsMiddleware:
+    """Record wall time, SQL, template and image work of every request per view."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            return self.get_response(request)
+        finally:
+            _current.reset(token)
+            record_request(request, metrics, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            return await self.get_response(request)
+        finally:
+            _current.reset(token)
+            record_request(request, metrics, time.perf_counter() - start)
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.3 on 2026-10-18 16:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userimage',
+            name='name',
+            field=models.CharField(db_index=True, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='userimage',
+            name='visible',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.CreateModel(
+            name='UserImageMetadata',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date_time_original', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('model', models.CharField(blank=True, db_index=True, max_length=200, null=True)),
+                ('exposure_time', models.FloatField(blank=True, db_index=True, null=True)),
+                ('f_number', models.FloatField(blank=True, db_index=True, null=True)),
+                ('iso_speed_ratings', models.PositiveIntegerField(blank=True, db_index=True, null=True)),
+                ('lens_model', models.CharField(blank=True, db_index=True, max_length=200, null=True)),
+                ('exif', models.JSONField(blank=True, default=dict)),
+                ('image', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='metadata', to='app.userimage')),
+            ],
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.3 on 2026-10-18 16:35
+
+import app.storage
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0002_userimagemetadata'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userimage',
+            name='image',
+            field=models.ImageField(db_index=True, storage=app.storage.get_image_storage, upload_to='app/images'),
+        ),
+        migrations.AddField(
+            model_name='userimage',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='userimage',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='UserImageDerivative',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('width', models.PositiveIntegerField()),
+                ('height', models.PositiveIntegerField()),
+                ('format', models.CharField(choices=[('webp', 'WebP'), ('jpeg', 'JPEG')], max_length=10)),
+                ('file', models.ImageField(db_index=True, upload_to='app/images')),
+                ('image', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='derivatives', to='app.userimage')),
+            ],
+            options={
+                'ordering': ['width'],
+            },
+        ),
+    ]
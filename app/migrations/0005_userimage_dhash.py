@@ -0,0 +1,49 @@
+# Generated by Django 4.2.3 on 2026-10-18 16:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0004_imagejob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userimage',
+            name='dhash_0',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='userimage',
+            name='dhash_1',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='userimage',
+            name='dhash_2',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='userimage',
+            name='dhash_3',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='userimage',
+            index=models.Index(fields=['user', 'dhash_0'], name='app_userima_user_id_a248ce_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userimage',
+            index=models.Index(fields=['user', 'dhash_1'], name='app_userima_user_id_13eb34_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userimage',
+            index=models.Index(fields=['user', 'dhash_2'], name='app_userima_user_id_47da76_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userimage',
+            index=models.Index(fields=['user', 'dhash_3'], name='app_userima_user_id_06c90a_idx'),
+        ),
+    ]
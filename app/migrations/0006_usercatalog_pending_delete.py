@@ -0,0 +1,18 @@
+# Generated by Django 4.2.3 on 2026-10-18 16:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0005_userimage_dhash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usercatalog',
+            name='pending_delete',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.3 on 2026-10-18 16:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0006_usercatalog_pending_delete'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userimage',
+            name='name',
+            field=models.CharField(max_length=200),
+        ),
+        migrations.AddIndex(
+            model_name='userimage',
+            index=models.Index(fields=['user', 'name'], name='app_userimage_user_name_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='usercatalog',
+            constraint=models.UniqueConstraint(condition=models.Q(('pending_delete', False)), fields=('user', 'catalog_name'), name='app_usercatalog_user_name_uniq'),
+        ),
+    ]
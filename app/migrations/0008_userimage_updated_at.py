@@ -0,0 +1,18 @@
+# Generated by Django 4.2.3 on 2026-10-18 16:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0007_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userimage',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.3 on 2026-10-18 16:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0008_userimage_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userimage',
+            name='placeholder',
+            field=models.TextField(blank=True),
+        ),
+    ]
@@ -0,0 +1,30 @@
+from datetime import datetime, timezone
+
+from django.db import migrations
+
+EXIF_DATETIME_FORMAT = "%Y:%m:%d %H:%M:%S"
+
+
+def use_date_time_original(apps, schema_editor):
+    """date_time_original was read from IFD0 DateTime, take the Exif DateTimeOriginal kept
+    in the stored EXIF document instead."""
+    UserImageMetadata = apps.get_model("app", "UserImageMetadata")
+    for metadata in UserImageMetadata.objects.iterator():
+        value = (metadata.exif or {}).get("Exif", {}).get("DateTimeOriginal")
+        try:
+            date_time = datetime.strptime(str(value).strip("\x00 "), EXIF_DATETIME_FORMAT)
+        except ValueError:
+            continue
+        UserImageMetadata.objects.filter(id=metadata.id).update(
+            date_time_original=date_time.replace(tzinfo=timezone.utc))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0009_userimage_placeholder'),
+    ]
+
+    operations = [
+        migrations.RunPython(use_date_time_original, migrations.RunPython.noop),
+    ]
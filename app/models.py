@@ -1,10 +1,39 @@
-from django.db import models
+from django.db import connections, models, router
 from django.contrib.auth.models import User
+from django.utils import timezone
+
+from app.storage import get_image_storage
+
+TILE_HEIGHT = 200
+
+
+def bulk_create_with_ids(model, objects):
+    """bulk_create that always sets the primary keys of the objects.
+
+    Databases that return no rows from bulk inserts (SQLite before 3.35) get one INSERT per
+    object instead, as callers go on to reference the new rows.
+    """
+    objects = list(objects)
+    if connections[router.db_for_write(model)].features.can_return_rows_from_bulk_insert:
+        return model.objects.bulk_create(objects)
+    for obj in objects:
+        obj.save(force_insert=True)
+    return objects
 
 
 class UserCatalog(models.Model):
     catalog_name = models.CharField(max_length=200)
     user = models.ForeignKey(User, on_delete=models.CASCADE, default='1')
+    # Set while a background job deletes the catalog and its images.
+    pending_delete = models.BooleanField(default=False)
+
+    class Meta:
+        constraints = [
+            # Names are unique among the live catalogs, one pending deletion may share it.
+            models.UniqueConstraint(fields=["user", "catalog_name"],
+                                    condition=models.Q(pending_delete=False),
+                                    name="app_usercatalog_user_name_uniq"),
+        ]
 
     def __str__(self):
         return self.catalog_name
@@ -12,30 +41,164 @@ class UserCatalog(models.Model):
     @staticmethod
     def get_images_from_catalog(user, catalog_name):
         return list(UserCatalog.objects.get(
-            user=user, catalog_name=catalog_name
+            user=user, catalog_name=catalog_name, pending_delete=False
         ).userimage_set.all())
 
     @staticmethod
     def get_catalog_names(user):
-        return list(UserCatalog.objects.filter(user=user).values_list(
+        return list(UserCatalog.objects.filter(user=user, pending_delete=False).values_list(
             "catalog_name", flat=True))
 
+    @staticmethod
+    async def aget_catalog_names(user):
+        return [catalog_name async for catalog_name in UserCatalog.objects.filter(
+            user=user, pending_delete=False).values_list("catalog_name", flat=True)]
+
     @staticmethod
     def delete_catalog(user, catalog_name):
-        UserCatalog.objects.get(user=user, catalog_name=catalog_name).delete()
+        UserCatalog.objects.get(user=user, catalog_name=catalog_name,
+                                pending_delete=False).delete()
 
 
 class UserImage(models.Model):
     name = models.CharField(max_length=200)
-    image = models.ImageField(upload_to="app/images")
+    image = models.ImageField(upload_to="app/images", storage=get_image_storage, db_index=True)
     user = models.ForeignKey(User, on_delete=models.CASCADE, default='1')
     catalog = models.ForeignKey(UserCatalog, on_delete=models.CASCADE,
                                 default='1')
     description = models.TextField(blank=True, max_length='1000')
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    visible = models.BooleanField(default=True)
+    # Data URI of a tiny copy shown blurred while the tile loads, see app.derivatives.
+    placeholder = models.TextField(blank=True)
+    # Changes with anything the gallery shows of the image, keys its cached template fragments.
+    updated_at = models.DateTimeField(auto_now=True)
+    # dHash of the picture in 16-bit chunks, indexed for similarity search, see app.similarity.
+    dhash_0 = models.PositiveIntegerField(null=True, blank=True)
+    dhash_1 = models.PositiveIntegerField(null=True, blank=True)
+    dhash_2 = models.PositiveIntegerField(null=True, blank=True)
+    dhash_3 = models.PositiveIntegerField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["user", field])
+                   for field in ["dhash_0", "dhash_1", "dhash_2", "dhash_3"]] + [
+            models.Index(fields=["user", "name"], name="app_userimage_user_name_idx"),
+        ]
 
     def __str__(self):
         return self.name
 
+    @property
+    def tile_width(self):
+        if not self.width or not self.height:
+            return TILE_HEIGHT
+        return round(TILE_HEIGHT * self.width / self.height)
+
+    def get_srcset(self, image_format):
+        return ", ".join(
+            f"{derivative.file.url} {derivative.width}w"
+            for derivative in self.derivatives.all()
+            if derivative.format == image_format
+        )
+
+    @property
+    def webp_srcset(self):
+        return self.get_srcset(UserImageDerivative.WEBP)
+
+    @property
+    def jpeg_srcset(self):
+        return self.get_srcset(UserImageDerivative.JPEG)
+
+    @property
+    def thumbnail_url(self):
+        jpegs = [derivative for derivative in self.derivatives.all()
+                 if derivative.format == UserImageDerivative.JPEG]
+        if not jpegs:
+            return self.image.url
+        return min(jpegs, key=lambda derivative: derivative.width).file.url
+
     @staticmethod
     def get_all_image_names(user):
-        return list(UserImage.objects.filter(user=user).values_list("name", flat=True))
+        return list(UserImage.objects.filter(user=user, catalog__pending_delete=False).values_list(
+            "name", flat=True))
+
+    @staticmethod
+    def user_owns_file(user, name):
+        return (UserImage.objects.filter(user=user, image=name).exists()
+                or UserImageDerivative.objects.filter(image__user=user, file=name).exists())
+
+    @staticmethod
+    def get_images(user, catalog_name="All", ordering=("id",)):
+        jobs = ImageJob.objects.filter(image=models.OuterRef("pk"))
+        images = UserImage.objects.filter(user=user, catalog__pending_delete=False).annotate(
+            processing=models.Exists(jobs.filter(state__in=[ImageJob.QUEUED, ImageJob.RUNNING])),
+            processing_failed=models.Exists(jobs.filter(state=ImageJob.FAILED)),
+        ).select_related(
+            "catalog", "metadata").prefetch_related("derivatives").order_by(*ordering)
+        if catalog_name != "All":
+            images = images.filter(catalog__catalog_name=catalog_name)
+        return images
+
+
+class UserImageMetadata(models.Model):
+    image = models.OneToOneField(UserImage, on_delete=models.CASCADE,
+                                 related_name="metadata")
+    date_time_original = models.DateTimeField(null=True, blank=True, db_index=True)
+    model = models.CharField(max_length=200, null=True, blank=True, db_index=True)
+    exposure_time = models.FloatField(null=True, blank=True, db_index=True)
+    f_number = models.FloatField(null=True, blank=True, db_index=True)
+    iso_speed_ratings = models.PositiveIntegerField(null=True, blank=True, db_index=True)
+    lens_model = models.CharField(max_length=200, null=True, blank=True, db_index=True)
+    exif = models.JSONField(default=dict, blank=True)
+
+    def __str__(self):
+        return f"Metadata of {self.image}"
+
+
+class UserImageDerivative(models.Model):
+    WEBP = "webp"
+    JPEG = "jpeg"
+    FORMAT_CHOICES = [(WEBP, "WebP"), (JPEG, "JPEG")]
+
+    image = models.ForeignKey(UserImage, on_delete=models.CASCADE,
+                              related_name="derivatives")
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    file = models.ImageField(upload_to="app/images", db_index=True)
+
+    class Meta:
+        ordering = ["width"]
+
+    def __str__(self):
+        return f"{self.image} {self.width}w {self.format}"
+
+
+class ImageJob(models.Model):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATE_CHOICES = [(QUEUED, "Queued"), (RUNNING, "Running"), (DONE, "Done"), (FAILED, "Failed")]
+
+    image = models.ForeignKey(UserImage, on_delete=models.CASCADE, null=True, blank=True,
+                              related_name="jobs")
+    kind = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict, blank=True)
+    state = models.CharField(max_length=10, choices=STATE_CHOICES, default=QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["state", "run_after"]),
+            models.Index(fields=["image", "state"]),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} ({self.state})"
@@ -0,0 +1,103 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+GALLERY_PAGE_SIZE = 48
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class ImagePage(list):
+    def __init__(self, images, next_cursor=None):
+        super().__init__(images)
+        self.next_cursor = next_cursor
+
+
+def encode_cursor(value, image_id):
+    payload = json.dumps([value, image_id], cls=DjangoJSONEncoder)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, image_id = json.loads(payload)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise InvalidCursor(cursor)
+    if not isinstance(image_id, int):
+        raise InvalidCursor(cursor)
+    return value, image_id
+
+
+def resolve_field(model, field_path):
+    *relations, name = field_path.split("__")
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    return model._meta.get_field(name)
+
+
+def get_field_value(obj, field_path):
+    for name in field_path.split("__"):
+        try:
+            obj = getattr(obj, name)
+        except ObjectDoesNotExist:
+            return None
+        if obj is None:
+            return None
+    return obj
+
+
+def get_keyset_filter(field_path, descending, value, image_id):
+    """Rows that come after (value, image_id) when NULL values are sorted last."""
+    after = "lt" if descending else "gt"
+    if field_path == "id":
+        return Q(**{f"id__{after}": image_id})
+    if value is None:
+        return Q(**{f"{field_path}__isnull": True, f"id__{after}": image_id})
+    return (Q(**{f"{field_path}__{after}": value})
+            | Q(**{field_path: value, f"id__{after}": image_id})
+            | Q(**{f"{field_path}__isnull": True}))
+
+
+def get_page_queryset(images, field_path, descending, cursor, page_size):
+    """Slice an already ordered queryset of images to the page after the cursor.
+
+    The cursor holds the sort value and id of the last image on the previous
+    page, so every page is a single indexed range query instead of an OFFSET.
+    One extra row is fetched to know whether a next page exists.
+    """
+    if cursor:
+        value, image_id = decode_cursor(cursor)
+        if value is not None:
+            try:
+                value = resolve_field(images.model, field_path).to_python(value)
+            except ValidationError:
+                raise InvalidCursor(cursor)
+        images = images.filter(get_keyset_filter(field_path, descending, value, image_id))
+    return images[:page_size + 1]
+
+
+def make_page(rows, field_path, page_size):
+    if len(rows) <= page_size:
+        return ImagePage(rows)
+
+    rows = rows[:page_size]
+    last = rows[-1]
+    return ImagePage(rows, encode_cursor(get_field_value(last, field_path), last.id))
+
+
+def paginate_images(images, field_path, descending, cursor=None, page_size=GALLERY_PAGE_SIZE):
+    page = get_page_queryset(images, field_path, descending, cursor, page_size)
+    return make_page(list(page), field_path, page_size)
+
+
+async def apaginate_images(images, field_path, descending, cursor=None,
+                           page_size=GALLERY_PAGE_SIZE):
+    page = get_page_queryset(images, field_path, descending, cursor, page_size)
+    return make_page([image async for image in page], field_path, page_size)
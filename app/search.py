@@ -0,0 +1,191 @@
+import re
+import shlex
+from datetime import datetime, timezone
+from fractions import Fraction
+
+from django.db import connection, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+
+FTS_TABLE = "app_userimage_fts"
+FTS_TABLE_SQL = f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+    name, description, content='app_userimage', content_rowid='id')"""
+# Triggers on app_userimage, dropped whenever a migration remakes that table.
+FTS_TRIGGERS = {
+    f"{FTS_TABLE}_insert": f"""CREATE TRIGGER {FTS_TABLE}_insert AFTER INSERT ON app_userimage
+    BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+    f"{FTS_TABLE}_delete": f"""CREATE TRIGGER {FTS_TABLE}_delete AFTER DELETE ON app_userimage
+    BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END""",
+    f"{FTS_TABLE}_update": f"""CREATE TRIGGER {FTS_TABLE}_update
+    AFTER UPDATE OF name, description ON app_userimage
+    BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+}
+FTS_REBUILD_SQL = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+
+FIELD_PATTERN = re.compile(r"^(\w+)(>=|<=|:|=|>|<)(.*)$")
+DATE_FORMATS = [("%Y-%m-%d", "day"), ("%Y-%m", "month"), ("%Y", "year")]
+MIN_NUMBER, MAX_NUMBER = -2 ** 63, 2 ** 63 - 1
+
+
+class SearchError(ValueError):
+    pass
+
+
+def ensure_search_index(database):
+    """Create the SQLite FTS5 index of names and descriptions and the triggers keeping it up
+    to date, where missing. The index is rebuilt when anything had to be created."""
+    if database.vendor != "sqlite":
+        return
+    with database.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+        existing = {name for name, in cursor.fetchall()}
+        missing = [sql for name, sql in [(FTS_TABLE, FTS_TABLE_SQL), *FTS_TRIGGERS.items()]
+                   if name not in existing]
+        for statement in missing:
+            cursor.execute(statement)
+        if missing:
+            cursor.execute(FTS_REBUILD_SQL)
+
+
+def drop_search_index(database):
+    if database.vendor != "sqlite":
+        return
+    with database.cursor() as cursor:
+        for name in FTS_TRIGGERS:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+@receiver(post_migrate)
+def restore_search_index(sender, using="default", **kwargs):
+    """Recreate triggers dropped by migrations that remake app_userimage after the one
+    creating the index."""
+    if sender.name == "app":
+        ensure_search_index(connections[using])
+
+
+def parse_number(value, cast):
+    """The number clamped to the range of the 64-bit integer columns."""
+    try:
+        number = Fraction(value)
+    except (ValueError, ZeroDivisionError):
+        raise SearchError(f"Not a number: {value}")
+    return cast(min(max(number, MIN_NUMBER), MAX_NUMBER))
+
+
+def parse_date_range(value):
+    """The [start, end) datetimes of a year, month or day."""
+    for date_format, period in DATE_FORMATS:
+        try:
+            start = datetime.strptime(value, date_format).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+        try:
+            if period == "day":
+                end = datetime.fromordinal(start.toordinal() + 1).replace(tzinfo=timezone.utc)
+            elif period == "month":
+                end = start.replace(year=start.year + start.month // 12,
+                                    month=start.month % 12 + 1)
+            else:
+                end = start.replace(year=start.year + 1)
+        except (ValueError, OverflowError):
+            raise SearchError(f"Date out of range: {value}")
+        return start, end
+    raise SearchError(f"Not a date: {value}, use YYYY, YYYY-MM or YYYY-MM-DD")
+
+
+def text_filter(field_path):
+    def make_filter(operator, value):
+        if operator not in (":", "="):
+            raise SearchError(f"Text fields are matched with ':', not '{operator}'")
+        return Q(**{f"{field_path}__icontains": value})
+    return make_filter
+
+
+def number_filter(field_path, cast):
+    lookups = {":": "exact", "=": "exact", ">=": "gte", "<=": "lte", ">": "gt", "<": "lt"}
+
+    def make_filter(operator, value):
+        return Q(**{f"{field_path}__{lookups[operator]}": parse_number(value, cast)})
+    return make_filter
+
+
+def date_filter(operator, value):
+    start, end = parse_date_range(value)
+    field_path = "metadata__date_time_original"
+    if operator in (":", "="):
+        return Q(**{f"{field_path}__gte": start, f"{field_path}__lt": end})
+    return Q(**{
+        ">=": {f"{field_path}__gte": start},
+        ">": {f"{field_path}__gte": end},
+        "<=": {f"{field_path}__lt": end},
+        "<": {f"{field_path}__lt": start},
+    }[operator])
+
+
+FIELD_FILTERS = {
+    "model": text_filter("metadata__model"),
+    "lens": text_filter("metadata__lens_model"),
+    "catalog": text_filter("catalog__catalog_name"),
+    "iso": number_filter("metadata__iso_speed_ratings", int),
+    "f": number_filter("metadata__f_number", float),
+    "exposure": number_filter("metadata__exposure_time", float),
+    "date": date_filter,
+    "year": date_filter,
+}
+
+
+def text_search(words):
+    """Images whose name or description contain words starting with each of the words."""
+    if connection.vendor != "sqlite":
+        query = Q()
+        for word in words:
+            query &= Q(name__icontains=word) | Q(description__icontains=word)
+        return query
+
+    match = " ".join('"{}"*'.format(word.replace('"', '""')) for word in words)
+    return Q(id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+                           [match]))
+
+
+def parse_search(query):
+    """Translate a search like 'sunset lens:"EF 50mm" iso>=3200 year:2023' into a filter.
+
+    Words are looked up in the names and descriptions, field:value, field>=value etc.
+    compare camera data. All parts have to match.
+    """
+    try:
+        tokens = shlex.split(query or "")
+    except ValueError:
+        raise SearchError("Unbalanced quotes in the search.")
+
+    condition, words = Q(), []
+    for token in tokens:
+        match = FIELD_PATTERN.match(token)
+        if match is None:
+            words.append(token)
+            continue
+        field, operator, value = match.groups()
+        if field not in FIELD_FILTERS:
+            raise SearchError(f"Unknown search field: {field}, use one of "
+                              f"{', '.join(FIELD_FILTERS)}")
+        if not value:
+            raise SearchError(f"Missing value for {field}")
+        condition &= FIELD_FILTERS[field](operator, value)
+
+    if words:
+        condition &= text_search(words)
+    return condition
@@ -0,0 +1,103 @@
+import os
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from app.cache import invalidate_user
+from app.models import UserCatalog, UserImage, UserImageDerivative, UserImageMetadata
+
+RELEASE_CHUNK_SIZE = 500
+
+_collecting = threading.local()
+
+
+@contextmanager
+def collect_deletions():
+    """Collect the files and users of rows deleted in the block instead of handling each row.
+
+    The caller releases deleted["files"] with release_files and invalidates deleted["users"].
+    """
+    deleted = {"files": [], "users": set()}
+    stack = _collecting.__dict__.setdefault("stack", [])
+    stack.append(deleted)
+    try:
+        yield deleted
+    finally:
+        stack.pop()
+
+
+def get_collected_deletions():
+    stack = getattr(_collecting, "stack", None)
+    return stack[-1] if stack else None
+
+
+def release_file(model, field_name, storage, name):
+    """Delete a stored file once no row of the model references it anymore."""
+    if not name or os.path.isabs(name):
+        return
+    if not model.objects.filter(**{field_name: name}).exists():
+        storage.delete(name)
+
+
+def release_files(files):
+    """Like release_file for many (model label, field name, file name) entries, with one query
+    per model field and RELEASE_CHUNK_SIZE names."""
+    names_by_field = defaultdict(set)
+    for label, field_name, name in files:
+        if name and not os.path.isabs(name):
+            names_by_field[label, field_name].add(name)
+
+    for (label, field_name), names in names_by_field.items():
+        model = apps.get_model(label)
+        storage = model._meta.get_field(field_name).storage
+        names = sorted(names)
+        for start in range(0, len(names), RELEASE_CHUNK_SIZE):
+            chunk = names[start:start + RELEASE_CHUNK_SIZE]
+            used = set(model.objects.filter(**{f"{field_name}__in": chunk}).values_list(
+                field_name, flat=True))
+            for name in chunk:
+                if name not in used:
+                    storage.delete(name)
+
+
+def release_file_on_commit(model, field_name, field_file):
+    deleted = get_collected_deletions()
+    if deleted is not None:
+        deleted["files"].append([model._meta.label, field_name, field_file.name])
+        return
+    storage, name = field_file.storage, field_file.name
+    transaction.on_commit(lambda: release_file(model, field_name, storage, name))
+
+
+@receiver(post_delete, sender=UserImage)
+def release_image_file(sender, instance, **kwargs):
+    release_file_on_commit(UserImage, "image", instance.image)
+
+
+@receiver(post_delete, sender=UserImageDerivative)
+def release_derivative_file(sender, instance, **kwargs):
+    release_file_on_commit(UserImageDerivative, "file", instance.file)
+
+
+@receiver(post_save, sender=UserImage)
+@receiver(post_delete, sender=UserImage)
+@receiver(post_save, sender=UserCatalog)
+@receiver(post_delete, sender=UserCatalog)
+def invalidate_user_gallery(sender, instance, **kwargs):
+    deleted = get_collected_deletions()
+    if deleted is not None:
+        deleted["users"].add(instance.user_id)
+    else:
+        invalidate_user(instance.user_id)
+
+
+@receiver(post_save, sender=UserImageMetadata)
+def invalidate_image_metadata(sender, instance, **kwargs):
+    UserImage.objects.filter(id=instance.image_id).update(updated_at=timezone.now())
+    invalidate_user(instance.image.user_id)
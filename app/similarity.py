@@ -0,0 +1,189 @@
+import logging
+from itertools import combinations, islice
+
+from asgiref.sync import sync_to_async
+from django.db.models import Q
+from PIL import Image, ImageOps
+
+from app.cache import aget_or_compute
+from app.models import UserImage
+from app.utils import image_executor
+
+try:
+    import numpy
+except ImportError:  # Optional, vectorizes hashing many images at once.
+    numpy = None
+
+logger = logging.getLogger(__name__)
+
+HASH_SIZE = 8
+HASH_CHUNKS = 4
+CHUNK_BITS = 16
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+HASH_FIELDS = [f"dhash_{chunk}" for chunk in range(HASH_CHUNKS)]
+
+# Two hashes at most this many bits apart have one of their chunks in common.
+DUPLICATE_DISTANCE = HASH_CHUNKS - 1
+BACKFILL_BATCH_SIZE = 500
+
+
+def get_hash_pixels(image):
+    """The (HASH_SIZE + 1) x HASH_SIZE grayscale pixels of a Pillow image compared by dHash."""
+    return image.convert("L").resize((HASH_SIZE + 1, HASH_SIZE), Image.BOX).tobytes()
+
+
+def read_hash_pixels(image_file):
+    """get_hash_pixels of a stored file, JPEGs are decoded at a reduced size."""
+    with Image.open(image_file) as image:
+        image.draft("L", (HASH_SIZE * 4, HASH_SIZE * 4))
+        return get_hash_pixels(ImageOps.exif_transpose(image))
+
+
+def get_dhash(pixels):
+    """64 bits, one per pixel pair, set when the right pixel is brighter than the left."""
+    value = 0
+    for row in range(HASH_SIZE):
+        start = row * (HASH_SIZE + 1)
+        for column in range(start, start + HASH_SIZE):
+            value = value << 1 | (pixels[column + 1] > pixels[column])
+    return value
+
+
+def get_dhashes(pixels_list):
+    if numpy is None or not pixels_list:
+        return [get_dhash(pixels) for pixels in pixels_list]
+
+    pixels = numpy.frombuffer(b"".join(pixels_list), numpy.uint8).reshape(
+        len(pixels_list), HASH_SIZE, HASH_SIZE + 1)
+    bits = (pixels[:, :, 1:] > pixels[:, :, :-1]).reshape(len(pixels_list), -1)
+    return [int(value) for value in numpy.packbits(bits, axis=1).view(">u8").ravel()]
+
+
+def split_hash(value):
+    return [value >> (CHUNK_BITS * chunk) & CHUNK_MASK for chunk in reversed(range(HASH_CHUNKS))]
+
+
+def join_hash(chunks):
+    value = 0
+    for chunk in chunks:
+        value = value << CHUNK_BITS | chunk
+    return value
+
+
+def get_image_hash(image):
+    chunks = [getattr(image, field) for field in HASH_FIELDS]
+    return None if None in chunks else join_hash(chunks)
+
+
+def set_image_hash(image, value):
+    for field, chunk in zip(HASH_FIELDS, split_hash(value)):
+        setattr(image, field, chunk)
+
+
+def get_distance(value, other):
+    return bin(value ^ other).count("1")
+
+
+def get_chunk_variants(chunk, distance):
+    """All chunk values at most distance bits away from chunk."""
+    variants = [chunk]
+    for bits in range(1, distance + 1):
+        for positions in combinations(range(CHUNK_BITS), bits):
+            variant = chunk
+            for position in positions:
+                variant ^= 1 << position
+            variants.append(variant)
+    return variants
+
+
+def find_similar_images(image, max_distance=DUPLICATE_DISTANCE):
+    """Other images of the owner whose hash is at most max_distance bits away, closest first.
+
+    Multi-index hashing: hashes within max_distance share one chunk within
+    max_distance // HASH_CHUNKS bits, so only rows matching those chunk values in the
+    indexed columns are compared.
+    """
+    value = get_image_hash(image)
+    if value is None:
+        return []
+
+    condition = Q()
+    for field, chunk in zip(HASH_FIELDS, split_hash(value)):
+        variants = get_chunk_variants(chunk, max_distance // HASH_CHUNKS)
+        condition |= Q(**{f"{field}__in": variants})
+    candidates = UserImage.objects.filter(
+        condition, user_id=image.user_id, catalog__pending_delete=False).exclude(
+        id=image.id).select_related("catalog")
+
+    similar = [(get_distance(value, get_image_hash(candidate)), candidate.id, candidate)
+               for candidate in candidates]
+    return [candidate for distance, _, candidate in sorted(similar) if distance <= max_distance]
+
+
+async def aget_similar_images(image):
+    return await aget_or_compute("similar", image.user_id, (image.id,),
+                                 lambda: sync_to_async(find_similar_images)(image))
+
+
+def find_duplicate_groups(images, max_distance=DUPLICATE_DISTANCE):
+    """Group the hashed images of each user, linking images at most max_distance bits apart.
+
+    Returns lists of image ids with at least two images, without pairwise comparison of
+    all images: identical hashes are grouped first, the others are only compared with the
+    hashes found through the chunk index.
+    """
+    ids_by_hash = {}
+    for image_id, user_id, *chunks in images.filter(dhash_0__isnull=False).values_list(
+            "id", "user_id", *HASH_FIELDS).order_by("id").iterator():
+        ids_by_hash.setdefault((user_id, join_hash(chunks)), []).append(image_id)
+
+    index = [{} for _ in range(HASH_CHUNKS)]
+    for key in ids_by_hash:
+        for chunk_index, chunk in zip(index, split_hash(key[1])):
+            chunk_index.setdefault((key[0], chunk), []).append(key)
+
+    parents = {key: key for key in ids_by_hash}
+
+    def find(key):
+        while parents[key] != key:
+            parents[key] = parents[parents[key]]
+            key = parents[key]
+        return key
+
+    chunk_distance = max_distance // HASH_CHUNKS
+    for key in ids_by_hash:
+        user_id, value = key
+        for chunk_index, chunk in zip(index, split_hash(value)):
+            for variant in get_chunk_variants(chunk, chunk_distance):
+                for other in chunk_index.get((user_id, variant), ()):
+                    if other > key and get_distance(value, other[1]) <= max_distance:
+                        parents[find(other)] = find(key)
+
+    groups = {}
+    for key, image_ids in ids_by_hash.items():
+        groups.setdefault(find(key), []).extend(image_ids)
+    return sorted(sorted(image_ids) for image_ids in groups.values() if len(image_ids) > 1)
+
+
+def backfill_hashes(images, batch_size=BACKFILL_BATCH_SIZE):
+    """Hash the stored files of images without a hash, returns the number hashed."""
+    images = images.filter(dhash_0__isnull=True).order_by("id").iterator(chunk_size=batch_size)
+    count = 0
+    while batch := list(islice(images, batch_size)):
+        pixels = list(image_executor.map(read_pixels_or_none, batch))
+        hashed = [image for image, image_pixels in zip(batch, pixels) if image_pixels]
+        values = get_dhashes([image_pixels for image_pixels in pixels if image_pixels])
+        for image, value in zip(hashed, values):
+            set_image_hash(image, value)
+        UserImage.objects.bulk_update(hashed, HASH_FIELDS)
+        count += len(hashed)
+    return count
+
+
+def read_pixels_or_none(image):
+    try:
+        return read_hash_pixels(image.image)
+    except Exception:
+        logger.warning("Could not hash image %s (%s)", image.id, image.image.name,
+                       exc_info=True)
+        return None
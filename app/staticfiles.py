@@ -0,0 +1,55 @@
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # Optional, Brotli variants are only built when it is installed.
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (".css", ".js", ".svg", ".json", ".txt", ".html", ".map")
+# (Content-Encoding, file suffix, compress) from the most to the least preferred.
+ENCODINGS = [("gzip", ".gz", lambda data: gzip.compress(data, 9, mtime=0))]
+if brotli is not None:
+    ENCODINGS.insert(0, ("br", ".br", lambda data: brotli.compress(data, quality=11)))
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Manifest storage that also writes gzip and Brotli variants of the hashed text files.
+
+    A variant is saved next to the file as name.gz or name.br when it is smaller, see
+    app.media.serve_static_file.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+
+        for name in sorted(set(self.hashed_files.values())):
+            if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+                continue
+            with self.open(name) as file:
+                data = file.read()
+            for _, suffix, compress in ENCODINGS:
+                compressed = compress(data)
+                if len(compressed) >= len(data):
+                    continue
+                if self.exists(name + suffix):
+                    self.delete(name + suffix)
+                self._save(name + suffix, ContentFile(compressed))
+                yield name, name + suffix, True
+
+    def stored_name(self, name):
+        """The hashed name, files missing from the manifest (e.g. before collectstatic ran)
+        keep their name."""
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+    def is_hashed_name(self, name):
+        if not hasattr(self, "_hashed_names"):
+            self._hashed_names = set(self.hashed_files.values())
+        return name in self._hashed_names
@@ -0,0 +1,54 @@
+import hashlib
+import os
+import posixpath
+import re
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+HASHED_NAME_RE = re.compile(r"(^|/)[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}(\.\w+)?$")
+IMMUTABLE_NAME_RE = re.compile(r"(^|/)[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}(_\w+)?(\.\w+)?$")
+
+
+def hash_file(content):
+    digest = hashlib.sha256()
+    for chunk in content.chunks():
+        digest.update(chunk)
+    content.seek(0)
+    return digest.hexdigest()
+
+
+def get_hashed_name(name, digest):
+    """Shard by the first two bytes of the hash: app/images/ab/cd/abcd….jpg."""
+    extension = os.path.splitext(name)[1].lower()
+    return posixpath.join(posixpath.dirname(name), digest[:2], digest[2:4], digest + extension)
+
+
+def is_content_addressed(name):
+    return bool(HASHED_NAME_RE.search(name))
+
+
+def is_immutable_name(name):
+    """Content-addressed files and their derivatives never change under the same name."""
+    return bool(IMMUTABLE_NAME_RE.search(name))
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """File storage that names files after their SHA-256 and stores identical bytes once."""
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        # Uploads streamed in by app.uploads.ImageUploadHandler are hashed already.
+        name = get_hashed_name(name, getattr(content, "sha256", None) or hash_file(content))
+        if self.exists(name):
+            return name
+        return super().save(name, content, max_length)
+
+
+content_addressed_storage = ContentAddressedStorage()
+
+
+def get_image_storage():
+    return content_addressed_storage
@@ -0,0 +1,38 @@
+from app.derivatives import create_image_derivatives
+from app.jobs import enqueue, enqueue_many, job_handler
+from app.models import UserImageMetadata
+from app.utils import get_metadata_fields, save_image_metadata
+
+EXTRACT_METADATA = "extract_metadata"
+CREATE_DERIVATIVES = "create_derivatives"
+
+
+@job_handler(EXTRACT_METADATA)
+def extract_metadata(job):
+    save_image_metadata(job.image)
+
+
+@job_handler(CREATE_DERIVATIVES)
+def create_derivatives(job):
+    create_image_derivatives(job.image)
+
+
+def process_new_image(image, exif_groups=None):
+    """Queue the work on a new image, EXIF read while the upload streamed in is stored
+    right away instead of being extracted from the file again."""
+    if exif_groups is None:
+        enqueue(EXTRACT_METADATA, image)
+    else:
+        save_image_metadata(image, exif_groups)
+    enqueue(CREATE_DERIVATIVES, image)
+
+
+def process_new_images(images, exif_groups=None):
+    """Like process_new_image for many images, with one INSERT per table."""
+    exif_groups = exif_groups or [None] * len(images)
+    UserImageMetadata.objects.bulk_create(
+        UserImageMetadata(image=image, **get_metadata_fields(groups))
+        for image, groups in zip(images, exif_groups) if groups is not None)
+    enqueue_many(EXTRACT_METADATA, [image for image, groups in zip(images, exif_groups)
+                                    if groups is None])
+    enqueue_many(CREATE_DERIVATIVES, images)
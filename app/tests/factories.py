@@ -0,0 +1,31 @@
+from PIL import Image
+from PIL.TiffImagePlugin import IFDRational
+import io
+
+EXIF_IFD = 0x8769
+
+CANON_EXIF = {
+    0x010F: "Canon",
+    0x0110: "Canon EOS 77D",
+    0x0132: "2020:08:12 10:32:48",
+    EXIF_IFD: {
+        0x829A: IFDRational(1, 400),
+        0x829D: IFDRational(35, 10),
+        0x8827: 100,
+        0x9003: "2020:08:12 10:32:48",
+        0xA434: "EF50mm f/1.8 STM",
+    },
+}
+
+
+def make_image_bytes(exif_tags=None, size=(64, 48), image_format="JPEG", color="red"):
+    image = Image.new("RGB", size, color)
+    buffer = io.BytesIO()
+    if exif_tags is None:
+        image.save(buffer, image_format)
+    else:
+        exif = Image.Exif()
+        for tag_id, value in exif_tags.items():
+            exif[tag_id] = value
+        image.save(buffer, image_format, exif=exif.tobytes())
+    return buffer.getvalue()
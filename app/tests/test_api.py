@@ -0,0 +1,110 @@
+from app.models import UserCatalog, UserImage
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+import os
+import tempfile
+
+IMAGE_PATH = os.path.join(os.getcwd(), "app", "tests", "images", "img_without_metadata.png")
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class TestImagesApi(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('user')
+        catalog1 = UserCatalog.objects.create(user=self.user, catalog_name="name1")
+        catalog2 = UserCatalog.objects.create(user=self.user, catalog_name="name2")
+        self.images = [UserImage.objects.create(name=name, user=self.user, catalog=catalog,
+                                                image=IMAGE_PATH, description="")
+                       for name, catalog in [("name11", catalog1), ("name12", catalog1),
+                                             ("name21", catalog2)]]
+        self.client.force_login(self.user)
+
+    def get_list(self, **params):
+        return self.client.get(reverse("api_images"), params)
+
+    def test_list_fields_catalog_and_sort(self):
+        response = self.get_list(fields="name,visible", catalog="name1", sort="-Name")
+
+        self.assertEqual(response.json(), {
+            "images": [{"id": self.images[1].id, "name": "name12", "visible": True},
+                       {"id": self.images[0].id, "name": "name11", "visible": True}],
+            "next_cursor": None,
+        })
+        self.assertEqual(self.get_list(fields="name,secret").status_code, 400)
+        self.assertEqual(self.get_list(sort="secret").status_code, 400)
+        self.assertEqual(self.get_list(cursor="invalid").status_code, 400)
+
+    def test_list_placeholder(self):
+        UserImage.objects.filter(id=self.images[0].id).update(
+            placeholder="data:image/webp;base64,UklGRg==")
+
+        response = self.get_list(fields="placeholder", catalog="name1")
+        self.assertEqual(response.json()["images"], [
+            {"id": self.images[0].id, "placeholder": "data:image/webp;base64,UklGRg=="},
+            {"id": self.images[1].id, "placeholder": ""},
+        ])
+        self.assertIn("placeholder", self.get_list().json()["images"][0])
+
+    def test_list_etag(self):
+        etag = self.get_list(fields="name")["ETag"]
+
+        with self.assertNumQueries(2):  # session and user
+            response = self.client.get(reverse("api_images"), {"fields": "name"},
+                                       headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertNotEqual(self.get_list(fields="visible")["ETag"], etag)
+
+        self.client.patch(reverse("api_image", args=[self.images[0].id]), {"visible": False},
+                          content_type="application/json")
+        response = self.client.get(reverse("api_images"), {"fields": "name"},
+                                   headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_toggle_visibility(self):
+        url = reverse("api_image", args=[self.images[0].id])
+        response = self.client.patch(url, {"visible": False}, content_type="application/json")
+        self.assertEqual(response.json(), {"id": self.images[0].id, "visible": False})
+        self.assertEqual(self.client.patch(url, {"visible": "no"},
+                                           content_type="application/json").status_code, 400)
+
+        response = self.client.patch(reverse("api_images"),
+                                     {"ids": [self.images[1].id, self.images[2].id],
+                                      "visible": False}, content_type="application/json")
+        self.assertEqual(response.json(), {"updated": 2})
+        self.assertEqual([image["visible"] for image in self.get_list().json()["images"]],
+                         [False, False, False])
+
+    def test_delete(self):
+        response = self.client.delete(reverse("api_image", args=[self.images[0].id]))
+        self.assertEqual(response.json(), {"deleted": 1})
+
+        response = self.client.delete(reverse("api_images"),
+                                      {"ids": [self.images[1].id, self.images[2].id]},
+                                      content_type="application/json")
+        self.assertEqual(response.json(), {"deleted": 2})
+        self.assertFalse(UserImage.objects.exists())
+
+    def test_other_users_images(self):
+        self.client.force_login(User.objects.create_user('user2'))
+        url = reverse("api_image", args=[self.images[0].id])
+
+        self.assertEqual(self.get_list().json()["images"], [])
+        self.assertEqual(self.client.patch(url, {"visible": False},
+                                           content_type="application/json").status_code, 404)
+        self.assertEqual(self.client.delete(url).status_code, 404)
+        self.assertEqual(UserImage.objects.filter(visible=True).count(), 3)
+
+        self.client.logout()
+        self.assertEqual(self.get_list().status_code, 401)
+
+    def test_show_form_saves_visibility(self):
+        self.client.post(reverse("logged_in"), {
+            "Catalogs": "name1", "show": "Show",
+            "listed": [self.images[0].id, self.images[1].id],
+            "show_checkbox": [self.images[1].id],
+        })
+        self.assertEqual(list(UserImage.objects.filter(visible=True)),
+                         [self.images[1], self.images[2]])
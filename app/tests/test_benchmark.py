@@ -0,0 +1,54 @@
+from app.benchmark import get_percentiles, run_benchmark, seed_gallery
+from app.models import UserImage, UserImageMetadata
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from io import StringIO
+import json
+import os
+import tempfile
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class TestBenchmark(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_seed_gallery(self):
+        users = seed_gallery(users=2, catalogs=2, images_per_catalog=3, size=(32, 24))
+
+        self.assertEqual([user.username for user in users], ["seed-0", "seed-1"])
+        self.assertEqual(UserImage.objects.filter(user=users[0]).count(), 6)
+        self.assertEqual(UserImageMetadata.objects.filter(model__isnull=False,
+                                                          lens_model__isnull=False,
+                                                          f_number__isnull=False).count(), 12)
+        image = UserImage.objects.first()
+        self.assertTrue(os.path.exists(image.image.path))
+        self.assertEqual((image.width, image.height), (32, 24))
+
+    def test_get_percentiles(self):
+        self.assertEqual(get_percentiles(range(100, 0, -1)),
+                         {"p50": 50, "p95": 95, "p99": 99, "max": 100})
+        self.assertEqual(get_percentiles([7]), {"p50": 7, "p95": 7, "p99": 7, "max": 7})
+
+    def test_run_benchmark(self):
+        report = run_benchmark(sizes=[4], requests=2)
+
+        self.assertEqual(report["runs"][0]["images"], 4)
+        views = report["runs"][0]["views"]
+        self.assertIn("upload_img", views)
+        for result in views.values():
+            self.assertEqual(result["errors"], 0)
+            self.assertGreater(result["queries"]["p50"], 0)
+            self.assertGreater(result["bytes"]["p50"], 0)
+        # Uploads made by the benchmark are removed again.
+        self.assertEqual(UserImage.objects.filter(catalog__pending_delete=False).count(), 4)
+
+    def test_benchmark_command_saves_report(self):
+        output = os.path.join(tempfile.mkdtemp(), "report.json")
+        call_command("benchmark_views", sizes=[2], requests=1, views=["gallery"],
+                     output=output, stdout=StringIO())
+
+        with open(output) as report_file:
+            report = json.load(report_file)
+        self.assertEqual(list(report["runs"][0]["views"]), ["gallery"])
@@ -0,0 +1,98 @@
+from app.bulk_upload import bulk_upload
+from app.exif import read_exif_groups
+from app.models import ImageJob, UserCatalog, UserImage
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from factories import CANON_EXIF, make_image_bytes
+from unittest import mock
+import io
+import tempfile
+import zipfile
+
+
+def make_zip(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), BULK_UPLOAD_BATCH_SIZE=2)
+class TestBulkUpload(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('user')
+        self.catalog = UserCatalog.objects.create(user=self.user, catalog_name="name1")
+
+    def test_bulk_upload_files_and_zip(self):
+        archive = make_zip({
+            "shoot/beach.jpg": make_image_bytes(color="blue"),
+            "shoot/titled.jpg": make_image_bytes({0x010E: "Sunset"}, color="green"),
+            "shoot/notes.txt": b"not an image",
+            "__MACOSX/shoot/._beach.jpg": b"",
+        })
+        uploads = [SimpleUploadedFile("photo.jpg", make_image_bytes()),
+                   SimpleUploadedFile("shoot.zip", archive)]
+
+        results = bulk_upload(self.user, self.catalog, uploads)
+
+        self.assertEqual(results, [
+            {"file": "photo.jpg", "name": "photo", "error": None},
+            {"file": "shoot/beach.jpg", "name": "beach", "error": None},
+            {"file": "shoot/titled.jpg", "name": "Sunset", "error": None},
+            {"file": "shoot/notes.txt", "name": None, "error": "Not a valid image."},
+        ])
+        images = UserImage.objects.filter(catalog=self.catalog).order_by("id")
+        self.assertEqual([image.name for image in images], ["photo", "beach", "Sunset"])
+        self.assertEqual(ImageJob.objects.filter(image__in=images).count(), 6)
+        with images[0].image.open("rb") as stored:
+            self.assertEqual(stored.read(), make_image_bytes())
+
+    def test_bulk_upload_inserts_in_batches(self):
+        uploads = [SimpleUploadedFile(f"photo{number}.jpg", make_image_bytes(color=color))
+                   for number, color in enumerate(["red", "green", "blue", "white"])]
+
+        # Per batch of two: savepoint, images INSERT, two job INSERTs, release.
+        with self.assertNumQueries(10):
+            bulk_upload(self.user, self.catalog, uploads)
+        self.assertEqual(UserImage.objects.count(), 4)
+
+    def test_bulk_upload_without_ids_from_bulk_insert(self):
+        canon = make_image_bytes(CANON_EXIF, color="green")
+        uploads = [SimpleUploadedFile("one.jpg", make_image_bytes()),
+                   SimpleUploadedFile("two.jpg", canon),
+                   SimpleUploadedFile("three.jpg", make_image_bytes(color="blue"))]
+        # As read by the upload handler while streaming, the metadata row is inserted as well.
+        uploads[1].exif_groups = read_exif_groups(io.BytesIO(canon))
+
+        # SQLite before 3.35, where can_return_rows_from_bulk_insert follows this flag.
+        with mock.patch.object(connection.features, "can_return_columns_from_insert", False):
+            bulk_upload(self.user, self.catalog, uploads)
+
+        images = UserImage.objects.order_by("id")
+        self.assertEqual([image.name for image in images], ["one", "two", "three"])
+        self.assertEqual([image.jobs.count() for image in images], [2, 1, 2])
+        self.assertEqual(images[1].metadata.model, "Canon EOS 77D")
+
+    @override_settings(BULK_UPLOAD_MAX_FILE_SIZE=10)
+    def test_bulk_upload_skips_large_zip_entries(self):
+        archive = make_zip({"large.jpg": make_image_bytes()})
+        results = bulk_upload(self.user, self.catalog, [SimpleUploadedFile("a.zip", archive)])
+        self.assertEqual(results, [{"file": "large.jpg", "name": None,
+                                    "error": "The file is too large."}])
+        self.assertFalse(UserImage.objects.exists())
+
+    def test_bulk_upload_view(self):
+        self.client.force_login(self.user)
+        response = self.client.post(reverse("upload_img"), {
+            "BulkUpload": "Upload all", "catalog": "name1",
+            "image": [SimpleUploadedFile("one.jpg", make_image_bytes()),
+                      SimpleUploadedFile("two.jpg", b"broken")],
+        })
+
+        self.assertContains(response, "1 of 2 pictures have been uploaded.")
+        self.assertContains(response, "Not a valid image.")
+        self.assertEqual(list(UserImage.objects.values_list("name", flat=True)), ["one"])
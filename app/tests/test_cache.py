@@ -0,0 +1,118 @@
+from app.cache import get_cache_stats, get_or_compute, invalidate_user, reset_cache_stats
+from app.models import UserCatalog, UserImage, UserImageMetadata
+from app.utils import get_catalog_names, get_images_page, set_images_visibility
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from unittest import mock
+import os
+
+IMAGE_PATH = os.path.join(os.getcwd(), "app", "tests", "images", "img_without_metadata.png")
+
+
+class TestGalleryCache(TestCase):
+    def setUp(self):
+        cache.clear()
+        reset_cache_stats()
+        self.user = User.objects.create_user('user', is_staff=True)
+        self.catalog = UserCatalog.objects.create(user=self.user, catalog_name="name1")
+        self.image = UserImage.objects.create(name="name11",
+                                              user=self.user,
+                                              catalog=self.catalog,
+                                              image=IMAGE_PATH,
+                                              description="")
+
+    def test_hits_and_misses(self):
+        self.assertEqual(get_or_compute("test", self.user.id, (1,), lambda: "value"), "value")
+        self.assertEqual(get_or_compute("test", self.user.id, (1,), lambda: "other"), "value")
+        self.assertEqual(get_or_compute("test", self.user.id, (2,), lambda: "other"), "other")
+        self.assertEqual(get_cache_stats(), {"test": {"hits": 1, "misses": 2}})
+
+        invalidate_user(self.user.id)
+        self.assertEqual(get_or_compute("test", self.user.id, (1,), lambda: "new"), "new")
+
+    def test_invalidation_reaches_other_processes(self):
+        get_or_compute("test", self.user.id, (1,), lambda: "value")
+
+        # A job worker or another web process has its own connection to the cache.
+        with mock.patch("app.cache.cache", caches.create_connection("default")):
+            invalidate_user(self.user.id)
+        self.assertEqual(get_or_compute("test", self.user.id, (1,), lambda: "new"), "new")
+
+    def test_catalog_names_invalidated_on_change(self):
+        self.assertEqual(get_catalog_names(self.user), ["name1"])
+        with self.assertNumQueries(0):
+            self.assertEqual(get_catalog_names(self.user), ["name1"])
+
+        UserCatalog.objects.create(user=self.user, catalog_name="name2")
+        self.assertEqual(get_catalog_names(self.user), ["name1", "name2"])
+
+        UserCatalog.delete_catalog(self.user, "name2")
+        self.assertEqual(get_catalog_names(self.user), ["name1"])
+
+    def test_images_invalidated_on_change(self):
+        self.assertEqual([image.name for image in get_images_page(self.user)], ["name11"])
+        with self.assertNumQueries(0):
+            get_images_page(self.user)
+
+        UserImageMetadata.objects.create(image=self.image, model="Canon EOS 77D")
+        self.assertEqual(get_images_page(self.user)[0].metadata.model, "Canon EOS 77D")
+
+        self.image.delete()
+        self.assertEqual(list(get_images_page(self.user)), [])
+
+    def test_other_users_are_not_invalidated(self):
+        other = User.objects.create_user('other')
+        get_catalog_names(self.user)
+        UserCatalog.objects.create(user=other, catalog_name="name2")
+        with self.assertNumQueries(0):
+            get_catalog_names(self.user)
+
+    def test_cache_stats_view(self):
+        self.client.force_login(self.user)
+        self.client.get(reverse("logged_in"))
+        self.client.get(reverse("logged_in"))
+
+        stats = self.client.get(reverse("cache_stats")).json()
+        self.assertEqual(stats["catalogs"], {"hits": 1, "misses": 1})
+        self.assertEqual(stats["images"], {"hits": 1, "misses": 1})
+
+        self.client.force_login(User.objects.create_user('other'))
+        self.assertEqual(self.client.get(reverse("cache_stats")).status_code, 302)
+
+    @override_settings(GALLERY_FRAGMENT_TIMEOUT=123)
+    def test_gallery_fragments_expire(self):
+        self.client.force_login(self.user)
+        with mock.patch.object(caches["default"], "set", wraps=caches["default"].set) as set_:
+            self.client.get(reverse("logged_in"))
+
+        timeouts = {call.args[0].split(".")[2]: call.args[2] for call in set_.call_args_list
+                    if call.args[0].startswith("template.cache.")}
+        self.assertEqual(timeouts, {"gallery_tile": 123, "gallery_row": 123})
+
+    def test_gallery_fragments_rerendered_only_when_image_changes(self):
+        other = UserImage.objects.create(name="name12", user=self.user, catalog=self.catalog,
+                                         image=IMAGE_PATH, description="")
+        self.client.force_login(self.user)
+        self.client.get(reverse("logged_in"))
+
+        # Renamed without touching updated_at, the cached tiles and rows are reused.
+        UserImage.objects.filter(id=self.image.id).update(name="renamed11")
+        UserImage.objects.filter(id=other.id).update(name="renamed12")
+        invalidate_user(self.user.id)
+        response = self.client.get(reverse("logged_in"))
+        self.assertContains(response, 'alt="name11"')
+        self.assertContains(response, 'alt="name12"')
+
+        updated_at = UserImage.objects.get(id=self.image.id).updated_at
+        set_images_visibility(self.user, [self.image.id], False)
+        self.assertGreater(UserImage.objects.get(id=self.image.id).updated_at, updated_at)
+        response = self.client.get(reverse("logged_in"))
+        self.assertContains(response, 'alt="renamed11"')
+        self.assertContains(response, 'alt="name12"')
+
+        UserImageMetadata.objects.create(image=other, model="Canon EOS 77D")
+        response = self.client.get(reverse("logged_in"))
+        self.assertContains(response, 'alt="renamed12"')
+        self.assertContains(response, "Canon EOS 77D")
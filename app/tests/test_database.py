@@ -0,0 +1,63 @@
+from app.backends.sqlite3.base import DatabaseWrapper
+from app.benchmark import write_images
+from app.models import ImageJob, UserCatalog, UserImage
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, IntegrityError, transaction
+from django.test import TestCase
+import copy
+
+
+class TestLookupConstraints(TestCase):
+    def setUp(self):
+        self.user1 = User.objects.create_user("user1")
+        self.user2 = User.objects.create_user("user2")
+        UserCatalog.objects.create(user=self.user1, catalog_name="holidays")
+
+    def test_catalog_names_are_unique_per_user(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            UserCatalog.objects.create(user=self.user1, catalog_name="holidays")
+
+        UserCatalog.objects.create(user=self.user2, catalog_name="holidays")
+
+    def test_catalog_pending_delete_may_share_name(self):
+        UserCatalog.objects.filter(user=self.user1).update(pending_delete=True)
+        UserCatalog.objects.create(user=self.user1, catalog_name="holidays")
+
+        self.assertEqual(UserCatalog.objects.filter(user=self.user1,
+                                                    catalog_name="holidays").count(), 2)
+
+    def test_lookups_use_composite_indexes(self):
+        catalog_plan = UserCatalog.objects.filter(
+            user=self.user1, catalog_name="holidays", pending_delete=False).explain()
+        image_plan = UserImage.objects.filter(user=self.user1, name="beach").explain()
+
+        self.assertIn("app_usercatalog_user_name_uniq", catalog_plan)
+        self.assertIn("app_userimage_user_name_idx", image_plan)
+
+
+class TestSQLiteBackend(TestCase):
+    def test_connection_profile(self):
+        self.assertEqual(connection.transaction_mode, "IMMEDIATE")
+        with connection.cursor() as cursor:
+            # 2 is MEMORY, journal_mode stays "memory" for the in-memory test database.
+            self.assertEqual(cursor.execute("PRAGMA temp_store").fetchone()[0], 2)
+
+    def test_invalid_transaction_mode(self):
+        settings_dict = copy.deepcopy(connection.settings_dict)
+        settings_dict["OPTIONS"]["transaction_mode"] = "LAZY"
+
+        with self.assertRaises(ImproperlyConfigured):
+            DatabaseWrapper(settings_dict).get_connection_params()
+
+    def test_write_images(self):
+        user = User.objects.create_user("writer")
+        catalog = UserCatalog.objects.create(user=user, catalog_name="writes")
+
+        latencies, errors = write_images(user, catalog, worker=2, writes=3)
+
+        self.assertEqual(len(latencies), 3)
+        self.assertFalse(errors)
+        names = UserImage.objects.filter(user=user).order_by("name").values_list("name", flat=True)
+        self.assertEqual(list(names), ["write-2-0", "write-2-1", "write-2-2"])
+        self.assertEqual(ImageJob.objects.filter(image__user=user).count(), 3)
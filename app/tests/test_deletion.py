@@ -0,0 +1,122 @@
+from app.deletion import delete_catalog, delete_images
+from app.derivatives import create_image_derivatives
+from app.jobs import claim_next_job, run_job, run_pending_jobs
+from app.models import ImageJob, UserCatalog, UserImage, UserImageDerivative
+from app.utils import get_catalog_names
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from factories import make_image_bytes
+from datetime import timedelta
+from unittest.mock import patch
+import os
+import tempfile
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class TestDeletion(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('user')
+        self.catalog = UserCatalog.objects.create(user=self.user, catalog_name="name1")
+        self.images = [self.create_image(f"name{number}", color)
+                       for number, color in enumerate(["red", "green", "blue"])]
+
+    def create_image(self, name, color, user=None, catalog=None):
+        image = UserImage(name=name, user=user or self.user, catalog=catalog or self.catalog)
+        image.image.save(f"{name}.jpg", ContentFile(make_image_bytes(color=color)))
+        create_image_derivatives(image)
+        return image
+
+    def get_paths(self, image):
+        return [image.image.path] + [derivative.file.path
+                                     for derivative in image.derivatives.all()]
+
+    def test_delete_images_releases_files_after_commit(self):
+        paths = self.get_paths(self.images[0]) + self.get_paths(self.images[1])
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            count = delete_images(UserImage.objects.filter(id__in=[self.images[0].id,
+                                                                   self.images[1].id]))
+            self.assertTrue(all(os.path.exists(path) for path in paths))
+
+        self.assertEqual(count, 2)
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        run_pending_jobs()
+        self.assertFalse(any(os.path.exists(path) for path in paths))
+        self.assertTrue(all(os.path.exists(path) for path in self.get_paths(self.images[2])))
+        self.assertEqual(list(UserImage.objects.all()), [self.images[2]])
+        self.assertEqual(set(UserImageDerivative.objects.values_list("image", flat=True)),
+                         {self.images[2].id})
+
+    def test_delete_catalog_in_background(self):
+        paths = [path for image in self.images for path in self.get_paths(image)]
+
+        delete_catalog(self.user, "name1")
+
+        self.assertEqual(get_catalog_names(self.user), [])
+        self.assertFalse(UserImage.get_images(self.user).exists())
+        self.assertEqual(UserImage.objects.count(), 3)
+
+        with patch("app.deletion.DELETE_BATCH_SIZE", 2), \
+                self.captureOnCommitCallbacks(execute=True):
+            run_pending_jobs()
+        run_pending_jobs()
+
+        self.assertFalse(UserCatalog.objects.exists())
+        self.assertFalse(UserImage.objects.exists())
+        self.assertFalse(ImageJob.objects.exclude(state=ImageJob.DONE).exists())
+        self.assertFalse(any(os.path.exists(path) for path in paths))
+
+    @override_settings(JOBS_RUNNING_TIMEOUT=600)
+    def test_catalog_deletion_is_not_taken_over_while_alive(self):
+        delete_catalog(self.user, "name1")
+        job = claim_next_job()
+        takeovers = []
+
+        def delete_slowly(images):
+            takeovers.append(claim_next_job())
+            count = delete_images(images)
+            # The batch took longer than JOBS_RUNNING_TIMEOUT.
+            ImageJob.objects.filter(id=job.id).update(
+                updated_at=timezone.now() - timedelta(seconds=601))
+            return count
+
+        with patch("app.deletion.DELETE_BATCH_SIZE", 1), \
+                patch("app.deletion.delete_images", delete_slowly):
+            run_job(job)
+
+        self.assertEqual(takeovers, [None, None, None])
+        job.refresh_from_db()
+        self.assertEqual((job.state, job.attempts), (ImageJob.DONE, 1))
+        self.assertFalse(UserCatalog.objects.exists())
+
+    def test_delete_selected_view(self):
+        other_user = User.objects.create_user('user2')
+        other_catalog = UserCatalog.objects.create(user=other_user, catalog_name="name1")
+        other_image = self.create_image("other", "white", other_user, other_catalog)
+        self.client.force_login(self.user)
+
+        response = self.client.post(reverse("logged_in"), {
+            "Catalogs": "All", "DeleteSelected": "Delete selected",
+            "selected": [self.images[0].id, self.images[1].id, other_image.id],
+        })
+
+        self.assertEqual([image.name for image, _ in response.context["images"]], ["name2"])
+        self.assertEqual(set(UserImage.objects.all()), {self.images[2], other_image})
+
+    def test_delete_selected_keeps_visible_images(self):
+        self.client.force_login(self.user)
+        response = self.client.post(reverse("logged_in"), {
+            "Catalogs": "All", "DeleteSelected": "Delete selected",
+            "show_checkbox": [image.id for image in self.images],
+            "selected": [self.images[1].id],
+        })
+
+        self.assertEqual([image.name for image, _ in response.context["images"]],
+                         ["name0", "name2"])
+        self.assertTrue(all(image.visible for image in UserImage.objects.all()))
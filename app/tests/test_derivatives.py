@@ -0,0 +1,79 @@
+from app.derivatives import create_image_derivatives, get_derivative_widths
+from app.models import UserCatalog, UserImage
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from factories import make_image_bytes
+from PIL import Image
+import base64
+import io
+import tempfile
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class TestCreateImageDerivatives(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('user')
+        self.catalog = UserCatalog.objects.create(user=self.user, catalog_name="name1")
+
+    def create_image(self, size):
+        image = UserImage(name="name11", user=self.user, catalog=self.catalog)
+        image.image.save("photo.jpg", ContentFile(make_image_bytes(size=size)))
+        return image
+
+    def test_get_derivative_widths(self):
+        self.assertEqual(get_derivative_widths(4000), [1600, 800, 200])
+        self.assertEqual(get_derivative_widths(1000), [800, 200])
+        self.assertEqual(get_derivative_widths(150), [150])
+
+    def test_create_image_derivatives(self):
+        image = self.create_image((2000, 1000))
+
+        create_image_derivatives(image)
+
+        image.refresh_from_db()
+        self.assertEqual((image.width, image.height), (2000, 1000))
+        self.assertEqual(image.tile_width, 400)
+        derivatives = list(image.derivatives.all())
+        self.assertEqual(sorted((d.width, d.height, d.format) for d in derivatives), [
+            (200, 100, "jpeg"), (200, 100, "webp"),
+            (800, 400, "jpeg"), (800, 400, "webp"),
+            (1600, 800, "jpeg"), (1600, 800, "webp"),
+        ])
+        for derivative in derivatives:
+            with Image.open(derivative.file) as stored:
+                self.assertEqual(stored.size, (derivative.width, derivative.height))
+                self.assertEqual(stored.format, derivative.format.upper())
+        self.assertEqual(image.thumbnail_url,
+                         image.image.url.replace(".jpg", "_200w.jpeg"))
+        self.assertIn("_800w.webp 800w", image.webp_srcset)
+
+    def test_thumbnail_url_without_derivatives(self):
+        image = self.create_image((100, 50))
+        self.assertEqual(image.thumbnail_url, image.image.url)
+        self.assertEqual(image.jpeg_srcset, "")
+
+    def test_placeholder(self):
+        image = self.create_image((2000, 1000))
+
+        create_image_derivatives(image)
+
+        image.refresh_from_db()
+        prefix = "data:image/webp;base64,"
+        self.assertTrue(image.placeholder.startswith(prefix))
+        self.assertLess(len(image.placeholder), 300)
+        data = base64.b64decode(image.placeholder[len(prefix):])
+        with Image.open(io.BytesIO(data)) as placeholder:
+            self.assertEqual(placeholder.size, (16, 8))
+
+    def test_gallery_tiles_load_lazily_over_placeholder(self):
+        image = self.create_image((2000, 1000))
+        create_image_derivatives(image)
+        image.refresh_from_db()
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse("logged_in"))
+
+        self.assertContains(response, 'loading="lazy" decoding="async" width="400" height="200"')
+        self.assertContains(response, f"url({image.placeholder})")
@@ -0,0 +1,112 @@
+from app.exif import read_exif, read_exif_groups
+from app.management.commands.benchmark_exif import pillow_read_exif
+from app.utils import METADATA_TAGS
+from django.test import TestCase
+from factories import CANON_EXIF, make_image_bytes
+from PIL import Image
+from PIL.TiffImagePlugin import IFDRational
+import io
+import os
+import struct
+import tempfile
+import tracemalloc
+
+IMAGE_WITHOUT_METADATA_PATH = os.path.join(os.getcwd(), "app",
+                                           "tests", "images", "img_without_metadata.png")
+
+GPS_EXIF = {
+    **CANON_EXIF,
+    0x0128: 2,
+    0x011A: IFDRational(72, 1),
+    0x011B: IFDRational(72, 1),
+    0x8825: {1: "N", 2: (IFDRational(52, 1), IFDRational(13, 1), IFDRational(30, 1))},
+}
+
+
+class TestReadExif(TestCase):
+    def assertSameAsPillow(self, content):
+        expected = pillow_read_exif(io.BytesIO(content))
+        actual = read_exif(io.BytesIO(content))
+        self.assertEqual({tag: repr(value) for tag, value in actual.items()},
+                         {tag: repr(value) for tag, value in expected.items()})
+        return actual
+
+    def test_same_as_pillow(self):
+        for image_format in ["JPEG", "PNG", "WEBP"]:
+            with self.subTest(image_format=image_format):
+                exif = self.assertSameAsPillow(make_image_bytes(GPS_EXIF,
+                                                                image_format=image_format))
+                self.assertEqual(exif["Model"], "Canon EOS 77D")
+                self.assertEqual(exif["ExposureTime"], 0.0025)
+                self.assertEqual(exif["GPSInfo"][1], "N")
+
+    def test_same_as_pillow_with_jfif_dpi(self):
+        image = Image.new("RGB", (8, 8))
+        for dpi in [(0, 0), (72, 72)]:
+            buffer = io.BytesIO()
+            exif = Image.Exif()
+            for tag_id, value in GPS_EXIF.items():
+                exif[tag_id] = value
+            image.save(buffer, "JPEG", exif=exif.tobytes(), dpi=dpi)
+            self.assertSameAsPillow(buffer.getvalue())
+
+    def test_tiff(self):
+        exif = read_exif(io.BytesIO(make_image_bytes(CANON_EXIF, image_format="TIFF")))
+        self.assertEqual(exif["Make"], "Canon")
+        self.assertEqual(exif["LensModel"], "EF50mm f/1.8 STM")
+
+    def test_metadata_tags_only(self):
+        exif = read_exif(io.BytesIO(make_image_bytes(GPS_EXIF)), METADATA_TAGS)
+        self.assertEqual(exif, {"DateTimeOriginal": "2020:08:12 10:32:48",
+                                "Model": "Canon EOS 77D",
+                                "ExposureTime": 0.0025, "FNumber": 3.5,
+                                "ISOSpeedRatings": 100, "LensModel": "EF50mm f/1.8 STM"})
+
+    def test_without_exif(self):
+        self.assertEqual(read_exif(IMAGE_WITHOUT_METADATA_PATH), {})
+        self.assertEqual(read_exif(io.BytesIO(make_image_bytes())), {})
+        self.assertEqual(read_exif(io.BytesIO(b"not an image")), {})
+
+    def test_sizes_beyond_the_file_are_skipped(self):
+        entries = [
+            (0x010F, 2, 0xFFFFFFF0, 38),  # Make, ASCII
+            (0x829A, 5, 0xFFFFFFFF, 38),  # ExposureTime, RATIONAL
+            (0x0110, 2, 2, int.from_bytes(b"X\x00\x00\x00", "little")),  # Model
+        ]
+        content = b"II*\x00" + struct.pack("<LH", 8, len(entries))
+        content += b"".join(struct.pack("<HHLL", *entry) for entry in entries)
+        content += struct.pack("<L", 0)
+        with tempfile.NamedTemporaryFile(suffix=".tif") as file:
+            file.write(content)
+            file.flush()
+            tracemalloc.start()
+            try:
+                exif = read_exif(file.name)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        self.assertEqual(exif, {"Model": "X"})
+        self.assertLess(peak, 1024 * 1024)
+
+    def test_truncated_exif(self):
+        content = make_image_bytes(CANON_EXIF)
+        start = content.index(b"Exif\x00\x00")
+        self.assertEqual(read_exif(io.BytesIO(content[:start + 40])), {})
+
+
+class TestReadExifGroups(TestCase):
+    def test_groups(self):
+        exif = {**GPS_EXIF, 0x8769: {**GPS_EXIF[0x8769], 0x9000: b"0231", 0xA005: {1: "R98"}}}
+        groups = read_exif_groups(io.BytesIO(make_image_bytes(exif)))
+
+        self.assertEqual(list(groups), ["Image", "Exif", "GPS", "Interop"])
+        self.assertEqual(groups["Image"]["Model"], "Canon EOS 77D")
+        self.assertNotIn("ExifOffset", groups["Image"])
+        self.assertEqual(groups["Exif"]["ExifVersion"], b"0231")
+        self.assertEqual(groups["GPS"], {"GPSLatitudeRef": "N", "GPSLatitude": (52, 13, 30)})
+        self.assertEqual(groups["Interop"], {"InteropIndex": "R98"})
+
+    def test_without_exif(self):
+        self.assertEqual(read_exif_groups(io.BytesIO(make_image_bytes())), {})
+        self.assertEqual(read_exif_groups(IMAGE_WITHOUT_METADATA_PATH), {})
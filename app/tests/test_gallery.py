@@ -0,0 +1,82 @@
+from app.gallery import GalleryPipeline
+from app.models import UserCatalog, UserImage
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import Image
+from unittest.mock import MagicMock, patch
+import os
+import tempfile
+
+IMAGE_PATH = os.path.join(os.getcwd(), "app", "tests", "images", "img_without_metadata.png")
+# (Pillow opens, SQL queries): session and user, catalog names, the image page and its
+# derivatives, plus the writes of the action itself.
+POST_ACTION_COUNTS = {
+    "select": (0, 5),
+    "show": (0, 6),
+    "sort": (0, 5),
+    "delete": (0, 12),
+    "delete_catalog": (0, 8),
+}
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class TestGalleryPipeline(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('user')
+        catalog1 = UserCatalog.objects.create(user=self.user, catalog_name="name1")
+        catalog2 = UserCatalog.objects.create(user=self.user, catalog_name="name2")
+        self.images = [UserImage.objects.create(name=name, user=self.user, catalog=catalog,
+                                                image=IMAGE_PATH, description="")
+                       for name, catalog in [("name11", catalog1), ("name12", catalog1),
+                                             ("name21", catalog2)]]
+        self.client.force_login(self.user)
+
+    def measure_post_actions(self):
+        """Pillow opens and SQL queries of each POST action, with an empty cache."""
+        actions = {
+            "select": {"Catalogs": "name1", "Select": "Select"},
+            "show": {"Catalogs": "All", "show": "Show", "listed": [self.images[0].id],
+                     "show_checkbox": []},
+            "sort": {"Catalogs": "All", "Metadata-sort": "-Name"},
+            "delete": {"Catalogs": "All", str(self.images[0].id): "Delete"},
+            "delete_catalog": {"Catalogs": "name2", "DeleteCatalog": "Delete"},
+        }
+        counts = {}
+        for action, data in actions.items():
+            cache.clear()
+            with patch("PIL.Image.open", wraps=Image.open) as image_open, \
+                    CaptureQueriesContext(connection) as queries:
+                response = self.client.post(reverse("logged_in"), data)
+            self.assertEqual(response.status_code, 200)
+            counts[action] = image_open.call_count, len(queries)
+        return counts
+
+    def test_post_actions(self):
+        self.assertEqual(self.measure_post_actions(), POST_ACTION_COUNTS)
+
+    def test_post_actions_do_not_grow_with_gallery(self):
+        UserImage.objects.bulk_create(
+            UserImage(name=f"extra{number}", user=self.user, catalog=self.images[0].catalog,
+                      image=IMAGE_PATH, description="") for number in range(30))
+        self.assertEqual(self.measure_post_actions(), POST_ACTION_COUNTS)
+
+    def test_pipeline_is_evaluated_once(self):
+        request = MagicMock(user=self.user, method="GET")
+        gallery = GalleryPipeline(request, "name1", "-Name")
+
+        with self.assertNumQueries(2):
+            images = gallery.get_images()
+        with self.assertNumQueries(0):
+            self.assertIs(gallery.get_images(), images)
+            gallery.filter_catalog("name1").search("")
+            self.assertIs(gallery.get_images(), images)
+        self.assertEqual([image.name for image, _ in images], ["name12", "name11"])
+
+        gallery.search("name11")
+        self.assertEqual([image.name for image, _ in gallery.get_images()], ["name11"])
+        self.assertIsNone(GalleryPipeline(request, "name1", "invalid").sort_parameter_tag)
@@ -0,0 +1,117 @@
+from app.jobs import claim_next_job, enqueue, get_retry_delay, job_handler, run_pending_jobs
+from app.models import ImageJob, UserCatalog, UserImage
+from app.tasks import CREATE_DERIVATIVES
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from factories import CANON_EXIF, make_image_bytes
+from datetime import timedelta
+from io import StringIO
+import tempfile
+
+CALLS = []
+
+
+@job_handler("test_job")
+def record_call(job):
+    CALLS.append(job.payload)
+    if job.payload.get("fail"):
+        raise ValueError("Failed on purpose")
+
+
+@override_settings(JOBS_RETRY_BASE_DELAY=5, JOBS_RETRY_MAX_DELAY=60, JOBS_RUNNING_TIMEOUT=600)
+class TestJobs(TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def test_enqueue_and_run(self):
+        job = enqueue("test_job", payload={"number": 1})
+        self.assertEqual(job.state, ImageJob.QUEUED)
+
+        self.assertEqual(run_pending_jobs(), 1)
+
+        job.refresh_from_db()
+        self.assertEqual(job.state, ImageJob.DONE)
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(CALLS, [{"number": 1}])
+
+    @override_settings(JOBS_EAGER=True)
+    def test_eager_mode(self):
+        job = enqueue("test_job", payload={"number": 2})
+        self.assertEqual(job.state, ImageJob.DONE)
+        self.assertEqual(CALLS, [{"number": 2}])
+
+    def test_retry_with_backoff(self):
+        job = enqueue("test_job", payload={"fail": True})
+        job.max_attempts = 2
+        job.save()
+
+        run_pending_jobs()
+        job.refresh_from_db()
+        self.assertEqual(job.state, ImageJob.QUEUED)
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertIn("Failed on purpose", job.last_error)
+        self.assertIsNone(claim_next_job())
+
+        ImageJob.objects.filter(id=job.id).update(run_after=timezone.now())
+        run_pending_jobs()
+        job.refresh_from_db()
+        self.assertEqual(job.state, ImageJob.FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    def test_run_workers_burst(self):
+        enqueue("test_job", payload={"number": 3})
+        call_command("run_workers", "--burst", stdout=StringIO())
+        self.assertEqual(CALLS, [{"number": 3}])
+
+    def test_get_retry_delay(self):
+        self.assertEqual(get_retry_delay(1), timedelta(seconds=5))
+        self.assertEqual(get_retry_delay(3), timedelta(seconds=20))
+        self.assertEqual(get_retry_delay(10), timedelta(seconds=60))
+
+    def test_claim_stale_running_job(self):
+        job = enqueue("test_job")
+        stale = timezone.now() - timedelta(seconds=601)
+        ImageJob.objects.filter(id=job.id).update(state=ImageJob.RUNNING, updated_at=stale)
+
+        self.assertEqual(claim_next_job().id, job.id)
+        self.assertIsNone(claim_next_job())
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class TestUploadJobs(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('user')
+        UserCatalog.objects.create(user=self.user, catalog_name="name1")
+        self.client.force_login(self.user)
+
+    def upload(self):
+        image = SimpleUploadedFile("photo.jpg", make_image_bytes(CANON_EXIF, size=(900, 600)))
+        return self.client.post(reverse("upload_img"), {"Upload": "Upload", "catalog": "name1",
+                                                        "name": "name11", "image": image})
+
+    def test_upload_queues_processing(self):
+        self.upload()
+
+        image = UserImage.objects.get()
+        self.assertEqual(list(image.jobs.filter(state=ImageJob.QUEUED).values_list(
+            "kind", flat=True)), [CREATE_DERIVATIVES])
+        self.assertEqual(image.metadata.model, "Canon EOS 77D")
+        self.assertTrue(UserImage.get_images(self.user).get().processing)
+
+        run_pending_jobs()
+        image = UserImage.get_images(self.user).get()
+        self.assertFalse(image.processing)
+        self.assertEqual(image.metadata.model, "Canon EOS 77D")
+        self.assertEqual(image.derivatives.count(), 4)
+
+    @override_settings(JOBS_EAGER=True)
+    def test_upload_eager(self):
+        self.upload()
+
+        image = UserImage.get_images(self.user).get()
+        self.assertEqual(image.metadata.model, "Canon EOS 77D")
+        self.assertFalse(image.processing_failed)
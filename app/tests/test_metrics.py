@@ -0,0 +1,78 @@
+from asgiref.sync import sync_to_async
+from app.metrics import Histogram, render_metrics, reset_metrics
+from app.models import UserCatalog
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from factories import make_image_bytes
+import tempfile
+
+
+def get_samples():
+    samples = {}
+    for line in render_metrics().splitlines():
+        if not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class TestMetrics(TestCase):
+    def setUp(self):
+        cache.clear()
+        reset_metrics()
+        self.user = User.objects.create_user('user')
+        UserCatalog.objects.create(user=self.user, catalog_name="name1")
+        self.client.force_login(self.user)
+
+    def test_histogram(self):
+        histogram = Histogram((1, 5))
+        for value in (0.5, 3, 7):
+            histogram.observe(value)
+        self.assertEqual((histogram.counts, histogram.count, histogram.sum), ([1, 2], 3, 10.5))
+
+    def test_request_metrics_per_view(self):
+        self.client.get(reverse("logged_in"))
+        self.client.post(reverse("upload_img"), {
+            "Upload": "Upload", "catalog": "name1", "name": "photo",
+            "image": SimpleUploadedFile("photo.jpg", make_image_bytes())})
+
+        samples = get_samples()
+        self.assertEqual(samples['picshow_request_duration_seconds_count{view="logged_in"}'], 1)
+        self.assertGreater(samples['picshow_request_queries_sum{view="logged_in"}'], 0)
+        self.assertGreater(samples['picshow_request_sql_duration_seconds_sum{view="logged_in"}'],
+                           0)
+        self.assertGreater(
+            samples['picshow_request_template_duration_seconds_sum{view="logged_in"}'], 0)
+        self.assertEqual(
+            samples['picshow_request_image_duration_seconds_sum{view="logged_in"}'], 0)
+        self.assertGreater(
+            samples['picshow_request_image_duration_seconds_sum{view="upload_img"}'], 0)
+        self.assertEqual(
+            samples['picshow_request_queries_bucket{view="logged_in",le="+Inf"}'], 1)
+
+    async def test_async_request_metrics(self):
+        await sync_to_async(self.async_client.force_login)(self.user)
+        await self.async_client.get(reverse("logged_in"))
+
+        samples = get_samples()
+        self.assertGreater(samples['picshow_request_queries_sum{view="logged_in"}'], 0)
+        self.assertGreater(
+            samples['picshow_request_template_duration_seconds_sum{view="logged_in"}'], 0)
+
+    def test_metrics_endpoint_is_staff_only(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 302)
+
+        self.client.force_login(User.objects.create_user('staff', is_staff=True))
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response["Content-Type"], "text/plain; version=0.0.4; charset=utf-8")
+        self.assertContains(response, "# TYPE picshow_request_duration_seconds histogram")
+
+    @override_settings(SLOW_REQUEST_THRESHOLD=0)
+    def test_slow_request_log(self):
+        with self.assertLogs("app.metrics", "WARNING") as logs:
+            self.client.get(reverse("logged_in"))
+        self.assertIn("Slow request GET /logged_in/ (logged_in)", logs.output[0])
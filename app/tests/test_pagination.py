@@ -0,0 +1,57 @@
+from app.models import UserCatalog, UserImage, UserImageMetadata
+from app.pagination import InvalidCursor, decode_cursor, encode_cursor, paginate_images
+from app.utils import get_image_ordering, get_sort_field
+from django.contrib.auth.models import User
+from django.test import TestCase
+import os
+
+IMAGE_PATH = os.path.join(os.getcwd(), "app", "tests", "images", "img_without_metadata.png")
+
+
+class TestPaginateImages(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('user')
+        catalog = UserCatalog.objects.create(user=self.user, catalog_name="name1")
+        for number, iso in enumerate([400, None, 100, 400, None, 3200, 100]):
+            image = UserImage.objects.create(name=f"name{number}",
+                                             user=self.user,
+                                             catalog=catalog,
+                                             image=IMAGE_PATH,
+                                             description="")
+            UserImageMetadata.objects.create(image=image, iso_speed_ratings=iso)
+
+    def walk(self, sort_parameter_tag, page_size):
+        field, descending = get_sort_field(sort_parameter_tag)
+        images = UserImage.get_images(self.user, "All", get_image_ordering(sort_parameter_tag))
+        pages, cursor = [], None
+        while True:
+            page = paginate_images(images, field, descending, cursor, page_size)
+            pages.append([image.name for image in page])
+            cursor = page.next_cursor
+            if not cursor:
+                return pages
+
+    def test_pages_match_full_ordering(self):
+        for sort_parameter_tag in [None, "Name", "-Name", "ISOSpeedRatings", "-ISOSpeedRatings"]:
+            full = self.walk(sort_parameter_tag, 100)[0]
+            for page_size in [1, 2, 3]:
+                pages = self.walk(sort_parameter_tag, page_size)
+                self.assertEqual(sum(pages, []), full)
+                self.assertTrue(all(len(page) <= page_size for page in pages))
+
+    def test_nulls_last_across_pages(self):
+        pages = self.walk("-ISOSpeedRatings", 2)
+        self.assertEqual(sum(pages, []), ["name5", "name3", "name0", "name6", "name2",
+                                          "name4", "name1"])
+
+    def test_page_is_one_query(self):
+        field, descending = get_sort_field("ISOSpeedRatings")
+        images = UserImage.get_images(self.user, "All", get_image_ordering("ISOSpeedRatings"))
+        cursor = paginate_images(images, field, descending, None, 2).next_cursor
+        with self.assertNumQueries(2):
+            paginate_images(images, field, descending, cursor, 2)
+
+    def test_cursor_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor("name1", 5)), ("name1", 5))
+        with self.assertRaises(InvalidCursor):
+            decode_cursor("not a cursor")
@@ -0,0 +1,96 @@
+from app.models import UserCatalog, UserImage, UserImageMetadata
+from app.search import FTS_TRIGGERS, restore_search_index, SearchError, parse_search
+from datetime import datetime, timezone
+from django.contrib.auth.models import User
+from django.apps import apps
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+import os
+
+IMAGE_PATH = os.path.join(os.getcwd(), "app", "tests", "images", "img_without_metadata.png")
+
+
+class TestSearch(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('user')
+        catalog1 = UserCatalog.objects.create(user=self.user, catalog_name="holiday")
+        catalog2 = UserCatalog.objects.create(user=self.user, catalog_name="home")
+        for name, description, catalog, lens, iso, year in [
+            ("beach", "Sunset over the sea", catalog1, "EF50mm f/1.8 STM", 3200, 2023),
+            ("pier", "sunset, long exposure", catalog1, "EF50mm f/1.8 STM", 100, 2023),
+            ("street", "Night street", catalog1, "EF50mm f/1.8 STM", 6400, 2023),
+            ("garden", "Sunsets at home", catalog2, "FE 85mm F1.8", 3200, 2022),
+        ]:
+            image = UserImage.objects.create(name=name, description=description, user=self.user,
+                                             catalog=catalog, image=IMAGE_PATH)
+            UserImageMetadata.objects.create(
+                image=image, lens_model=lens, iso_speed_ratings=iso,
+                date_time_original=datetime(year, 6, 1, 12, tzinfo=timezone.utc))
+        self.client.force_login(self.user)
+
+    def search(self, query):
+        images = UserImage.objects.filter(parse_search(query)).order_by("id")
+        return [image.name for image in images]
+
+    def test_combined_search(self):
+        self.assertEqual(self.search('sunset lens:"EF50mm" iso>=3200 year:2023'), ["beach"])
+        self.assertEqual(self.search("sunset"), ["beach", "pier", "garden"])
+        self.assertEqual(self.search("iso:3200"), ["beach", "garden"])
+        self.assertEqual(self.search("date<2023 catalog:home"), ["garden"])
+        self.assertEqual(self.search("date:2023-06 exposure<1"), [])
+        self.assertEqual(self.search(""), ["beach", "pier", "street", "garden"])
+
+    def test_index_follows_changes(self):
+        UserImage.objects.filter(name="street").update(description="Sunset street")
+        UserImage.objects.filter(name="beach").delete()
+        self.assertEqual(self.search("sunset year:2023"), ["pier", "street"])
+
+    def test_missing_triggers_are_restored(self):
+        # SQLite drops the triggers when a migration remakes app_userimage.
+        with connection.cursor() as cursor:
+            for name in FTS_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER {name}")
+        UserImage.objects.filter(name="street").update(description="Sunset street")
+
+        restore_search_index(apps.get_app_config("app"))
+        UserImage.objects.create(name="dune", description="sunset", user=self.user,
+                                 catalog=UserCatalog.objects.get(catalog_name="home"),
+                                 image=IMAGE_PATH)
+        self.assertEqual(self.search("sunset"), ["beach", "pier", "street", "garden", "dune"])
+
+    def test_invalid_search(self):
+        for query in ["iso>=many", "colour:red", 'lens:"EF', "date:June", "lens>EF", "iso:"]:
+            with self.subTest(query), self.assertRaises(SearchError):
+                parse_search(query)
+
+    def test_out_of_range_search(self):
+        for query in ["year:9999", "date:9999-12", "date>=9999-12-31"]:
+            with self.subTest(query), self.assertRaises(SearchError):
+                parse_search(query)
+        self.assertEqual(self.search("iso<99999999999999999999"),
+                         ["beach", "pier", "street", "garden"])
+        self.assertEqual(self.search("iso>99999999999999999999"), [])
+        self.assertEqual(self.search("f:1e999 exposure>-1e999"), [])
+
+        response = self.client.get(reverse("logged_in"), {"q": "year:9999"})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Date out of range: 9999")
+
+    def test_search_views(self):
+        response = self.client.post(reverse("logged_in"), {
+            "Catalogs": "All", "Search": "Search", "q": "sunset iso>=3200"})
+        self.assertEqual([image.name for image, _ in response.context["images"]],
+                         ["beach", "garden"])
+        self.assertContains(response, 'value="sunset iso&gt;=3200"')
+
+        response = self.client.get(reverse("api_images"), {"fields": "name", "q": "night"})
+        self.assertEqual([image["name"] for image in response.json()["images"]], ["street"])
+        self.assertEqual(self.client.get(reverse("api_images"), {"q": "f<x"}).status_code, 400)
+        self.assertEqual(self.client.get(reverse("gallery_page"), {"q": "f<x"}).status_code, 400)
+
+        response = self.client.post(reverse("logged_in"), {"Catalogs": "All", "q": "f<x"})
+        self.assertEqual(len(response.context["images"]), 4)
+        self.assertContains(response, "Not a number: x")
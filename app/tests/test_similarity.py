@@ -0,0 +1,110 @@
+from app.derivatives import create_image_derivatives
+from app.models import UserCatalog, UserImage
+from app.similarity import (find_duplicate_groups, find_similar_images, get_chunk_variants,
+                            get_dhash, get_dhashes, get_distance, get_image_hash,
+                            read_hash_pixels, join_hash, numpy, set_image_hash, split_hash)
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from io import BytesIO, StringIO
+from PIL import Image, ImageDraw
+from unittest import skipIf
+import tempfile
+
+
+def make_picture(size=(320, 240), shapes=((40, 40, 160, 200),), image_format="JPEG",
+                 quality=90):
+    image = Image.linear_gradient("L").resize(size).convert("RGB")
+    draw = ImageDraw.Draw(image)
+    for shape in shapes:
+        draw.ellipse([coordinate * size[0] // 320 for coordinate in shape], fill="orange")
+    buffer = BytesIO()
+    image.save(buffer, image_format, quality=quality)
+    return buffer.getvalue()
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class TestSimilarity(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('user')
+        self.catalog = UserCatalog.objects.create(user=self.user, catalog_name="name1")
+
+    def create_image(self, name, data, user=None, catalog=None):
+        image = UserImage(name=name, user=user or self.user, catalog=catalog or self.catalog)
+        image.image.save(f"{name}.jpg", ContentFile(data))
+        create_image_derivatives(image)
+        return image
+
+    def test_hash_survives_resizing_and_encoding(self):
+        original = get_dhash(read_hash_pixels(BytesIO(make_picture())))
+        smaller = get_dhash(read_hash_pixels(BytesIO(make_picture((160, 120), quality=40))))
+        png = get_dhash(read_hash_pixels(BytesIO(make_picture(image_format="PNG"))))
+        other = get_dhash(read_hash_pixels(BytesIO(make_picture(shapes=((200, 20, 300, 90),)))))
+
+        self.assertLessEqual(get_distance(original, smaller), 3)
+        self.assertLessEqual(get_distance(original, png), 3)
+        self.assertGreater(get_distance(original, other), 10)
+
+    def test_split_hash(self):
+        value = 0x0123456789ABCDEF
+        self.assertEqual(split_hash(value), [0x0123, 0x4567, 0x89AB, 0xCDEF])
+        self.assertEqual(join_hash(split_hash(value)), value)
+        self.assertEqual(len(set(get_chunk_variants(0, 1))), 17)
+
+    @skipIf(numpy is None, "NumPy is not installed")
+    def test_vectorized_hashes(self):
+        pixels = [read_hash_pixels(BytesIO(make_picture(shapes=(shape,))))
+                  for shape in [(40, 40, 160, 200), (200, 20, 300, 90)]]
+        self.assertEqual(get_dhashes(pixels), [get_dhash(image_pixels) for image_pixels in pixels])
+
+    def test_find_similar_images(self):
+        image = self.create_image("original", make_picture())
+        copy = self.create_image("copy", make_picture((640, 480), quality=50))
+        self.create_image("other", make_picture(shapes=((200, 20, 300, 90),)))
+        other_user = User.objects.create_user('user2')
+        self.create_image("foreign", make_picture(), other_user,
+                          UserCatalog.objects.create(user=other_user, catalog_name="name1"))
+
+        self.assertIsNotNone(get_image_hash(image))
+        self.assertEqual(find_similar_images(image), [copy])
+
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("img_metadata", args=[image.id]))
+        self.assertContains(response, "Similar pictures")
+        self.assertContains(response, ">copy</a>")
+
+    def test_find_duplicate_groups(self):
+        values = {
+            "a": 0x0000000000000000,
+            "b": 0x0001000100010000,  # 3 bits from a, one per chunk
+            "c": 0x0000000000000000,  # same as a
+            "d": 0xFFFF00000000001F,  # 21 bits from a
+            "e": 0xFFFF00000000001E,  # 1 bit from d
+            "f": 0x00000000000F00F0,  # 8 bits from a
+        }
+        images = {}
+        for name, value in values.items():
+            images[name] = UserImage(name=name, user=self.user, catalog=self.catalog)
+            set_image_hash(images[name], value)
+        UserImage.objects.bulk_create(images.values())
+        ids = {name: image.id for name, image in images.items()}
+
+        self.assertEqual(find_duplicate_groups(UserImage.objects.all()),
+                         [sorted([ids["a"], ids["b"], ids["c"]]), [ids["d"], ids["e"]]])
+        self.assertEqual(find_duplicate_groups(UserImage.objects.all(), 0),
+                         [[ids["a"], ids["c"]]])
+        self.assertIn(sorted([ids["a"], ids["b"], ids["c"], ids["f"]]),
+                      find_duplicate_groups(UserImage.objects.all(), 8))
+
+    def test_find_duplicates_command_backfills(self):
+        for name in ["one", "two"]:
+            image = UserImage(name=name, user=self.user, catalog=self.catalog)
+            image.image.save(f"{name}.jpg", ContentFile(make_picture()))
+        output = StringIO()
+
+        call_command("find_duplicates", backfill=True, user="user", stdout=output)
+
+        self.assertIn("Hashed 2 images.", output.getvalue())
+        self.assertIn("Found 1 groups of 2 similar images.", output.getvalue())
@@ -0,0 +1,68 @@
+from app import staticfiles
+from django.contrib.auth.models import User
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+import gzip
+import tempfile
+import unittest
+
+
+@override_settings(STATIC_ROOT=tempfile.mkdtemp())
+class TestStaticFiles(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        call_command("collectstatic", interactive=False, verbosity=0)
+
+    def setUp(self):
+        self.name = staticfiles_storage.stored_name("viewerjs/viewer.min.js")
+        self.url = staticfiles_storage.url("viewerjs/viewer.min.js")
+
+    def test_collectstatic_writes_gzip_variants(self):
+        self.assertRegex(self.name, r"^viewerjs/viewer\.min\.[0-9a-f]{12}\.js$")
+        with staticfiles_storage.open(self.name) as file, \
+                staticfiles_storage.open(self.name + ".gz") as compressed:
+            self.assertEqual(gzip.decompress(compressed.read()), file.read())
+
+    @unittest.skipIf(staticfiles.brotli is None, "brotli is not installed")
+    def test_collectstatic_writes_brotli_variants(self):
+        with staticfiles_storage.open(self.name) as file, \
+                staticfiles_storage.open(self.name + ".br") as compressed:
+            self.assertEqual(staticfiles.brotli.decompress(compressed.read()), file.read())
+
+    def test_serve_compressed_variant(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+        content = b"".join(response.streaming_content)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Content-Type"], "text/javascript")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(response["Cache-Control"], "public, max-age=31536000, immutable")
+        with staticfiles_storage.open(self.name) as file:
+            self.assertEqual(gzip.decompress(content), file.read())
+
+    def test_serve_identity(self):
+        for accept_encoding in ["", "gzip;q=0, identity"]:
+            response = self.client.get(self.url, HTTP_ACCEPT_ENCODING=accept_encoding)
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(response.has_header("Content-Encoding"))
+
+        not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_unhashed_names_are_revalidated(self):
+        response = self.client.get("/static/viewerjs/viewer.min.js")
+
+        self.assertEqual(response["Cache-Control"], "public, no-cache")
+        self.assertEqual(self.client.get("/static/viewerjs/missing.js").status_code, 404)
+        self.assertEqual(self.client.get("/static/viewerjs/").status_code, 404)
+
+    def test_templates_use_hashed_minified_assets(self):
+        self.client.force_login(User.objects.create_user("user1"))
+
+        response = self.client.get("/logged_in/")
+
+        self.assertContains(response, f'src="{self.url}"')
+        self.assertContains(response, staticfiles_storage.url("viewerjs/viewer.min.css"))
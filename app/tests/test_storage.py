@@ -0,0 +1,56 @@
+from app.derivatives import create_image_derivatives
+from app.models import UserCatalog, UserImage
+from app.storage import hash_file, is_content_addressed
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from factories import make_image_bytes
+import os
+import tempfile
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class TestContentAddressedStorage(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('user')
+        self.catalog = UserCatalog.objects.create(user=self.user, catalog_name="name1")
+
+    def create_image(self, name, content):
+        image = UserImage(name=name, user=self.user, catalog=self.catalog)
+        image.image.save(f"{name}.JPG", ContentFile(content))
+        return image
+
+    def test_identical_uploads_share_one_file(self):
+        content = make_image_bytes()
+        image1 = self.create_image("name1", content)
+        image2 = self.create_image("name2", content)
+        image3 = self.create_image("name3", make_image_bytes(color="blue"))
+
+        digest = hash_file(ContentFile(content))
+        self.assertEqual(image1.image.name,
+                         f"app/images/{digest[:2]}/{digest[2:4]}/{digest}.jpg")
+        self.assertEqual(image1.image.name, image2.image.name)
+        self.assertNotEqual(image1.image.name, image3.image.name)
+        self.assertTrue(is_content_addressed(image1.image.name))
+        self.assertFalse(is_content_addressed("app/images/photo.jpg"))
+
+    def test_file_is_removed_with_last_reference(self):
+        content = make_image_bytes(size=(400, 300))
+        image1 = self.create_image("name1", content)
+        image2 = self.create_image("name2", content)
+        create_image_derivatives(image1)
+        create_image_derivatives(image2)
+        path = image1.image.path
+        derivative_paths = [derivative.file.path for derivative in image1.derivatives.all()]
+        self.assertEqual(derivative_paths,
+                         [derivative.file.path for derivative in image2.derivatives.all()])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            image1.delete()
+        self.assertTrue(os.path.exists(path))
+        self.assertTrue(all(os.path.exists(path) for path in derivative_paths))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            UserCatalog.delete_catalog(self.user, "name1")
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(any(os.path.exists(path) for path in derivative_paths))
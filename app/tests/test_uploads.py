@@ -0,0 +1,166 @@
+from app.models import ImageJob, UserCatalog, UserImage
+from app.storage import hash_file
+from app.tasks import EXTRACT_METADATA
+from app.uploads import read_header, RequestBodyLimit, sniff_image_format
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.messages import get_messages
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from factories import CANON_EXIF, make_image_bytes
+from pathlib import Path
+import io
+import tempfile
+import zipfile
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class TestImageUploadHandler(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('user')
+        UserCatalog.objects.create(user=self.user, catalog_name="name1")
+        self.client.force_login(self.user)
+
+    def upload(self, name, content, file_name="photo.jpg"):
+        return self.client.post(reverse("upload_img"), {
+            "Upload": "Upload", "catalog": "name1", "name": name,
+            "image": SimpleUploadedFile(file_name, content, "image/jpeg")})
+
+    def get_messages(self, response):
+        return [str(message) for message in get_messages(response.wsgi_request)]
+
+    def get_leftover_uploads(self):
+        return list(Path(settings.MEDIA_ROOT).rglob("*.upload"))
+
+    def test_upload_is_hashed_and_read_while_streaming(self):
+        content = make_image_bytes(CANON_EXIF, size=(900, 600))
+        self.upload("name11", content)
+
+        image = UserImage.objects.get()
+        digest = hash_file(ContentFile(content))
+        self.assertEqual(image.image.name, f"app/images/{digest[:2]}/{digest[2:4]}/{digest}.jpg")
+        self.assertEqual(image.image.read(), content)
+        self.assertEqual(image.metadata.model, "Canon EOS 77D")
+        self.assertFalse(image.jobs.filter(kind=EXTRACT_METADATA).exists())
+        self.assertEqual(self.get_leftover_uploads(), [])
+
+    def test_duplicate_upload_is_stored_once(self):
+        content = make_image_bytes(color="purple")
+        self.upload("name11", content)
+        self.upload("name12", content)
+
+        names = set(UserImage.objects.values_list("image", flat=True))
+        self.assertEqual(len(names), 1)
+        digest = hash_file(ContentFile(content))
+        self.assertEqual(len(list(Path(settings.MEDIA_ROOT).rglob(f"{digest}*"))), 1)
+        self.assertEqual(self.get_leftover_uploads(), [])
+
+    @override_settings(IMAGE_UPLOAD_MAX_SIZE=1024)
+    def test_rejects_large_upload(self):
+        response = self.upload("name11", make_image_bytes(size=(900, 600), image_format="PNG"),
+                               "photo.png")
+
+        self.assertRedirects(response, reverse("upload_img"))
+        self.assertEqual(self.get_messages(response), ["The file is too large."])
+        self.assertFalse(UserImage.objects.exists())
+        self.assertEqual(self.get_leftover_uploads(), [])
+
+    def test_rejects_content_that_is_not_an_image(self):
+        response = self.upload("name11", b"%PDF-1.4 not an image" * 100)
+
+        self.assertEqual(self.get_messages(response), ["Upload a valid image."])
+        self.assertFalse(UserImage.objects.exists())
+        self.assertEqual(self.get_leftover_uploads(), [])
+
+    def test_rejects_truncated_image(self):
+        content = make_image_bytes(size=(300, 200))
+        response = self.upload("name11", content[:len(content) // 2])
+
+        self.assertEqual(self.get_messages(response), ["Upload a valid image."])
+        self.assertFalse(UserImage.objects.exists())
+
+    def test_bulk_upload_reports_rejected_files(self):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr("beach.jpg", make_image_bytes(color="blue"))
+        response = self.client.post(reverse("upload_img"), {
+            "BulkUpload": "Upload all", "catalog": "name1",
+            "image": [SimpleUploadedFile("one.jpg", make_image_bytes(CANON_EXIF)),
+                      SimpleUploadedFile("two.jpg", b"broken"),
+                      SimpleUploadedFile("shoot.zip", buffer.getvalue())],
+        })
+
+        self.assertContains(response, "2 of 3 pictures have been uploaded.")
+        self.assertContains(response, "Not a valid image.")
+        self.assertEqual(sorted(UserImage.objects.values_list("name", flat=True)),
+                         ["beach", "one"])
+        self.assertEqual(UserImage.objects.get(name="one").metadata.model, "Canon EOS 77D")
+        self.assertEqual(ImageJob.objects.filter(kind=EXTRACT_METADATA).count(), 1)
+        self.assertEqual(self.get_leftover_uploads(), [])
+
+
+class TestReadHeader(TestCase):
+    def test_sniff_image_format(self):
+        self.assertEqual(sniff_image_format(make_image_bytes()[:12]), "JPEG")
+        self.assertEqual(sniff_image_format(make_image_bytes(image_format="PNG")[:12]), "PNG")
+        self.assertIsNone(sniff_image_format(b"PK\x03\x04"))
+
+    def test_read_header(self):
+        content = make_image_bytes(CANON_EXIF, size=(300, 200))
+        (image_format, size, exif_groups), error = read_header(io.BytesIO(content), False)
+
+        self.assertIsNone(error)
+        self.assertEqual((image_format, size), ("JPEG", (300, 200)))
+        self.assertEqual(exif_groups["Image"]["Model"], "Canon EOS 77D")
+
+    def test_truncated_header_is_read_later(self):
+        content = make_image_bytes(image_format="PNG")
+        self.assertEqual(read_header(io.BytesIO(content[:10]), False), (None, None))
+        self.assertEqual(read_header(io.BytesIO(content[:10]), True)[1], "Not a valid image.")
+
+
+async def echo_body(scope, receive, send):
+    """Read the body like Django's ASGI handler, which gives up on a disconnect."""
+    body = b""
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            break
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": body})
+
+
+@override_settings(REQUEST_BODY_MAX_SIZE=10)
+class TestRequestBodyLimit(TestCase):
+    async def request(self, chunks, content_length=None):
+        headers = [(b"content-length", str(content_length).encode())] if content_length else []
+        messages = [{"type": "http.request", "body": chunk, "more_body": index < len(chunks) - 1}
+                    for index, chunk in enumerate(chunks)]
+        received, sent = [], []
+
+        async def receive():
+            received.append(messages[len(received)])
+            return received[-1]
+
+        async def send(message):
+            sent.append(message)
+
+        await RequestBodyLimit(echo_body)({"type": "http", "headers": headers}, receive, send)
+        return sent[0]["status"], sent[1]["body"], len(received)
+
+    async def test_small_body_passes(self):
+        self.assertEqual(await self.request([b"12345", b"678"], 8), (200, b"12345678", 2))
+        self.assertEqual(await self.request([b"12345", b"678"]), (200, b"12345678", 2))
+
+    async def test_content_length_over_limit_is_not_read(self):
+        status, _, received = await self.request([b"12345678901"], 11)
+        self.assertEqual((status, received), (413, 0))
+
+    async def test_body_over_limit_without_content_length(self):
+        status, _, received = await self.request([b"123456", b"789012", b"345"])
+        self.assertEqual((status, received), (413, 2))
@@ -1,10 +1,13 @@
-from app.utils import (get_metadata_from_img, ImageMetadata,
-                       get_image_names, create_img_list_from_catalog)
-from django.test import TestCase
-from unittest.mock import MagicMock
-from app.models import UserCatalog, UserImage
+from app.utils import (get_metadata_from_img, ImageMetadata, get_stored_metadata,
+                       get_image_names, create_img_list_from_catalog, save_image_metadata)
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from unittest.mock import MagicMock, patch
+from app.models import UserCatalog, UserImage, UserImageMetadata
 from django.contrib.auth.models import User
+from factories import CANON_EXIF, EXIF_IFD, make_image_bytes
 import os
+import tempfile
 
 
 IMAGE_WITHOUT_METADATA_PATH = os.path.join(os.getcwd(), "app",
@@ -21,10 +24,11 @@ class TestGetMetadataFromImg(TestCase):
 
     def test_get_metadata_from_img_with_metadata(self):
         actual = get_metadata_from_img(IMAGE_WITH_METADATA_PATH)
-        self.assertEqual(actual[0], 'ResolutionUnit : 2')
-        self.assertEqual(actual[1], 'ExifOffset : 216')
-        self.assertEqual(actual[2], 'Make : Canon')
-        self.assertEqual(actual[3], 'Model : Canon EOS 77D')
+        # Tags are listed in file order, IFD0 (sorted by tag id) then the Exif IFD.
+        self.assertEqual(actual[0], 'Make : Canon')
+        self.assertEqual(actual[1], 'Model : Canon EOS 77D')
+        self.assertIn('ResolutionUnit : 2', actual)
+        self.assertIn('ExifOffset : 216', actual)
         self.assertEqual(actual[-1], 'LensSerialNumber : 0000280404')
 
 
@@ -99,16 +103,18 @@ class TestCreateImgListFromCatalog(TestCase):
         catalog2 = UserCatalog.objects.create(user=self.user,
                                               catalog_name="name2")
 
-        UserImage.objects.create(name="name11",
-                                 user=self.user,
-                                 catalog=catalog1,
-                                 image=IMAGE_WITHOUT_METADATA_PATH,
-                                 description="")
-        UserImage.objects.create(name="name12",
-                                 user=self.user,
-                                 catalog=catalog1,
-                                 image=IMAGE_WITH_METADATA_PATH,
-                                 description="")
+        self.image11 = UserImage.objects.create(name="name11",
+                                                user=self.user,
+                                                catalog=catalog1,
+                                                image=IMAGE_WITHOUT_METADATA_PATH,
+                                                description="")
+        image12 = UserImage.objects.create(name="name12",
+                                           user=self.user,
+                                           catalog=catalog1,
+                                           image=IMAGE_WITH_METADATA_PATH,
+                                           description="")
+        UserImageMetadata.objects.create(image=image12, model='Canon EOS 77D')
+        self.image12 = image12
         UserImage.objects.create(name="name21",
                                  user=self.user,
                                  catalog=catalog2,
@@ -130,7 +136,8 @@ class TestCreateImgListFromCatalog(TestCase):
         attrs = {'user': self.user,
                  'method': "POST",
                  'POST.get.return_value': False,
-                 'POST.getlist.return_value': ["name11", "name12"]}
+                 'POST.getlist.return_value': [str(self.image11.id),
+                                               str(self.image12.id)]}
         request = MagicMock(**attrs)
 
         actual = create_img_list_from_catalog(request, catalog_name="name1")
@@ -149,7 +156,8 @@ class TestCreateImgListFromCatalog(TestCase):
         attrs = {'user': self.user,
                  'method': "POST",
                  'POST.get.return_value': False,
-                 'POST.getlist.return_value': ["name11", "name12"]
+                 'POST.getlist.return_value': [str(self.image11.id),
+                                               str(self.image12.id)]
                  }
         request = MagicMock(**attrs)
 
@@ -164,3 +172,127 @@ class TestCreateImgListFromCatalog(TestCase):
         self.assertEqual(actual[2][0].name, "name21")
         self.assertEqual(actual[2][1].model, None)
         self.assertEqual(actual[2][1].view, False)
+
+    def test_create_img_list_from_catalog_duplicate_names(self):
+        duplicate = UserImage.objects.create(name="name11",
+                                             user=self.user,
+                                             catalog=self.image11.catalog,
+                                             image=IMAGE_WITHOUT_METADATA_PATH,
+                                             description="")
+        attrs = {'user': self.user,
+                 'method': "POST",
+                 'POST.get.return_value': False,
+                 'POST.getlist.return_value': [str(duplicate.id)]}
+        request = MagicMock(**attrs)
+
+        actual = create_img_list_from_catalog(request, catalog_name="name1")
+
+        self.assertEqual([image.id for image, _ in actual],
+                         [self.image11.id, self.image12.id, duplicate.id])
+        self.assertEqual([metadata.view for _, metadata in actual], [False, False, True])
+
+    def test_create_img_list_from_catalog_query_count(self):
+        request = MagicMock(user=self.user, method="GET")
+
+        with self.assertNumQueries(2):
+            small = create_img_list_from_catalog(request, catalog_name="All")
+
+        for number in range(20):
+            UserImage.objects.create(name=f"extra{number}",
+                                     user=self.user,
+                                     catalog=self.image11.catalog,
+                                     image=IMAGE_WITHOUT_METADATA_PATH,
+                                     description="")
+
+        with self.assertNumQueries(2):
+            large = create_img_list_from_catalog(request, catalog_name="All")
+            [(image.catalog.catalog_name, image.thumbnail_url) for image, _ in large]
+
+        self.assertEqual(len(large), len(small) + 20)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class TestSaveImageMetadata(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('user')
+        catalog = UserCatalog.objects.create(user=self.user, catalog_name="name1")
+        self.image = UserImage(name="name11", user=self.user, catalog=catalog)
+        self.image.image.save("canon.jpg", ContentFile(make_image_bytes(CANON_EXIF)))
+
+    def test_save_image_metadata(self):
+        stored = save_image_metadata(self.image)
+
+        self.assertEqual(stored.date_time_original.strftime("%Y:%m:%d %H:%M:%S"),
+                         "2020:08:12 10:32:48")
+        self.assertEqual(stored.model, "Canon EOS 77D")
+        self.assertEqual(stored.exposure_time, 0.0025)
+        self.assertEqual(stored.f_number, 3.5)
+        self.assertEqual(stored.iso_speed_ratings, 100)
+        self.assertEqual(stored.lens_model, "EF50mm f/1.8 STM")
+        self.assertEqual(stored.exif["Image"]["Make"], "Canon")
+        self.assertEqual(stored.exif["Exif"]["LensModel"], "EF50mm f/1.8 STM")
+
+    def test_date_time_original_over_modified_date(self):
+        edited = {**CANON_EXIF, 0x0132: "2023:01:05 18:00:00"}
+        self.image.image.save("edited.jpg", ContentFile(make_image_bytes(edited)))
+        stored = save_image_metadata(self.image)
+        self.assertEqual(stored.date_time_original.strftime("%Y:%m:%d %H:%M:%S"),
+                         "2020:08:12 10:32:48")
+
+        without_original = {**edited, EXIF_IFD: {0x8827: 100}}
+        self.image.image.save("scan.jpg", ContentFile(make_image_bytes(without_original)))
+        stored = save_image_metadata(self.image)
+        self.assertEqual(stored.date_time_original.strftime("%Y:%m:%d %H:%M:%S"),
+                         "2023:01:05 18:00:00")
+
+    def test_stored_metadata_does_not_open_file(self):
+        save_image_metadata(self.image)
+        image = UserImage.objects.select_related("metadata").get(id=self.image.id)
+
+        with patch("PIL.Image.open") as image_open:
+            metadata = ImageMetadata.from_user_image(image)
+            exif_data = get_stored_metadata(image)
+
+        image_open.assert_not_called()
+        self.assertEqual(metadata.model, "Canon EOS 77D")
+        self.assertEqual(exif_data["Image"]["Model"], "Canon EOS 77D")
+
+    def test_stored_metadata_missing(self):
+        image = UserImage.objects.select_related("metadata").get(id=self.image.id)
+        self.assertIsNone(ImageMetadata.from_user_image(image).model)
+        self.assertEqual(get_stored_metadata(image), {})
+
+
+class TestSortImages(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('user')
+        catalog = UserCatalog.objects.create(user=self.user, catalog_name="name1")
+        for name, iso in [("b", 400), ("c", None), ("a", 100), ("d", 3200)]:
+            image = UserImage.objects.create(name=name,
+                                             user=self.user,
+                                             catalog=catalog,
+                                             image=IMAGE_WITHOUT_METADATA_PATH,
+                                             description="")
+            UserImageMetadata.objects.create(image=image, iso_speed_ratings=iso)
+        UserImage.objects.create(name="e",
+                                 user=self.user,
+                                 catalog=catalog,
+                                 image=IMAGE_WITHOUT_METADATA_PATH,
+                                 description="")
+        self.request = MagicMock(user=self.user, method="GET")
+
+    def sorted_names(self, sort_parameter_tag):
+        images = create_img_list_from_catalog(self.request, "All", sort_parameter_tag)
+        return [image.name for image, _ in images]
+
+    def test_sort_by_name(self):
+        self.assertEqual(self.sorted_names("Name"), ["a", "b", "c", "d", "e"])
+        self.assertEqual(self.sorted_names("-Name"), ["e", "d", "c", "b", "a"])
+
+    def test_sort_by_metadata_puts_missing_values_last(self):
+        self.assertEqual(self.sorted_names("ISOSpeedRatings"), ["a", "b", "d", "c", "e"])
+        self.assertEqual(self.sorted_names("-ISOSpeedRatings"), ["d", "b", "a", "e", "c"])
+
+    def test_sort_query_count(self):
+        with self.assertNumQueries(2):
+            self.sorted_names("-ISOSpeedRatings")
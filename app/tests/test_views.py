@@ -1,6 +1,218 @@
-from django.test import TestCase
+from asgiref.sync import sync_to_async
+from app.exif import EXIF_IFD
+from app.models import UserCatalog, UserImage, UserImageMetadata
+from app.pagination import GALLERY_PAGE_SIZE
+from app.storage import hash_file
+from app.utils import save_image_metadata
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.contrib.messages import get_messages
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+from factories import CANON_EXIF, make_image_bytes
+from PIL.TiffImagePlugin import IFDRational
+from unittest.mock import patch
+import os
+import tempfile
+
+IMAGE_PATH = os.path.join(os.getcwd(), "app", "tests", "images", "img_without_metadata.png")
 
 
 class DummyTest(TestCase):
     def test_dummy(self):
         self.assertTrue(True)
+
+
+class TestGalleryPage(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('user')
+        catalog = UserCatalog.objects.create(user=self.user, catalog_name="name1")
+        for number in range(GALLERY_PAGE_SIZE + 2):
+            UserImage.objects.create(name=f"name{number:03}",
+                                     user=self.user,
+                                     catalog=catalog,
+                                     image=IMAGE_PATH,
+                                     description="")
+        self.client.force_login(self.user)
+
+    def test_logged_in_renders_first_page(self):
+        response = self.client.get(reverse("logged_in"))
+        self.assertEqual(len(response.context["images"]), GALLERY_PAGE_SIZE)
+        self.assertIsNotNone(response.context["images"].next_cursor)
+
+    def test_gallery_page_fragment(self):
+        cursor = self.client.get(reverse("logged_in")).context["images"].next_cursor
+        response = self.client.get(reverse("gallery_page"), {"cursor": cursor})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Next-Cursor"], "")
+        self.assertContains(response, 'id="page-tiles"')
+        self.assertEqual(len(response.context["images"]), 2)
+
+    def test_gallery_page_json(self):
+        response = self.client.get(reverse("gallery_page"),
+                                   {"format": "json", "sort": "-Name", "catalog": "name1"})
+        data = response.json()
+        self.assertEqual(len(data["images"]), GALLERY_PAGE_SIZE)
+        self.assertEqual(data["images"][0]["name"], f"name{GALLERY_PAGE_SIZE + 1:03}")
+
+        response = self.client.get(reverse("gallery_page"),
+                                   {"format": "json", "sort": "-Name",
+                                    "cursor": data["next_cursor"]})
+        self.assertEqual([image["name"] for image in response.json()["images"]],
+                         ["name001", "name000"])
+
+    def test_gallery_page_invalid_cursor(self):
+        response = self.client.get(reverse("gallery_page"), {"cursor": "invalid"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_gallery_page_anonymous(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse("gallery_page")).status_code, 404)
+        self.assertEqual(self.client.get(reverse("gallery_page"),
+                                         {"format": "json"}).status_code, 404)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class TestAsyncViews(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('user')
+        self.catalog = UserCatalog.objects.create(user=self.user, catalog_name="name1")
+        self.image = UserImage.objects.create(name="name11", user=self.user, catalog=self.catalog,
+                                              image=IMAGE_PATH, description="")
+
+    async def test_logged_in_async_client(self):
+        client = AsyncClient()
+        await sync_to_async(client.force_login)(self.user)
+
+        response = await client.get(reverse("logged_in"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["catalogs"], ["name1"])
+        self.assertEqual([image.name for image, _ in response.context["images"]], ["name11"])
+
+    def test_img_metadata(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("img_metadata", args=[self.image.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["image"], self.image)
+
+        self.client.force_login(User.objects.create_user('user2'))
+        response = self.client.get(reverse("img_metadata", args=[self.image.id]))
+        self.assertEqual(response.status_code, 404)
+
+        self.client.logout()
+        response = self.client.get(reverse("img_metadata", args=[self.image.id]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_upload_rejects_invalid_image(self):
+        self.client.force_login(self.user)
+        image = SimpleUploadedFile("photo.jpg", b"not an image")
+        response = self.client.post(reverse("upload_img"), {"Upload": "Upload", "catalog": "name1",
+                                                            "name": "name12", "image": image})
+
+        self.assertRedirects(response, reverse("upload_img"))
+        self.assertEqual([str(message) for message in get_messages(response.wsgi_request)],
+                         ["Upload a valid image."])
+        self.assertFalse(UserImage.objects.filter(name="name12").exists())
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class TestExifDetail(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('user')
+        catalog = UserCatalog.objects.create(user=self.user, catalog_name="name1")
+        self.maker_note = bytes(range(256)) * 4
+        exif = {**CANON_EXIF, 0x8825: {1: "S", 2: (IFDRational(33, 1), IFDRational(51, 1),
+                                                   IFDRational(36, 1)),
+                                       3: "E", 4: (IFDRational(151, 1), IFDRational(12, 1),
+                                                   IFDRational(36, 1))},
+                EXIF_IFD: {**CANON_EXIF[EXIF_IFD], 0x927C: self.maker_note}}
+        self.image = UserImage(name="name11", user=self.user, catalog=catalog)
+        self.image.image.save("canon.jpg", ContentFile(make_image_bytes(exif)))
+        save_image_metadata(self.image)
+        self.client.force_login(self.user)
+
+    def test_exif_document(self):
+        exif = UserImageMetadata.objects.get(image=self.image).exif
+
+        self.assertEqual(list(exif), ["Image", "Exif", "GPS", "Location"])
+        self.assertEqual(exif["Exif"]["MakerNote"], {"size": 1024})
+        self.assertEqual(exif["Location"], {"latitude": -33.86, "longitude": 151.21})
+
+    def test_detail_page_reads_no_file(self):
+        with patch("app.exif.read_image") as read_image:
+            response = self.client.get(reverse("img_metadata", args=[self.image.id]))
+
+        read_image.assert_not_called()
+        self.assertContains(response, "<h6> GPS </h6>", html=False)
+        self.assertContains(response, "-33.86, 151.21")
+        url = reverse("exif_value", args=[self.image.id, "Exif", "MakerNote"])
+        self.assertContains(response, f'<a href="{url}">1024 bytes</a>', html=True)
+
+    def test_exif_value(self):
+        response = self.client.get(reverse("exif_value",
+                                           args=[self.image.id, "Exif", "MakerNote"]))
+        self.assertEqual(response.content, self.maker_note)
+        self.assertEqual(self.client.get(reverse(
+            "exif_value", args=[self.image.id, "Image", "Model"])).status_code, 404)
+
+        self.client.force_login(User.objects.create_user('user2'))
+        self.assertEqual(self.client.get(reverse(
+            "exif_value", args=[self.image.id, "Exif", "MakerNote"])).status_code, 404)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), MEDIA_ACCEL_REDIRECT=None)
+class TestServeMedia(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('user')
+        catalog = UserCatalog.objects.create(user=self.user, catalog_name="name1")
+        self.content = make_image_bytes()
+        self.image = UserImage(name="name11", user=self.user, catalog=catalog)
+        self.image.image.save("photo.jpg", ContentFile(self.content))
+        self.client.force_login(self.user)
+
+    def get(self, **headers):
+        return self.client.get(self.image.image.url, headers=headers)
+
+    def test_serve_media(self):
+        response = self.get()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), self.content)
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        self.assertEqual(response["Cache-Control"], "private, max-age=31536000, immutable")
+        self.assertEqual(response["ETag"], f'"{hash_file(ContentFile(self.content))}"')
+
+    def test_serve_media_not_modified(self):
+        etag = self.get()["ETag"]
+        self.assertEqual(self.get(if_none_match=etag).status_code, 304)
+        last_modified = self.get()["Last-Modified"]
+        self.assertEqual(self.get(if_modified_since=last_modified).status_code, 304)
+
+    def test_serve_media_range(self):
+        response = self.get(range="bytes=10-19")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), self.content[10:20])
+        self.assertEqual(response["Content-Range"], f"bytes 10-19/{len(self.content)}")
+
+        response = self.get(range="bytes=-5")
+        self.assertEqual(b"".join(response.streaming_content), self.content[-5:])
+
+        self.assertEqual(self.get(range=f"bytes={len(self.content)}-").status_code, 416)
+
+    def test_serve_media_other_user(self):
+        self.client.force_login(User.objects.create_user('user2'))
+        self.assertEqual(self.get().status_code, 404)
+        self.client.logout()
+        self.assertEqual(self.get().status_code, 404)
+
+    @override_settings(MEDIA_ACCEL_REDIRECT="X-Accel-Redirect")
+    def test_serve_media_accel_redirect(self):
+        response = self.get()
+        self.assertEqual(response["X-Accel-Redirect"], "/protected-media/" + self.image.image.name)
+        self.assertEqual(response.content, b"")
@@ -0,0 +1,231 @@
+import hashlib
+import io
+import mimetypes
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile, StopFutureHandlers
+from PIL import Image
+
+from app.exif import PNG_SIGNATURE, TIFF_HEADERS, read_exif_groups
+from app.models import UserImage
+
+# Leading bytes kept in memory for the image header and the EXIF, a JPEG has its EXIF in
+# an APP1 segment of at most 64 KiB right after the start of the file.
+HEAD_SIZE = 128 * 1024
+
+UPLOAD_FORMATS = {"JPEG", "MPO", "PNG", "GIF", "WEBP", "TIFF"}
+INVALID_IMAGE = "Not a valid image."
+
+
+def sniff_image_format(data):
+    """The format promised by the first bytes of a file, None when it is not an image."""
+    if data[:3] == b"\xff\xd8\xff":
+        return "JPEG"
+    if data[:8] == PNG_SIGNATURE:
+        return "PNG"
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return "GIF"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "WEBP"
+    if data[:4] in TIFF_HEADERS:
+        return "TIFF"
+    return None
+
+
+def is_image_upload(file_name, content_type):
+    guessed_type = mimetypes.guess_type(file_name)[0] or ""
+    return (content_type or "").startswith("image/") or guessed_type.startswith("image/")
+
+
+def get_upload_directory():
+    field = UserImage._meta.get_field("image")
+    directory = os.path.dirname(field.storage.path(field.generate_filename(None, "upload")))
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def get_rejected_uploads(request):
+    """[{"file", "error"}] of the uploads ImageUploadHandler refused."""
+    return getattr(request, "rejected_uploads", [])
+
+
+class StreamedImageFile(UploadedFile):
+    """An image upload checked while it streamed in, in a temporary file next to the image
+    storage, so saving it is a rename.
+
+    sha256 is the hash of the content, exif_groups the EXIF as read by
+    app.exif.read_exif_groups or None when it was not in the leading bytes.
+    """
+
+    def __init__(self, file, name, content_type, size, charset, content_type_extra, sha256,
+                 image_format, image_size, exif_groups):
+        super().__init__(file, name, content_type, size, charset, content_type_extra)
+        self.sha256 = sha256
+        self.image_format = image_format
+        self.image_size = image_size
+        self.exif_groups = exif_groups
+
+    def temporary_file_path(self):
+        return self.file.name
+
+    def close(self):
+        try:
+            return self.file.close()
+        except FileNotFoundError:
+            # The file was moved into the storage.
+            pass
+
+
+class ImageUploadHandler(FileUploadHandler):
+    """Stream image uploads into the image storage directory in a single pass.
+
+    While the chunks arrive the content is hashed, the format is sniffed from the first
+    bytes, the size is checked against IMAGE_UPLOAD_MAX_SIZE and the header and EXIF are
+    read from the first HEAD_SIZE bytes. Files that fail are skipped right away and listed
+    by get_rejected_uploads. Other uploads, e.g. ZIP archives, go to the next handlers.
+    """
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None,
+                 content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length, charset,
+                         content_type_extra)
+        # MultiPartParser closes the "file" of every handler when an upload is skipped.
+        self.__dict__.pop("file", None)
+        self.active = is_image_upload(file_name, content_type)
+        if not self.active:
+            return
+
+        self.digest = hashlib.sha256()
+        self.head = bytearray()
+        self.header = None
+        self.file = tempfile.NamedTemporaryFile(suffix=".upload", dir=get_upload_directory())
+        if content_length is not None and content_length > settings.IMAGE_UPLOAD_MAX_SIZE:
+            self.reject("The file is too large.")
+        raise StopFutureHandlers()
+
+    def receive_data_chunk(self, raw_data, start):
+        if not self.active:
+            return raw_data
+
+        if start == 0 and sniff_image_format(raw_data[:12]) is None:
+            self.reject(INVALID_IMAGE)
+        if start + len(raw_data) > settings.IMAGE_UPLOAD_MAX_SIZE:
+            self.reject("The file is too large.")
+
+        self.digest.update(raw_data)
+        self.file.write(raw_data)
+        if self.header is None and len(self.head) < HEAD_SIZE:
+            self.head += raw_data[:HEAD_SIZE - len(self.head)]
+            if len(self.head) == HEAD_SIZE:
+                # A header further in is read from the file once it is complete.
+                self.header, error = read_header(io.BytesIO(self.head), complete=False)
+                if error:
+                    self.reject(error)
+        return None
+
+    def file_complete(self, file_size):
+        if not self.active:
+            return None
+
+        file = self.file
+        del self.file
+        file.flush()
+        if self.header is None:
+            source = io.BytesIO(self.head) if file_size <= HEAD_SIZE else file
+            self.header, error = read_header(source, complete=True)
+            if error:
+                file.close()
+                self.add_rejected(error)
+                return None
+
+        file.seek(0)
+        image_format, image_size, exif_groups = self.header
+        return StreamedImageFile(file, self.file_name, self.content_type, file_size,
+                                 self.charset, self.content_type_extra, self.digest.hexdigest(),
+                                 image_format, image_size, exif_groups)
+
+    def upload_interrupted(self):
+        if hasattr(self, "file"):
+            self.file.close()
+
+    def reject(self, error):
+        self.add_rejected(error)
+        raise SkipFile(error)
+
+    def add_rejected(self, error):
+        if not hasattr(self.request, "rejected_uploads"):
+            self.request.rejected_uploads = []
+        self.request.rejected_uploads.append({"file": self.file_name, "error": error})
+
+
+class RequestBodyLimit:
+    """ASGI middleware answering 413 to request bodies over REQUEST_BODY_MAX_SIZE.
+
+    Django's ASGI handler spools the whole body to a temporary file before any upload
+    handler sees it, so the limit is checked here: against Content-Length before the body
+    is read, and while it is received for bodies without one.
+    """
+
+    def __init__(self, application):
+        self.application = application
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.application(scope, receive, send)
+
+        limit = settings.REQUEST_BODY_MAX_SIZE
+        content_length = dict(scope.get("headers", [])).get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > limit:
+            return await send_too_large(send)
+
+        received = 0
+        too_large = False
+
+        async def limited_receive():
+            nonlocal received, too_large
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Django stops reading and answers nothing after a disconnect.
+                    too_large = True
+                    return {"type": "http.disconnect"}
+            return message
+
+        await self.application(scope, limited_receive, send)
+        if too_large:
+            await send_too_large(send)
+
+
+async def send_too_large(send):
+    await send({"type": "http.response.start", "status": 413,
+                "headers": [(b"content-type", b"text/plain; charset=utf-8")]})
+    await send({"type": "http.response.body", "body": b"The request is too large."})
+
+
+def read_header(file, complete):
+    """((format, size, EXIF groups), error) read from the start of an image file.
+
+    The header is None without an error when the start of the file is not enough to read
+    it. The EXIF is None when it may lie beyond the bytes read, it is at the start of JPEGs.
+    """
+    try:
+        with Image.open(file) as image:
+            image_format, image_size = image.format, image.size
+    except Image.DecompressionBombError:
+        return None, "The image has too many pixels."
+    except Exception:
+        return None, INVALID_IMAGE if complete else None
+
+    if image_format not in UPLOAD_FORMATS:
+        return None, "Not a supported image format."
+    if Image.MAX_IMAGE_PIXELS and image_size[0] * image_size[1] > Image.MAX_IMAGE_PIXELS:
+        return None, "The image has too many pixels."
+
+    exif_groups = None
+    if complete or image_format in ("JPEG", "MPO"):
+        exif_groups = read_exif_groups(file)
+    return (image_format, image_size, exif_groups), None
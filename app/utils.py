@@ -1,9 +1,21 @@
-from app.models import UserImage, UserCatalog
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import F
+
+from app.models import UserImage, UserCatalog, UserImageMetadata
+from app.pagination import ImagePage, apaginate_images, paginate_images
+from app.cache import aget_or_compute, get_or_compute, invalidate_user
+from app.exif import EXIF_GROUPS, read_exif, read_exif_groups
+from app.metrics import timed
+from app.search import parse_search
 from PIL import Image
-from PIL.ExifTags import TAGS
+from PIL.TiffImagePlugin import IFDRational
 
 METADATA_TAGS = [
-    "DateTime",
+    "DateTimeOriginal",
     "Model",
     "ExposureTime",
     "FNumber",
@@ -11,8 +23,32 @@ METADATA_TAGS = [
     "LensModel",
 ]
 
+# IFD0 DateTime is when the file was last changed, only used without DateTimeOriginal.
+FALLBACK_DATETIME_TAG = "DateTime"
+
+METADATA_TAGS_DICT = {
+    "Name": "Name",
+    "DateTimeOriginal": "date_time_original",
+    "Model": "model",
+    "ExposureTime": "exposure_time",
+    "FNumber": "f_number",
+    "ISOSpeedRatings": "iso_speed_ratings",
+    "LensModel": "lens_model",
+}
+
+SORT_TAGS = set(METADATA_TAGS_DICT) | {f"-{tag}" for tag in METADATA_TAGS_DICT}
+
+EXIF_DATETIME_FORMAT = "%Y:%m:%d %H:%M:%S"
+
+image_executor = ThreadPoolExecutor(max_workers=settings.IMAGE_WORKER_THREADS,
+                                    thread_name_prefix="image")
+
 NO_METADATA_COMMUNICATE = "The file does not contain any metadata."
 
+# Longer binary EXIF values, like MakerNote, are only stored as {"size": ...} and read from
+# the file on request, see views.exif_value.
+EXIF_INLINE_BYTES = 64
+
 
 class ImageMetadata:
     def __init__(
@@ -35,20 +71,154 @@ class ImageMetadata:
 
     @classmethod
     def from_image_path(cls, image_path):
-        image_file = Image.open(image_path)
-        exif_data = image_file._getexif()
-
-        metadata = {tag: None for tag in METADATA_TAGS}
+        return cls.from_exif(read_exif(image_path, [*METADATA_TAGS, FALLBACK_DATETIME_TAG]))
 
-        if exif_data is not None:
-            for tag_id in exif_data:
-                tag = TAGS.get(tag_id, tag_id)
-                data = exif_data.get(tag_id)
-                if tag in METADATA_TAGS:
-                    metadata[tag] = data
+    @classmethod
+    def from_exif(cls, exif_data):
+        metadata = {tag: exif_data.get(tag) for tag in METADATA_TAGS}
+        if metadata["DateTimeOriginal"] is None:
+            metadata["DateTimeOriginal"] = exif_data.get(FALLBACK_DATETIME_TAG)
 
         return cls(*metadata.values(), True)
 
+    @classmethod
+    def from_user_image(cls, image):
+        """Build metadata from the row stored at upload, without opening the file."""
+        try:
+            stored = image.metadata
+        except UserImageMetadata.DoesNotExist:
+            return cls(None, None, None, None, None, None, image.visible)
+
+        return cls(
+            stored.date_time_original,
+            stored.model,
+            stored.exposure_time,
+            stored.f_number,
+            stored.iso_speed_ratings,
+            stored.lens_model,
+            image.visible,
+        )
+
+
+@timed("image")
+def verify_image(image_file):
+    image_file.seek(0)
+    with Image.open(image_file) as image:
+        if getattr(image_file, "image_format", None):
+            # app.uploads.ImageUploadHandler only checked the header and the pixel count,
+            # decode the data to catch truncated or corrupt files.
+            image.load()
+        else:
+            image.verify()
+    image_file.seek(0)
+
+
+async def run_image_work(func, *args):
+    """Run Pillow work off the event loop, in a pool bounded by IMAGE_WORKER_THREADS."""
+    return await sync_to_async(func, thread_sensitive=False, executor=image_executor)(*args)
+
+
+def exif_value_to_json(value):
+    if isinstance(value, bytes):
+        text = value.rstrip(b"\x00")
+        if len(value) > EXIF_INLINE_BYTES:
+            return {"size": len(value)}
+        if text.isascii() and text.decode().isprintable():
+            return text.decode()
+        return value.hex(" ")
+    if isinstance(value, IFDRational):
+        value = float(value)
+        return None if value != value else value
+    if isinstance(value, (tuple, list)):
+        return [exif_value_to_json(item) for item in value]
+    if isinstance(value, (bool, int, float, str)) or value is None:
+        return value
+    return str(value)
+
+
+def parse_exif_datetime(value):
+    try:
+        date_time = datetime.strptime(str(value).strip("\x00 "), EXIF_DATETIME_FORMAT)
+    except ValueError:
+        return None
+    return date_time.replace(tzinfo=timezone.utc)
+
+
+def clean_exif_text(value):
+    if value is None:
+        return None
+    value = str(value).strip("\x00 ")
+    return value or None
+
+
+def exif_number(value, cast=float):
+    if isinstance(value, (tuple, list)):
+        value = value[0] if value else None
+    try:
+        number = cast(value)
+    except (TypeError, ValueError, ZeroDivisionError):
+        return None
+    return None if number != number else number
+
+
+def get_gps_degrees(value, reference):
+    if not isinstance(value, tuple) or len(value) != 3:
+        return None
+    degrees, minutes, seconds = (exif_number(part) for part in value)
+    if degrees is None:
+        return None
+    degrees += (minutes or 0) / 60 + (seconds or 0) / 3600
+    return round(-degrees if reference in ("S", "W") else degrees, 6)
+
+
+def get_gps_location(gps):
+    """Latitude and longitude in decimal degrees and the altitude in meters, or None."""
+    latitude = get_gps_degrees(gps.get("GPSLatitude"), gps.get("GPSLatitudeRef"))
+    longitude = get_gps_degrees(gps.get("GPSLongitude"), gps.get("GPSLongitudeRef"))
+    if latitude is None or longitude is None:
+        return None
+
+    location = {"latitude": latitude, "longitude": longitude}
+    altitude = exif_number(gps.get("GPSAltitude"))
+    if altitude is not None:
+        location["altitude"] = -altitude if gps.get("GPSAltitudeRef") in (1, b"\x01") else altitude
+    return location
+
+
+def get_exif_document(exif_groups):
+    """JSON of EXIF read with app.exif.read_exif_groups, with "Location" holding the
+    decoded GPS position."""
+    document = {group: {str(tag): exif_value_to_json(data) for tag, data in tags.items()}
+                for group, tags in exif_groups.items()}
+    location = get_gps_location(exif_groups.get("GPS", {}))
+    if location:
+        document["Location"] = location
+    return document
+
+
+def get_metadata_fields(exif_groups):
+    """The UserImageMetadata columns for EXIF read with app.exif.read_exif_groups."""
+    metadata = ImageMetadata.from_exif({**exif_groups.get("Image", {}),
+                                        **exif_groups.get("Exif", {})})
+    return {
+        "date_time_original": parse_exif_datetime(metadata.date_time_original),
+        "model": clean_exif_text(metadata.model),
+        "exposure_time": exif_number(metadata.exposure_time),
+        "f_number": exif_number(metadata.f_number),
+        "iso_speed_ratings": exif_number(metadata.iso_speed_ratings, int),
+        "lens_model": clean_exif_text(metadata.lens_model),
+        "exif": get_exif_document(exif_groups),
+    }
+
+
+def save_image_metadata(image, exif_groups=None):
+    """Store the EXIF next to the image, extracted from the uploaded file unless given."""
+    if exif_groups is None:
+        exif_groups = read_exif_groups(image.image)
+    stored, _ = UserImageMetadata.objects.update_or_create(
+        image=image, defaults=get_metadata_fields(exif_groups))
+    return stored
+
 
 def get_image_names(user, catalog_name):
     if catalog_name == "All":
@@ -57,37 +227,150 @@ def get_image_names(user, catalog_name):
     return [image.name for image in images]
 
 
-def create_img_list_from_catalog(request, catalog_name="All"):
-    images = []
-    user = request.user
-    images_names = get_image_names(user, catalog_name)
-    for img_name in images_names:
-        image = UserImage.objects.get(name=img_name, user=user)
-        metadata = ImageMetadata.from_image_path(image.image)
-        images.append([image, metadata])
-        if request.method == "POST" and not request.POST.get("Select"):
-            images_to_show = list(request.POST.getlist("show_checkbox"))
-            for image, metadata in images:
-                metadata.view = True if image.name in images_to_show else False
+def get_sort_field(sort_parameter_tag):
+    """Translate a "Metadata-sort" tag, optionally prefixed with "-", into a field path."""
+    if not sort_parameter_tag:
+        return "id", False
+
+    descending = sort_parameter_tag.startswith("-")
+    sort_parameter = METADATA_TAGS_DICT[sort_parameter_tag.lstrip("-")]
+    field = "name" if sort_parameter == "Name" else f"metadata__{sort_parameter}"
+    return field, descending
+
+
+def get_image_ordering(sort_parameter_tag):
+    """ORDER BY terms for a sort tag; images without a value are always listed last."""
+    field, descending = get_sort_field(sort_parameter_tag)
+    if field == "id":
+        return ["-id" if descending else "id"]
+    if descending:
+        return [F(field).desc(nulls_last=True), "-id"]
+    return [F(field).asc(nulls_last=True), "id"]
+
+
+def get_catalog_names(user):
+    return get_or_compute("catalogs", user.id, (),
+                          lambda: UserCatalog.get_catalog_names(user))
+
+
+async def aget_catalog_names(user):
+    return await aget_or_compute("catalogs", user.id, (),
+                                 lambda: UserCatalog.aget_catalog_names(user))
+
+
+def get_images_page(user, catalog_name="All", sort_parameter_tag=None, cursor=None, query=""):
+    """A page of the user's images; query is a search, see app.search.parse_search."""
+    field, descending = get_sort_field(sort_parameter_tag)
+    ordering = get_image_ordering(sort_parameter_tag)
+    condition = parse_search(query)
+    return get_or_compute(
+        "images", user.id, (catalog_name, sort_parameter_tag, cursor, query),
+        lambda: paginate_images(UserImage.get_images(user, catalog_name, ordering).filter(
+            condition), field, descending, cursor),
+    )
+
+
+async def aget_images_page(user, catalog_name="All", sort_parameter_tag=None, cursor=None,
+                           query=""):
+    field, descending = get_sort_field(sort_parameter_tag)
+    ordering = get_image_ordering(sort_parameter_tag)
+    condition = parse_search(query)
+    return await aget_or_compute(
+        "images", user.id, (catalog_name, sort_parameter_tag, cursor, query),
+        lambda: apaginate_images(UserImage.get_images(user, catalog_name, ordering).filter(
+            condition), field, descending, cursor),
+    )
+
+
+def create_img_list_from_catalog(request, catalog_name="All", sort_parameter_tag=None,
+                                 cursor=None, query=""):
+    page = get_images_page(request.user, catalog_name, sort_parameter_tag, cursor, query)
+    return build_img_list(request, page)
+
+
+async def acreate_img_list_from_catalog(request, catalog_name="All", sort_parameter_tag=None,
+                                        cursor=None, query=""):
+    page = await aget_images_page(request.user, catalog_name, sort_parameter_tag, cursor, query)
+    return build_img_list(request, page)
+
+
+def build_img_list(request, page):
+    images = ImagePage([[image, ImageMetadata.from_user_image(image)] for image in page],
+                       page.next_cursor)
+
+    if request.method == "POST" and not (request.POST.get("Select")
+                                         or request.POST.get("Search")):
+        images_to_show = set(request.POST.getlist("show_checkbox"))
+        for image, metadata in images:
+            metadata.view = str(image.id) in images_to_show
 
     return images
 
 
-def get_metadata_from_img(image_path):
-    image = Image.open(image_path)
-    exif_data = image._getexif()
+def set_images_visibility(user, image_ids, visible):
+    count = UserImage.objects.filter(user=user, id__in=image_ids).update(
+        visible=visible, updated_at=datetime.now(timezone.utc))
+    if count:
+        invalidate_user(user.id)
+    return count
 
-    metadata = []
 
-    if exif_data is None:
-        return NO_METADATA_COMMUNICATE
+def serialize_image(image, metadata):
+    return {
+        "id": image.id,
+        "name": image.name,
+        "catalog": image.catalog.catalog_name,
+        "url": image.image.url,
+        "thumbnail_url": image.thumbnail_url,
+        "webp_srcset": image.webp_srcset,
+        "jpeg_srcset": image.jpeg_srcset,
+        "placeholder": image.placeholder,
+        "width": image.width,
+        "height": image.height,
+        "visible": metadata.view,
+        **{tag: getattr(metadata, attribute)
+           for tag, attribute in METADATA_TAGS_DICT.items() if tag != "Name"},
+    }
 
-    for tag_id in exif_data:
-        tag = TAGS.get(tag_id, tag_id)
-        data = exif_data.get(tag_id)
-        metadata.append(f"{tag} : {data}")
+
+def format_metadata(exif_data):
+    metadata = [f"{tag} : {data}" for tag, data in exif_data.items()]
 
     if not metadata:
         metadata = NO_METADATA_COMMUNICATE
 
     return metadata
+
+
+def get_metadata_from_img(image_path):
+    return format_metadata(read_exif(image_path))
+
+
+def get_user_image_with_metadata(user, image_id):
+    """The image and its formatted EXIF list, or None if the user has no such image."""
+    def load():
+        image = UserImage.objects.select_related("metadata").filter(id=image_id, user=user).first()
+        return image and (image, get_stored_metadata(image))
+
+    return get_or_compute("metadata", user.id, (image_id,), load)
+
+
+async def aget_user_image_with_metadata(user, image_id):
+    async def load():
+        image = await UserImage.objects.select_related("metadata").filter(
+            id=image_id, user=user).afirst()
+        return image and (image, get_stored_metadata(image))
+
+    return await aget_or_compute("metadata", user.id, (image_id,), load)
+
+
+def get_stored_metadata(image):
+    """The stored EXIF document of the image, see get_exif_document."""
+    try:
+        exif_data = image.metadata.exif
+    except UserImageMetadata.DoesNotExist:
+        return {}
+    if exif_data.keys() - {*EXIF_GROUPS, "Location"}:
+        # Stored before EXIF was grouped by IFD, "extract_metadata --all" regroups it.
+        return {"Image": exif_data}
+    return exif_data
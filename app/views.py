@@ -1,12 +1,33 @@
-from django.contrib.auth import login, logout, authenticate
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user, login, logout, authenticate
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, JsonResponse
 from django.shortcuts import render, redirect
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
 from django.db import IntegrityError
 from app.models import UserImage, UserCatalog
 from app.forms import UploadImgForm, NewCatalogForm
 from django.contrib import messages
-from app.utils import create_img_list_from_catalog, get_metadata_from_img
+from django.contrib.staticfiles.storage import staticfiles_storage
+from app.utils import (aget_catalog_names, aget_user_image_with_metadata, run_image_work,
+                       serialize_image, set_images_visibility, verify_image)
+from app.cache import get_cache_stats
+from app.metrics import render_metrics
+from app.pagination import InvalidCursor
+from app.search import SearchError, parse_search
+from app.similarity import aget_similar_images
+from app.tasks import process_new_image
+from app.bulk_upload import bulk_upload
+from app.deletion import delete_catalog, delete_images
+from app.gallery import GalleryPipeline
+from app.exif import read_exif_groups
+from app.media import serve_file, serve_static_file
+from app.storage import get_image_storage
+from app.uploads import get_rejected_uploads, INVALID_IMAGE
 
 HOME_NAME = "home"
 HOME_HTML = "home.html"
@@ -14,22 +35,23 @@ UPLOAD_IMG_NAME = "upload_img"
 UPLOAD_IMG_HTML = "upload_img.html"
 LOGGED_IN_NAME = "logged_in"
 LOGGED_IN_HTML = "logged_in.html"
+GALLERY_PAGE_HTML = "gallery_page.html"
 SIGN_UP_USER_NAME = "sign_up_user"
 SING_UP_USER_HTML = "sign_up_user.html"
 SIGN_IN_USER_NAME = "sign_in_user"
 SING_IN_USER_HTML = "sign_in_user.html"
 
 METADATA_SORT_TAG_NAME = "Metadata-sort"
+SORT_STATE_NAME = "sort"
+SEARCH_NAME = "q"
+
+arender = sync_to_async(render)
 
-METADATA_TAGS_DICT = {
-    "Name": "Name",
-    "DateTimeOriginal": "date_time_original",
-    "Model": "model",
-    "ExposureTime": "exposure_time",
-    "FNumber": "f_number",
-    "ISOSpeedRatings": "iso_speed_ratings",
-    "LensModel": "lens_model",
-}
+
+async def get_request_user(request):
+    """Resolve the lazy request.user in a thread, it queries the session and user tables."""
+    request.user = await sync_to_async(get_user)(request)
+    return request.user
 
 
 def home(request):
@@ -42,6 +64,8 @@ def check_invalid_img_upload_form(request, form):
         info = "Name field can not be empty."
     if not form.cleaned_data.get("image"):
         info = "Image field can not be empty."
+    if form.has_error("image", "invalid_image"):
+        info = "Upload a valid image."
     if not request.POST.get("catalog"):
         info = "Choose catalog"
     messages.info(request, info)
@@ -50,8 +74,10 @@ def check_invalid_img_upload_form(request, form):
 def save_new_img(request, form, catalog_name):
     new_img = form.save(commit=False)
     new_img.user = request.user
-    new_img.catalog = UserCatalog.objects.get(catalog_name=catalog_name, user=request.user)
+    new_img.catalog = UserCatalog.objects.get(catalog_name=catalog_name, user=request.user,
+                                              pending_delete=False)
     new_img.save()
+    process_new_image(new_img, getattr(form.cleaned_data["image"], "exif_groups", None))
     messages.success(request, "Your picture has been uploaded successfully!")
 
 
@@ -78,25 +104,40 @@ def save_new_catalog(request, catalog_form):
     messages.info(request, "Catalog added")
 
 
-def upload_img(request):
-    catalogs = UserCatalog.get_catalog_names(request.user)
+async def is_valid_image(form):
+    try:
+        await run_image_work(verify_image, form.cleaned_data["image"])
+    except Exception:
+        form.add_error("image", ValidationError("Upload a valid image.", code="invalid_image"))
+        return False
+    return True
+
+
+async def upload_img(request):
+    catalogs = await aget_catalog_names(await get_request_user(request))
 
     if request.method == "GET":
-        return render(
+        return await arender(
             request, UPLOAD_IMG_HTML, {"form": UploadImgForm(), "catalogs": catalogs}
         )
     if request.method == "POST":
         upload_img_form = UploadImgForm(request.POST, request.FILES)
         catalog_form = NewCatalogForm(request.POST)
 
+        rejected = get_rejected_uploads(request)
         if request.POST.get("Upload"):
-            if not upload_img_form.is_valid():
+            if rejected:
+                error = rejected[0]["error"]
+                messages.info(request,
+                              "Upload a valid image." if error == INVALID_IMAGE else error)
+                return redirect(UPLOAD_IMG_NAME)
+            if not upload_img_form.is_valid() or not await is_valid_image(upload_img_form):
                 check_invalid_img_upload_form(request, upload_img_form)
                 return redirect(UPLOAD_IMG_NAME)
             catalog_name = request.POST.get("catalog")
-            save_new_img(request, upload_img_form, catalog_name)
+            await sync_to_async(save_new_img)(request, upload_img_form, catalog_name)
 
-            return render(
+            return await arender(
                 request,
                 UPLOAD_IMG_HTML,
                 {
@@ -106,64 +147,138 @@ def upload_img(request):
                 },
             )
 
+        if request.POST.get("BulkUpload"):
+            return await bulk_upload_img(request, catalogs, rejected)
+
         if request.POST.get("AddCatalog"):
-            if check_if_catalog_form_is_valid(request, catalogs, catalog_form):
-                save_new_catalog(request, catalog_form)
+            if await sync_to_async(check_if_catalog_form_is_valid)(request, catalogs,
+                                                                   catalog_form):
+                await sync_to_async(save_new_catalog)(request, catalog_form)
 
         return redirect(UPLOAD_IMG_NAME)
 
 
-def logged_in(request):
-    user = request.user
-    catalogs = UserCatalog.get_catalog_names(user)
-    images = create_img_list_from_catalog(request)
+async def bulk_upload_img(request, catalogs, rejected):
+    catalog_name = request.POST.get("catalog")
+    catalog = await UserCatalog.objects.filter(user=request.user, catalog_name=catalog_name,
+                                               pending_delete=False).afirst()
+    uploads = request.FILES.getlist("image")
+    if catalog is None or not (uploads or rejected):
+        messages.info(request, "Choose catalog" if catalog is None
+                      else "Image field can not be empty.")
+        return redirect(UPLOAD_IMG_NAME)
 
-    if request.method == "GET":
-        return render(request, LOGGED_IN_HTML,
-                      {"images": images, "catalogs": catalogs})
+    results = [{"file": upload["file"], "name": None, "error": upload["error"]}
+               for upload in rejected]
+    results += await sync_to_async(bulk_upload)(request.user, catalog, uploads,
+                                                request.POST.get("description", ""))
+    uploaded = sum(result["error"] is None for result in results)
+    messages.success(request, f"{uploaded} of {len(results)} pictures have been uploaded.")
+    return await arender(
+        request,
+        UPLOAD_IMG_HTML,
+        {
+            "form": UploadImgForm(),
+            "catalogs": catalogs,
+            "catalog_name": catalog_name,
+            "results": results,
+        },
+    )
 
-    if request.method == "POST":
-        catalog_name = request.POST.get("Catalogs")
-        images = create_img_list_from_catalog(request, catalog_name)
-
-        if "Delete" in request.POST.values():
-            delete_image(request)
-            images = create_img_list_from_catalog(request, catalog_name)
-
-        if request.POST.get("DeleteCatalog"):
-            if catalog_name == "All":
-                messages.info(request, "Catalog " "All" " can not be deleted")
-            else:
-                UserCatalog.delete_catalog(user=user, catalog_name=catalog_name)
-                messages.info(request, "Catalog " "" + catalog_name + " " "have been deleted")
-                images = create_img_list_from_catalog(request, "All")
-                catalog_name = "All"
-
-        if sort_parameter_tag := request.POST.get(METADATA_SORT_TAG_NAME):
-            images = create_img_list_from_catalog(request, catalog_name)
-            images = sort_images(images, sort_parameter_tag)
-
-    return render(
+
+def check_search(request, gallery):
+    """Drop an invalid search from the gallery and tell the user why."""
+    try:
+        parse_search(gallery.query)
+    except SearchError as error:
+        messages.info(request, str(error))
+        gallery.search("")
+
+
+async def logged_in(request):
+    user = await get_request_user(request)
+
+    if request.method == "GET":
+        gallery = GalleryPipeline(request, query=request.GET.get(SEARCH_NAME))
+        check_search(request, gallery)
+        catalogs, images = await asyncio.gather(aget_catalog_names(user), gallery.aget_images())
+        return await arender(request, LOGGED_IN_HTML,
+                             {"images": images, "catalogs": catalogs, "query": gallery.query})
+
+    gallery = GalleryPipeline(request, request.POST.get("Catalogs"),
+                              request.POST.get(METADATA_SORT_TAG_NAME)
+                              or request.POST.get(SORT_STATE_NAME),
+                              query=request.POST.get(SEARCH_NAME))
+    check_search(request, gallery)
+
+    if request.POST.get("show"):
+        await sync_to_async(save_visibility)(request)
+
+    image_ids = get_selected_image_ids(request)
+    if image_ids:
+        await sync_to_async(delete_images)(UserImage.objects.filter(user=user, id__in=image_ids))
+
+    if request.POST.get("DeleteCatalog"):
+        if gallery.catalog_name == "All":
+            messages.info(request, "Catalog " "All" " can not be deleted")
+        else:
+            await sync_to_async(delete_catalog)(user, gallery.catalog_name)
+            messages.info(request, "Catalog " "" + gallery.catalog_name + " " "have been deleted")
+            gallery.filter_catalog("All")
+
+    catalogs, images = await asyncio.gather(aget_catalog_names(user), gallery.aget_images())
+    return await arender(
         request,
         LOGGED_IN_HTML,
-        {"images": images, "catalogs": catalogs, "selected": catalog_name},
+        {"images": images, "catalogs": catalogs, "selected": gallery.catalog_name,
+         "sort": gallery.sort_parameter_tag or "", "query": gallery.query},
     )
 
 
-def sort_images(images, sort_parameter_tag):
-    sort_parameter = METADATA_TAGS_DICT[sort_parameter_tag]
-    if sort_parameter == "Name":
-        images = sorted(images, key=lambda x: x[0].name)
-    else:
-        images = sorted(images, key=lambda x: getattr(x[1], sort_parameter))
-    return images
+async def gallery_page(request):
+    user = await get_request_user(request)
+    if not user.is_authenticated:
+        raise Http404
+    gallery = GalleryPipeline(request, request.GET.get("catalog", "All"), request.GET.get("sort"),
+                              request.GET.get("cursor"), request.GET.get(SEARCH_NAME))
+
+    try:
+        images = await gallery.aget_images()
+    except InvalidCursor:
+        return HttpResponseBadRequest("Invalid cursor")
+    except SearchError as error:
+        return HttpResponseBadRequest(str(error))
+
+    if request.GET.get("format") == "json":
+        return JsonResponse({"images": [serialize_image(image, metadata)
+                                        for image, metadata in images],
+                             "next_cursor": images.next_cursor})
+
+    response = await arender(request, GALLERY_PAGE_HTML, {"images": images})
+    response["X-Next-Cursor"] = images.next_cursor or ""
+    return response
+
+
+def get_int_list(request, key):
+    return [int(value) for value in request.POST.getlist(key) if value.isdigit()]
+
+
+def save_visibility(request):
+    """Show the checked images of the listed rows and hide the others."""
+    listed = set(get_int_list(request, "listed"))
+    shown = listed & set(get_int_list(request, "show_checkbox"))
+    set_images_visibility(request.user, shown, True)
+    set_images_visibility(request.user, listed - shown, False)
 
 
-def delete_image(request):
-    for image_id, value in request.POST.items():
-        if value == "Delete":
-            UserImage.objects.get(id=image_id).delete()
-            break
+def get_selected_image_ids(request):
+    """Ids of the image with a pressed Delete button, or of all selected images for
+    Delete selected. The show checkboxes only set the visibility."""
+    image_ids = [key for key, value in request.POST.items() if value == "Delete"]
+    image_ids = [int(image_id) for image_id in image_ids if image_id.isdigit()]
+    if request.POST.get("DeleteSelected"):
+        image_ids += get_int_list(request, "selected")
+    return image_ids
 
 
 def logout_user(request):
@@ -225,7 +340,55 @@ def sign_in_user(request):
     return redirect(HOME_NAME)
 
 
-def img_metadata(request, image_id):
-    img = UserImage.objects.get(id=image_id)
-    exif_data = get_metadata_from_img(img.image)
-    return render(request, "img_metadata.html", {"image": img, "exif_data": exif_data})
+async def img_metadata(request, image_id):
+    user = await get_request_user(request)
+    image_with_metadata = user.is_authenticated and await aget_user_image_with_metadata(
+        user, image_id)
+    if not image_with_metadata:
+        raise Http404
+    img, exif_data = image_with_metadata
+    similar = await aget_similar_images(img)
+    return await arender(request, "img_metadata.html",
+                         {"image": img, "exif_data": exif_data, "similar": similar})
+
+
+async def exif_value(request, image_id, group, tag):
+    """Download a long binary EXIF value, the stored EXIF document only holds its size."""
+    user = await get_request_user(request)
+    image = user.is_authenticated and await UserImage.objects.filter(
+        id=image_id, user=user).afirst()
+    if not image:
+        raise Http404
+    exif_groups = await run_image_work(read_exif_groups, image.image)
+    value = {str(name): data for name, data in exif_groups.get(group, {}).items()}.get(tag)
+    if not isinstance(value, bytes):
+        raise Http404
+    response = HttpResponse(value, content_type="application/octet-stream")
+    response["Content-Disposition"] = f'attachment; filename="{image_id}-{tag}.bin"'
+    return response
+
+
+@staff_member_required
+def cache_stats(request):
+    return JsonResponse(get_cache_stats())
+
+
+@staff_member_required
+def metrics(request):
+    return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def serve_media(request, path):
+    if not request.user.is_authenticated or not UserImage.user_owns_file(request.user, path):
+        raise Http404
+    try:
+        return serve_file(request, get_image_storage(), path)
+    except FileNotFoundError:
+        raise Http404
+
+
+def serve_static(request, path):
+    try:
+        return serve_static_file(request, staticfiles_storage, path)
+    except (FileNotFoundError, IsADirectoryError):
+        raise Http404
@@ -0,0 +1,13 @@
+#!/bin/sh
+# Start the job workers next to the web server, restarting them if they exit. The
+# workers share the SQLite database, the media files and the cache with the server.
+set -e
+
+(
+    while true; do
+        python manage.py run_workers --workers "${PICSHOW_JOB_WORKERS:-2}" || true
+        sleep 1
+    done
+) &
+
+exec uvicorn project.asgi:application --host 0.0.0.0 --port 8000
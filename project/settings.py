@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -21,6 +22,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "app.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -34,39 +36,100 @@ ROOT_URLCONF = "project.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # The Django backend, timing renders for the request metrics.
+        "BACKEND": "app.metrics.TimedDjangoTemplates",
         "DIRS": [],
-        "APP_DIRS": True,
         "OPTIONS": {
+            # Cached in DEBUG too, runserver clears it when a template changes.
+            "loaders": [
+                ("django.template.loaders.cached.Loader", [
+                    "django.template.loaders.filesystem.Loader",
+                    "django.template.loaders.app_directories.Loader",
+                ]),
+            ],
             "context_processors": [
                 "django.template.context_processors.debug",
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "app.context_processors.gallery",
             ],
         },
     },
 ]
 
 WSGI_APPLICATION = "project.wsgi.application"
+ASGI_APPLICATION = "project.asgi.application"
+
+
+# SQLite by default, tuned for web and job workers writing at the same time: WAL lets
+# readers run next to the writer, atomic blocks take the write lock when they start and
+# wait up to "timeout" seconds for it, see app/backends/sqlite3. Set PICSHOW_POSTGRES_DB
+# (and PICSHOW_POSTGRES_USER, _PASSWORD, _HOST, _PORT) to use PostgreSQL.
+#
+# The views are served through ASGI, where Django does not reuse persistent connections
+# across requests (ticket #33497): every request would open a connection and leave it
+# open. Connections are therefore closed after each request, put a pooler like PgBouncer
+# in front of PostgreSQL to reuse them. PICSHOW_CONN_MAX_AGE is only for WSGI deployments
+# and the job workers.
+
+if os.environ.get("PICSHOW_POSTGRES_DB"):
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ["PICSHOW_POSTGRES_DB"],
+            "USER": os.environ.get("PICSHOW_POSTGRES_USER", ""),
+            "PASSWORD": os.environ.get("PICSHOW_POSTGRES_PASSWORD", ""),
+            "HOST": os.environ.get("PICSHOW_POSTGRES_HOST", ""),
+            "PORT": os.environ.get("PICSHOW_POSTGRES_PORT", ""),
+            "CONN_MAX_AGE": int(os.environ.get("PICSHOW_CONN_MAX_AGE", 0)),
+            "CONN_HEALTH_CHECKS": True,
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "app.backends.sqlite3",
+            "NAME": BASE_DIR / "db.sqlite3",
+            "OPTIONS": {
+                "timeout": 20,
+                "transaction_mode": "IMMEDIATE",
+                "pragmas": {
+                    "journal_mode": "wal",
+                    "synchronous": "normal",
+                    "cache_size": -20000,
+                    "temp_store": "memory",
+                    "mmap_size": 134217728,
+                },
+            },
+        }
+    }
 
 
-# DATABASES = {
-#     "default": {
-#         "ENGINE": "django.db.backends.postgresql",
-#         "NAME": 'picshow_db',
-#         "USER": "kornel",
-#         "PASSWORD": "kornel"
-#     }
-# }
+# Caches gallery data per user, see app/cache.py. The cache has to be shared by all web
+# and job worker processes: a change made by one process moves the user's cached data to a
+# new version, which the others only see in a shared cache. It is kept in files under
+# PICSHOW_CACHE_DIR, LocMemCache is only suitable for a single process, e.g. in tests.
+# Beyond MAX_ENTRIES files the cache deletes a third of its entries at random, user versions
+# included, keep it above two fragments (tile and row) per image plus the cached pages.
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get("PICSHOW_CACHE_DIR", BASE_DIR / "cache"),
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.environ.get("PICSHOW_CACHE_MAX_ENTRIES", 100000)),
+        },
     }
 }
 
+GALLERY_CACHE_TIMEOUT = 300
+
+# The template fragments of gallery tiles and rows are keyed by the image's updated_at,
+# fragments of changed images are never read again and expire after this many seconds.
+
+GALLERY_FRAGMENT_TIMEOUT = 24 * 60 * 60
+
 
 # Password validation
 
@@ -100,6 +163,69 @@ USE_TZ = True
 # Static files (CSS, JavaScript, Images)
 
 STATIC_URL = "static/"
+STATIC_ROOT = BASE_DIR / "staticfiles"
+
+# collectstatic names files after their content and writes gzip and Brotli variants (with
+# the optional brotli package), see app/staticfiles.py. Set SERVE_STATIC to False when a
+# front server serves STATIC_ROOT, otherwise app.views.serve_static sends them with
+# far-future cache headers.
+
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "app.staticfiles.CompressedManifestStaticFilesStorage",
+    },
+}
+
+SERVE_STATIC = True
+
+# Uploaded images, served with ownership checks by app.views.serve_media
+
+MEDIA_URL = "media/"
+MEDIA_ROOT = BASE_DIR
+
+# Set to "X-Accel-Redirect" (nginx) or "X-Sendfile" (Apache, lighttpd) to let the front
+# server send media files. Nginx needs an internal location for MEDIA_ACCEL_PREFIX.
+MEDIA_ACCEL_REDIRECT = None
+MEDIA_ACCEL_PREFIX = "/protected-media/"
+
+# Threads for Pillow work done while serving a request
+
+IMAGE_WORKER_THREADS = os.cpu_count() or 1
+
+# Image uploads are hashed, checked and written next to the image storage while they are
+# parsed, see app/uploads.py. Larger images are rejected before they are read to the end.
+# Under ASGI Django first spools the whole request body to a temporary file, bodies over
+# REQUEST_BODY_MAX_SIZE are refused with 413 before that by app.uploads.RequestBodyLimit.
+
+FILE_UPLOAD_HANDLERS = [
+    "app.uploads.ImageUploadHandler",
+    "django.core.files.uploadhandler.MemoryFileUploadHandler",
+    "django.core.files.uploadhandler.TemporaryFileUploadHandler",
+]
+IMAGE_UPLOAD_MAX_SIZE = 100 * 1024 * 1024
+REQUEST_BODY_MAX_SIZE = 1024 * 1024 * 1024
+
+# Bulk upload: images are checked and inserted in batches, larger ZIP entries are skipped
+
+BULK_UPLOAD_BATCH_SIZE = 100
+BULK_UPLOAD_MAX_FILE_SIZE = 100 * 1024 * 1024
+
+# Requests slower than this many seconds are logged by app.metrics, None disables the log
+
+SLOW_REQUEST_THRESHOLD = 1.0
+
+# Background jobs run by "python manage.py run_workers"
+
+JOBS_EAGER = False
+JOBS_POLL_INTERVAL = 1.0
+JOBS_RETRY_BASE_DELAY = 5
+JOBS_RETRY_MAX_DELAY = 600
+# RUNNING jobs not updated for this many seconds belong to a crashed worker and are taken over,
+# long jobs call app.jobs.heartbeat to stay theirs.
+JOBS_RUNNING_TIMEOUT = 600
 
 # Default primary key field type
 
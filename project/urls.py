@@ -1,18 +1,26 @@
 from django.contrib import admin
 from django.urls import path
-from app import views
+from app import api, views
 from django.conf import settings
-from django.conf.urls.static import static
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path('', views.home, name='home'),
     path('upload_img/', views.upload_img, name='upload_img'),
     path('logged_in/', views.logged_in, name='logged_in'),
+    path('logged_in/page/', views.gallery_page, name='gallery_page'),
     path('log_out/', views.logout_user, name='logout_user'),
     path('sign_up/', views.sign_up_user, name='sign_up_user'),
     path('sign_in/', views.sign_in_user, name='sign_in_user'),
-    path('<int:image_id>', views.img_metadata, name='img_metadata')
+    path('<int:image_id>', views.img_metadata, name='img_metadata'),
+    path('<int:image_id>/exif/<str:group>/<str:tag>', views.exif_value, name='exif_value'),
+    path('cache_stats/', views.cache_stats, name='cache_stats'),
+    path('metrics/', views.metrics, name='metrics'),
+    path('api/images/', api.images_api, name='api_images'),
+    path('api/images/<int:image_id>/', api.image_api, name='api_image'),
+    path(settings.MEDIA_URL.lstrip('/') + '<path:path>', views.serve_media, name='media'),
 ]
 
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+if settings.SERVE_STATIC:
+    urlpatterns.append(path(settings.STATIC_URL.lstrip('/') + '<path:path>', views.serve_static,
+                            name='static'))